@@ -0,0 +1,14 @@
+"""Dependencias de FastAPI para el modo API_MODE=async."""
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_config_service, get_facade, transaction_archive
+from app.application.async_facade import AsyncBankingFacade
+from app.infra.async_database import get_async_db
+
+
+async def get_async_facade(session: AsyncSession = Depends(get_async_db)) -> AsyncBankingFacade:
+    # get_config_service se llama directo: como dependency síncrona FastAPI la
+    # ejecutaría en el threadpool, justo lo que este modo quiere evitar
+    return AsyncBankingFacade(session, get_config_service(), build_facade=get_facade,
+                              archive=transaction_archive)
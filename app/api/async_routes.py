@@ -0,0 +1,179 @@
+"""Endpoints `async def` para API_MODE=async.
+
+Se registran antes que app/api/routes.py y reemplazan las rutas de mayor tráfico
+(lecturas de cuentas e historial, altas y movimientos de dinero). El resto de los
+endpoints (configuración, lotes, importación) siguen siendo los síncronos.
+"""
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Response
+
+from app.api.async_deps import get_async_facade
+from app.api.conditional import account_etag, history_etag, if_none_match, matches, not_modified, tag
+from app.api.deps import to_http
+from app.api.idempotency import get_idempotency_store, idempotency_key, run_idempotent_async
+from app.api.serializers import transactions_response
+from app.application.async_facade import AsyncBankingFacade
+from app.domain.exceptions import NotFoundError
+from app.infra.idempotency import IdempotencyStore
+from app.services.pagination import encode_cursor
+from app.schemas.dto import (
+    CustomerCreateRequest,
+    CustomerResponse,
+    AccountCreateRequest,
+    AccountResponse,
+    DepositRequest,
+    WithdrawRequest,
+    TransferRequest,
+    TransactionResponse,
+)
+
+async_router = APIRouter()
+
+
+def _transaction_response(transaction) -> TransactionResponse:
+    return TransactionResponse(
+        id=transaction.id,
+        type=transaction.type,
+        amount=transaction.amount,
+        currency=getattr(transaction, "currency", "USD"),
+        status=transaction.status,
+        created_at=transaction.created_at,
+    )
+
+
+def _account_response(account) -> AccountResponse:
+    return AccountResponse(
+        id=account.id,
+        customer_id=account.customer_id,
+        currency=account.currency,
+        balance=account.balance,
+        status=account.status,
+    )
+
+
+@async_router.post("/customers", response_model=CustomerResponse, status_code=201,
+                   summary="Crear cliente")
+async def create_customer(
+    body: CustomerCreateRequest,
+    facade: AsyncBankingFacade = Depends(get_async_facade),
+):
+    try:
+        customer = await facade.create_customer(name=body.name, email=body.email)
+        return CustomerResponse(
+            id=customer.id,
+            name=customer.name,
+            email=customer.email,
+            status=customer.status,
+        )
+    except Exception as e:
+        raise to_http(e)
+
+
+@async_router.post("/accounts", response_model=AccountResponse, status_code=201,
+                   summary="Crear cuenta")
+async def create_account(
+    body: AccountCreateRequest,
+    facade: AsyncBankingFacade = Depends(get_async_facade),
+):
+    try:
+        return _account_response(await facade.create_account(customer_id=body.customer_id, currency="USD"))
+    except Exception as e:
+        raise to_http(e)
+
+
+@async_router.get("/accounts/{account_id}", response_model=AccountResponse,
+                  summary="Obtener cuenta")
+async def get_account(
+    account_id: str,
+    response: Response,
+    facade: AsyncBankingFacade = Depends(get_async_facade),
+    etag_header: Optional[str] = Depends(if_none_match),
+):
+    try:
+        account = await facade.get_account(account_id)
+        if not account:
+            raise NotFoundError(f"Cuenta {account_id} no encontrada")
+        etag = account_etag(account)
+        if matches(etag_header, etag):
+            return not_modified(etag)
+        tag(response, etag)
+        return _account_response(account)
+    except Exception as e:
+        raise to_http(e)
+
+
+@async_router.post("/transactions/deposit", response_model=TransactionResponse, status_code=201,
+                   summary="Depositar")
+async def deposit(
+    body: DepositRequest,
+    facade: AsyncBankingFacade = Depends(get_async_facade),
+    store: IdempotencyStore = Depends(get_idempotency_store),
+    key: Optional[str] = Depends(idempotency_key),
+):
+    async def execute():
+        return _transaction_response(await facade.deposit(account_id=body.account_id, amount=body.amount))
+
+    return await run_idempotent_async(store, key, "deposit", body, execute)
+
+
+@async_router.post("/transactions/withdraw", response_model=TransactionResponse, status_code=201,
+                   summary="Retirar")
+async def withdraw(
+    body: WithdrawRequest,
+    facade: AsyncBankingFacade = Depends(get_async_facade),
+    store: IdempotencyStore = Depends(get_idempotency_store),
+    key: Optional[str] = Depends(idempotency_key),
+):
+    async def execute():
+        return _transaction_response(await facade.withdraw(account_id=body.account_id, amount=body.amount))
+
+    return await run_idempotent_async(store, key, "withdraw", body, execute)
+
+
+@async_router.post("/transactions/transfer", response_model=TransactionResponse, status_code=201,
+                   summary="Transferir")
+async def transfer(
+    body: TransferRequest,
+    facade: AsyncBankingFacade = Depends(get_async_facade),
+    store: IdempotencyStore = Depends(get_idempotency_store),
+    key: Optional[str] = Depends(idempotency_key),
+):
+    async def execute():
+        transaction = await facade.transfer(
+            from_account=body.from_account_id,
+            to_account=body.to_account_id,
+            amount=body.amount,
+        )
+        return _transaction_response(transaction)
+
+    return await run_idempotent_async(store, key, "transfer", body, execute)
+
+
+@async_router.get("/accounts/{account_id}/transactions", response_model=list[TransactionResponse],
+                  summary="Listar transacciones de una cuenta")
+async def list_account_transactions(
+    account_id: str,
+    facade: AsyncBankingFacade = Depends(get_async_facade),
+    limit: int = Query(10, ge=1, le=100, description="Cantidad máxima de registros"),
+    offset: int = Query(0, ge=0, description="Registros a saltar"),
+    cursor: Optional[str] = Query(None, description="Cursor opaco de la página anterior (X-Next-Cursor)"),
+    etag_header: Optional[str] = Depends(if_none_match),
+):
+    try:
+        account = await facade.get_account(account_id)
+        if not account:
+            raise NotFoundError(f"Cuenta {account_id} no encontrada")
+        etag = history_etag(account, await facade.latest_transaction_id(account_id), limit, offset, cursor)
+        if matches(etag_header, etag):
+            return not_modified(etag)
+        transactions = await facade.list_transactions(
+            account_id=account_id, limit=limit, offset=offset, cursor=cursor
+        )
+        response = transactions_response(transactions)
+        tag(response, etag)
+        if len(transactions) == limit:
+            response.headers["X-Next-Cursor"] = encode_cursor(transactions[-1])
+        return response
+    except Exception as e:
+        raise to_http(e)
@@ -0,0 +1,60 @@
+"""GET condicional (ETag / If-None-Match) para la cuenta y su historial.
+
+- Cuenta: el ETag sale del estado visible (saldo, estado, moneda). Con la caché
+  de cuentas, revalidar cuesta una consulta al caché y ninguna serialización.
+- Historial: el ETag combina el estado de la cuenta, el id de la transacción más
+  reciente (un SELECT sobre el índice por cuenta, sin traer filas) y los
+  parámetros de la página. Si coincide se responde 304 sin leer la página.
+
+Todo débito o crédito cambia el saldo y toda transacción nueva cambia la más
+reciente, así que un ETag igual implica la misma respuesta. Cache-Control:
+no-cache obliga al cliente a revalidar en cada poll en vez de usar su copia.
+"""
+import hashlib
+from typing import Optional
+
+from fastapi import Header, Response
+
+from app.domain.entities import Account
+
+CACHE_CONTROL = "private, no-cache"
+
+
+async def if_none_match(
+    value: Optional[str] = Header(None, alias="If-None-Match", description="ETag de la respuesta anterior"),
+) -> Optional[str]:
+    return value
+
+
+def _etag(*parts: object) -> str:
+    digest = hashlib.blake2b("\n".join(map(str, parts)).encode(), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+
+def account_etag(account: Account) -> str:
+    return _etag("account", account.id, account.customer_id, account.currency, account.balance, account.status)
+
+
+def history_etag(account: Account, latest_transaction_id: Optional[str],
+                 limit: int, offset: int, cursor: Optional[str]) -> str:
+    return _etag(account_etag(account), latest_transaction_id, limit, offset, cursor)
+
+
+def matches(header: Optional[str], etag: str) -> bool:
+    """Comparación débil de If-None-Match (RFC 9110): ignora el prefijo W/ y acepta '*'."""
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def tag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
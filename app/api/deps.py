@@ -4,20 +4,17 @@ from decimal import Decimal
 from fastapi import HTTPException, Depends
 from sqlalchemy.orm import Session
 
-from app.infra.database import get_db
+from app.infra.database import engine, get_db
 from app.application.facade import BankingFacade
+from app.application.wiring import wire_facade
 from app.repositories.sqlalchemy_repo import (
     SQLCustomerRepository,
     SQLAccountRepository,
     SQLTransactionRepository,
+    SQLLedgerRepository,
+    SQLStatementRepository,
+    SQLAlchemyUnitOfWork,
 )
-from app.services.deposit_service import DepositService
-from app.services.withdraw_service import WithdrawService
-from app.services.transfer_service import TransferService
-from app.services.customer_service import CustomerService
-from app.services.account_service import AccountService
-from app.services.fee_strategies import NoFeeStrategy
-from app.services.risk_strategies import MaxAmountRule, VelocityRule, DailyLimitRule
 from app.domain.exceptions import (
     BankingError,
     ValidationError,
@@ -27,10 +24,19 @@ from app.domain.exceptions import (
     TransactionRejectedError,
     InvalidStatusTransition,
     DuplicateEmailError,
+    IdempotencyConflictError,
 )
+from app.repositories.account_cache import CachedAccountRepository, account_cache_from_env
+from app.repositories.config_store import config_store_from_env
+from app.infra.archive import archive_from_env
 from app.services.configuration_service import ConfigurationService 
 
-_config_service = ConfigurationService()
+# Con CONFIG_STORE=db o file la configuración se comparte entre workers
+_config_service = ConfigurationService(config_store_from_env(engine))
+# Caché de cuentas del proceso para GET /accounts (ver app/repositories/account_cache.py)
+account_cache = account_cache_from_env()
+# Archivo en frío de transacciones viejas (ARCHIVE_DIR, ver app/infra/archive.py)
+transaction_archive = archive_from_env()
 
 
 def get_config_service() -> ConfigurationService:
@@ -39,60 +45,27 @@ def get_config_service() -> ConfigurationService:
 
 def get_facade(session: Session = Depends(get_db),
                config_service: ConfigurationService = Depends(get_config_service)) -> BankingFacade:
-    
-    customer_repo = SQLCustomerRepository(session)
-    account_repo = SQLAccountRepository(session)
-    transaction_repo = SQLTransactionRepository(session)
-
-
-    customer_service = CustomerService(customer_repo)
-    
-    account_service = AccountService(
-        customers=customer_repo, 
-        accounts=account_repo, 
-        transactions=transaction_repo
-    )
-
-    
-    fee_strategy = config_service.get_current_fee_strategy()  
-    risk_strategies = config_service.get_current_risk_strategies()  
-
-    deposit_service = DepositService(
-        account_repo=account_repo,
-        transaction_repo=transaction_repo,
-        fee_strategy=fee_strategy,
-        risk_strategies=risk_strategies,
-    )
-    withdraw_service = WithdrawService(
-        account_repo=account_repo,
-        transaction_repo=transaction_repo,
-        fee_strategy=fee_strategy,
-        risk_strategies=risk_strategies,
-    )
-    transfer_service = TransferService(
-        account_repo=account_repo,
-        transaction_repo=transaction_repo,
-        fee_strategy=fee_strategy,
-        risk_strategies=risk_strategies,
-    )
-
-    return BankingFacade(
-        customer_repo=customer_repo,
-        account_repo=account_repo,
-        transaction_repo=transaction_repo,
-        transfer_service=transfer_service,
-        deposit_service=deposit_service,
-        withdraw_service=withdraw_service,
+    """Por request solo se crean los repositorios sobre la sesión; las estrategias
+    vienen ya construidas de config_service (ver app/application/wiring.py)."""
+    accounts = SQLAccountRepository(session)
+    return wire_facade(
+        customer_repo=SQLCustomerRepository(session),
+        account_repo=CachedAccountRepository(accounts, account_cache, read_through=False),
+        transaction_repo=SQLTransactionRepository(session, transaction_archive),
+        uow=SQLAlchemyUnitOfWork(session),
         config_service=config_service,
-        customer_service=customer_service,
-        account_service=account_service,
+        ledger_repo=SQLLedgerRepository(session),
+        account_reader=CachedAccountRepository(accounts, account_cache),
+        statement_repo=SQLStatementRepository(session),
     )
 
 
 def to_http(e: Exception) -> HTTPException:
-    """Mapea excepciones de dominio a HTTP (400, 403, 404, 500)."""
+    """Mapea excepciones de dominio a HTTP (400, 403, 404, 409, 500)."""
     if isinstance(e, NotFoundError):
         return HTTPException(status_code=404, detail=e.message)
+    if isinstance(e, IdempotencyConflictError):
+        return HTTPException(status_code=409, detail=e.message)
     if isinstance(e, InsufficientFundsError):
         return HTTPException(status_code=400, detail=e.message)
     if isinstance(e, AccountNotOperableError):
@@ -0,0 +1,142 @@
+"""Header Idempotency-Key para los endpoints que mueven dinero (ver app/infra/idempotency.py).
+
+Se guardan las respuestas 201 y los errores de dominio (4xx): un reintento recibe
+lo mismo que el primer intento, con el header Idempotent-Replayed: true. Los
+errores 5xx liberan la key para que el reintento se ejecute.
+
+Si falla el guardado de la respuesta (el movimiento ya hizo commit) se registra
+en el log y se responde igual: un 500 haría que el cliente repita un movimiento
+que ya se aplicó. La respuesta queda en el LRU del proceso de todas formas.
+"""
+import hashlib
+import json
+import logging
+from typing import Awaitable, Callable, Optional, Union
+
+from fastapi import Header, HTTPException, Response
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel
+
+from app.api.deps import to_http
+from app.infra.database import engine
+from app.infra.idempotency import IdempotencyStore, StoredResponse, idempotency_store_from_env
+
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+logger = logging.getLogger(__name__)
+
+_store = idempotency_store_from_env(engine)
+
+
+# Dependencies async def: FastAPI las resuelve sin pasar por el threadpool,
+# lo que importa en API_MODE=async (ver app/api/async_deps.py)
+
+async def get_idempotency_store() -> IdempotencyStore:
+    """Dependency para obtener el almacén de respuestas (siempre la misma instancia)"""
+    return _store
+
+
+async def idempotency_key(
+    key: Optional[str] = Header(None, alias="Idempotency-Key", description="Clave única por operación para reintentos seguros"),
+) -> Optional[str]:
+    return key
+
+
+def fingerprint(scope: str, body: BaseModel) -> str:
+    """Identifica el request: la misma key con otro endpoint o cuerpo es un conflicto."""
+    return hashlib.sha256(f"{scope}\n{body.model_dump_json()}".encode()).hexdigest()
+
+
+def _replay(stored: StoredResponse) -> Response:
+    return Response(
+        content=stored.body,
+        status_code=stored.status_code,
+        media_type="application/json",
+        headers={REPLAYED_HEADER: "true"},
+    )
+
+
+def _store_response(store: IdempotencyStore, key: str, digest: str, status_code: int, body: str) -> None:
+    try:
+        store.complete(key, digest, status_code, body)
+    except Exception:
+        logger.exception("No se pudo guardar la respuesta de la Idempotency-Key %s", key)
+
+
+def _settle_error(store: IdempotencyStore, key: str, digest: str, e: Exception) -> HTTPException:
+    """Guarda el error si es de dominio (4xx) o libera la key; retorna el error HTTP."""
+    error = to_http(e)
+    if error.status_code < 500:
+        _store_response(store, key, digest, error.status_code, json.dumps({"detail": error.detail}))
+    else:
+        store.release(key)
+    return error
+
+
+def run_idempotent(
+    store: IdempotencyStore,
+    key: Optional[str],
+    scope: str,
+    body: BaseModel,
+    execute: Callable[[], BaseModel],
+    status_code: int = 201,
+) -> Union[BaseModel, Response]:
+    """Ejecuta `execute` una sola vez por key; sin key se comporta como antes."""
+    if key is None:
+        try:
+            return execute()
+        except Exception as e:
+            raise to_http(e)
+
+    digest = fingerprint(scope, body)
+    try:
+        stored = store.begin(key, digest)
+    except Exception as e:
+        raise to_http(e)
+    if stored is not None:
+        return _replay(stored)
+
+    try:
+        result = execute()
+    except Exception as e:
+        raise _settle_error(store, key, digest, e)
+    except BaseException:
+        store.release(key)
+        raise
+    _store_response(store, key, digest, status_code, result.model_dump_json())
+    return result
+
+
+async def run_idempotent_async(
+    store: IdempotencyStore,
+    key: Optional[str],
+    scope: str,
+    body: BaseModel,
+    execute: Callable[[], Awaitable[BaseModel]],
+    status_code: int = 201,
+) -> Union[BaseModel, Response]:
+    """Igual que run_idempotent; el almacén es síncrono y corre en el threadpool."""
+    if key is None:
+        try:
+            return await execute()
+        except Exception as e:
+            raise to_http(e)
+
+    digest = fingerprint(scope, body)
+    try:
+        stored = await run_in_threadpool(store.begin, key, digest)
+    except Exception as e:
+        raise to_http(e)
+    if stored is not None:
+        return _replay(stored)
+
+    try:
+        result = await execute()
+    except Exception as e:
+        raise await run_in_threadpool(_settle_error, store, key, digest, e)
+    except BaseException:
+        # Request cancelado: liberar sin ceder el control al event loop
+        store.release(key)
+        raise
+    await run_in_threadpool(_store_response, store, key, digest, status_code, result.model_dump_json())
+    return result
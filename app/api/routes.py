@@ -1,9 +1,24 @@
 """Endpoints FastAPI para Customer, Account y Transacciones. Toda la lógica pasa por BankingFacade."""
-from fastapi import APIRouter, Depends, Query
+import io
+from tempfile import SpooledTemporaryFile
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Path, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 
 from app.application.facade import BankingFacade
-from app.api.deps import get_facade, to_http
+from app.api.conditional import account_etag, history_etag, if_none_match, matches, not_modified, tag
+from app.api.deps import account_cache, get_facade, to_http
+from app.api.idempotency import get_idempotency_store, idempotency_key, run_idempotent
+from app.api.serializers import transactions_response
 from app.domain.exceptions import NotFoundError
+from app.services.batch_service import BatchOperation
+from app.infra.database import DB_PROFILE, engine
+from app.infra.idempotency import IdempotencyStore
+from app.infra.pool_stats import pool_status
+from app.services.import_service import CSV, FORMATS, NDJSON
+from app.services.pagination import encode_cursor
 from app.schemas.dto import (
     CustomerCreateRequest,
     CustomerResponse,
@@ -13,10 +28,33 @@ from app.schemas.dto import (
     WithdrawRequest,
     TransferRequest,
     TransactionResponse,
+    BatchRequest,
+    BatchResponse,
+    BatchItemResponse,
+    ImportReportResponse,
+    RejectedRowResponse,
+    MovementSummary,
+    StatementResponse,
 )
 
 router = APIRouter()
 
+# Cuerpo de importación que se mantiene en memoria antes de volcarse a disco
+IMPORT_SPOOL_MAX_MEMORY = 8 * 1024 * 1024
+
+EXPORT_MEDIA_TYPES = {CSV: "text/csv; charset=utf-8", NDJSON: "application/x-ndjson"}
+
+
+def _transaction_response(transaction) -> TransactionResponse:
+    return TransactionResponse(
+        id=transaction.id,
+        type=transaction.type,
+        amount=transaction.amount,
+        currency=getattr(transaction, "currency", "USD"),
+        status=transaction.status,
+        created_at=transaction.created_at,
+    )
+
 
  # Configuration Endpoints
 
@@ -54,6 +92,36 @@ def set_risk_rule(
         raise to_http(e)
 
 
+# Infra Endpoints
+
+@router.get(
+    "/infra/pool",
+    tags=["infraestructura"],
+    summary="Estado del pool de conexiones",
+    description=(
+        "Perfil de conexión activo, conexiones en uso/libres/overflow y espera por "
+        "conexión (promedio, máximo, histograma y timeouts) desde el arranque."
+    ),
+)
+async def get_pool_status(request: Request):
+    # async def: responde aunque el threadpool esté saturado, justo cuando más interesa
+    status = {"profile": DB_PROFILE.name, "sync": pool_status(engine)}
+    if getattr(request.app.state, "api_mode", "sync") == "async":
+        from app.infra.async_database import async_engine
+        status["async"] = pool_status(async_engine.sync_engine)
+    return status
+
+
+@router.get(
+    "/infra/cache",
+    tags=["infraestructura"],
+    summary="Estado del caché de cuentas",
+    description="Tamaño, hits/misses, evicciones e invalidaciones del caché de cuentas de este worker.",
+)
+async def get_cache_status():
+    return {"accounts": account_cache.stats()}
+
+
 # Customers Endpoints
 
 @router.post(
@@ -109,16 +177,25 @@ def create_account(
     "/accounts/{account_id}",
     response_model=AccountResponse,
     summary="Obtener cuenta",
-    description="Retorna el detalle de una cuenta por su ID. 404 si no existe.",
+    description=(
+        "Retorna el detalle de una cuenta por su ID. 404 si no existe. "
+        "Incluye ETag: con If-None-Match y la cuenta sin cambios responde 304 sin cuerpo."
+    ),
 )
 def get_account(
     account_id: str,
+    response: Response,
     facade: BankingFacade = Depends(get_facade),
+    etag_header: Optional[str] = Depends(if_none_match),
 ):
     try:
         account = facade.get_account(account_id)
         if not account:
             raise NotFoundError(f"Cuenta {account_id} no encontrada")
+        etag = account_etag(account)
+        if matches(etag_header, etag):
+            return not_modified(etag)
+        tag(response, etag)
         return AccountResponse(
             id=account.id,
             customer_id=account.customer_id,
@@ -137,24 +214,17 @@ def get_account(
     response_model=TransactionResponse,
     status_code=201,
     summary="Depositar",
-    description="Deposita un monto en una cuenta. Errores: 400 (validación/risk), 403 (cuenta congelada), 404 (cuenta no encontrada).",
+    description="Deposita un monto en una cuenta. Errores: 400 (validación/risk), 403 (cuenta congelada), 404 (cuenta no encontrada). Con Idempotency-Key un reintento recibe la respuesta original (409 si la key se reusa con otro cuerpo).",
 )
 def deposit(
     body: DepositRequest,
     facade: BankingFacade = Depends(get_facade),
+    store: IdempotencyStore = Depends(get_idempotency_store),
+    key: Optional[str] = Depends(idempotency_key),
 ):
-    try:
-        transaction = facade.deposit(account_id=body.account_id, amount=body.amount)
-        return TransactionResponse(
-            id=transaction.id,
-            type=transaction.type,
-            amount=transaction.amount,
-            currency=getattr(transaction, "currency", "USD"),
-            status=transaction.status,
-            created_at=transaction.created_at,
-        )
-    except Exception as e:
-        raise to_http(e)
+    return run_idempotent(store, key, "deposit", body, lambda: _transaction_response(
+        facade.deposit(account_id=body.account_id, amount=body.amount)
+    ))
 
 
 @router.post(
@@ -162,24 +232,17 @@ def deposit(
     response_model=TransactionResponse,
     status_code=201,
     summary="Retirar",
-    description="Retira un monto de una cuenta. 400 si fondos insuficientes; 403 si cuenta congelada/cerrada.",
+    description="Retira un monto de una cuenta. 400 si fondos insuficientes; 403 si cuenta congelada/cerrada. Con Idempotency-Key un reintento recibe la respuesta original (409 si la key se reusa con otro cuerpo).",
 )
 def withdraw(
     body: WithdrawRequest,
     facade: BankingFacade = Depends(get_facade),
+    store: IdempotencyStore = Depends(get_idempotency_store),
+    key: Optional[str] = Depends(idempotency_key),
 ):
-    try:
-        transaction = facade.withdraw(account_id=body.account_id, amount=body.amount)
-        return TransactionResponse(
-            id=transaction.id,
-            type=transaction.type,
-            amount=transaction.amount,
-            currency=getattr(transaction, "currency", "USD"),
-            status=transaction.status,
-            created_at=transaction.created_at,
-        )
-    except Exception as e:
-        raise to_http(e)
+    return run_idempotent(store, key, "withdraw", body, lambda: _transaction_response(
+        facade.withdraw(account_id=body.account_id, amount=body.amount)
+    ))
 
 
 @router.post(
@@ -187,57 +250,220 @@ def withdraw(
     response_model=TransactionResponse,
     status_code=201,
     summary="Transferir",
-    description="Transfiere un monto entre dos cuentas. 400 si fondos insuficientes o reglas de riesgo; 403 si alguna cuenta no operable.",
+    description="Transfiere un monto entre dos cuentas. 400 si fondos insuficientes o reglas de riesgo; 403 si alguna cuenta no operable. Con Idempotency-Key un reintento recibe la respuesta original (409 si la key se reusa con otro cuerpo).",
 )
 def transfer(
     body: TransferRequest,
     facade: BankingFacade = Depends(get_facade),
+    store: IdempotencyStore = Depends(get_idempotency_store),
+    key: Optional[str] = Depends(idempotency_key),
 ):
-    try:
-        transaction = facade.transfer(
+    return run_idempotent(store, key, "transfer", body, lambda: _transaction_response(
+        facade.transfer(
             from_account=body.from_account_id,
             to_account=body.to_account_id,
             amount=body.amount,
         )
-        return TransactionResponse(
-            id=transaction.id,
-            type=transaction.type,
-            amount=transaction.amount,
-            currency=getattr(transaction, "currency", "USD"),
-            status=transaction.status,
-            created_at=transaction.created_at,
-        )
+    ))
+
+
+@router.post(
+    "/transactions/batch",
+    response_model=BatchResponse,
+    summary="Lote de transacciones",
+    description=(
+        "Ejecuta hasta 10.000 depósitos, retiros y transferencias en orden, con las mismas "
+        "reglas que los endpoints individuales y un commit por bloque de operaciones. "
+        "Cada resultado indica la transacción aprobada o el error (con el código HTTP que "
+        "habría retornado la operación individual). Si la base de datos falla, el bloque en "
+        "curso se revierte y esas operaciones y las siguientes vuelven con executed=false."
+    ),
+)
+def execute_batch(
+    body: BatchRequest,
+    facade: BankingFacade = Depends(get_facade),
+):
+    try:
+        results = facade.execute_batch([
+            BatchOperation(
+                type=op.type,
+                account_id=op.account_id,
+                amount=op.amount,
+                target_account_id=op.to_account_id,
+            )
+            for op in body.operations
+        ])
     except Exception as e:
         raise to_http(e)
 
+    items = []
+    for result in results:
+        item = BatchItemResponse(index=result.index, executed=result.executed)
+        if result.transaction is not None:
+            t = result.transaction
+            item.transaction = TransactionResponse(
+                id=t.id,
+                type=t.type,
+                amount=t.amount,
+                currency=getattr(t, "currency", "USD"),
+                status=t.status,
+                created_at=t.created_at,
+            )
+        if result.error is not None:
+            http_error = to_http(result.error)
+            item.error = http_error.detail
+            item.error_status = http_error.status_code
+        items.append(item)
+
+    approved = sum(1 for r in results if r.transaction is not None)
+    not_executed = sum(1 for r in results if not r.executed)
+    return BatchResponse(
+        approved=approved,
+        failed=len(results) - approved - not_executed,
+        not_executed=not_executed,
+        results=items,
+    )
+
 
 @router.get(
     "/accounts/{account_id}/transactions",
     response_model=list[TransactionResponse],
     summary="Listar transacciones de una cuenta",
-    description="Lista las transacciones de la cuenta con paginación (limit y offset).",
+    description=(
+        "Lista las transacciones de la cuenta con paginación (limit y offset). "
+        "Para paginación keyset enviar `cursor` con el valor del header X-Next-Cursor "
+        "de la página anterior (no se combina con offset). Incluye ETag: con "
+        "If-None-Match y sin transacciones nuevas responde 304 sin leer la página."
+    ),
 )
 def list_account_transactions(
     account_id: str,
     facade: BankingFacade = Depends(get_facade),
     limit: int = Query(10, ge=1, le=100, description="Cantidad máxima de registros"),
     offset: int = Query(0, ge=0, description="Registros a saltar"),
+    cursor: Optional[str] = Query(None, description="Cursor opaco de la página anterior (X-Next-Cursor)"),
+    etag_header: Optional[str] = Depends(if_none_match),
 ):
     try:
         account = facade.get_account(account_id)
         if not account:
             raise NotFoundError(f"Cuenta {account_id} no encontrada")
-        transactions = facade.list_transactions(account_id=account_id, limit=limit, offset=offset)
-        return [
-            TransactionResponse(
-                id=t.id,
-                type=t.type,
-                amount=t.amount,
-                currency=getattr(t, "currency", "USD"),
-                status=t.status,
-                created_at=t.created_at,
-            )
-            for t in transactions
-        ]
+        etag = history_etag(account, facade.latest_transaction_id(account_id), limit, offset, cursor)
+        if matches(etag_header, etag):
+            return not_modified(etag)
+        transactions = facade.list_transactions(
+            account_id=account_id, limit=limit, offset=offset, cursor=cursor
+        )
+        response = transactions_response(transactions)
+        tag(response, etag)
+        if len(transactions) == limit:
+            response.headers["X-Next-Cursor"] = encode_cursor(transactions[-1])
+        return response
+    except Exception as e:
+        raise to_http(e)
+
+
+@router.get(
+    "/accounts/{account_id}/transactions/export",
+    response_class=StreamingResponse,
+    summary="Exportar el historial completo de una cuenta",
+    description=(
+        "Descarga todas las transacciones de la cuenta (más antiguas primero) como NDJSON o CSV. "
+        "Las filas se leen con un cursor del servidor y se envían a medida que llegan, "
+        "así la memoria no depende del tamaño del historial."
+    ),
+)
+def export_account_transactions(
+    account_id: str,
+    facade: BankingFacade = Depends(get_facade),
+    fmt: str = Query(NDJSON, alias="format", description=f"Formato de salida: {' | '.join(FORMATS)}"),
+):
+    try:
+        chunks = facade.export_transactions(account_id, fmt)
     except Exception as e:
         raise to_http(e)
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="transactions-{account_id}.{fmt}"'},
+    )
+
+
+@router.get(
+    "/accounts/{account_id}/statements/{year}/{month}",
+    response_model=StatementResponse,
+    summary="Estado de cuenta mensual",
+    description=(
+        "Saldo inicial y final del mes, cantidad y monto de depósitos, retiros y transferencias "
+        "enviadas/recibidas, y comisiones cobradas (solo transacciones APPROVED). Los meses "
+        "cerrados se calculan una vez y se sirven guardados; el mes en curso se actualiza "
+        "sumando solo los movimientos nuevos."
+    ),
+)
+def get_statement(
+    account_id: str,
+    year: int = Path(ge=1, le=9999),
+    month: int = Path(ge=1, le=12),
+    facade: BankingFacade = Depends(get_facade),
+):
+    try:
+        s = facade.get_statement(account_id, year, month)
+    except Exception as e:
+        raise to_http(e)
+    return StatementResponse(
+        account_id=s.account_id,
+        period=s.period.strftime("%Y-%m"),
+        opening_balance=s.opening_balance,
+        closing_balance=s.closing_balance,
+        deposits=MovementSummary(count=s.deposits_count, total=s.deposits_total),
+        withdrawals=MovementSummary(count=s.withdrawals_count, total=s.withdrawals_total),
+        transfers_out=MovementSummary(count=s.transfers_out_count, total=s.transfers_out_total),
+        transfers_in=MovementSummary(count=s.transfers_in_count, total=s.transfers_in_total),
+        fees_total=s.fees_total,
+        closed=s.closed,
+        computed_through=s.computed_through,
+    )
+
+
+# Import Endpoints
+
+@router.post(
+    "/imports/customers",
+    response_model=ImportReportResponse,
+    summary="Importar clientes",
+    description=(
+        "Importa clientes desde el cuerpo del request (CSV con encabezado name,email[,currency] "
+        "o NDJSON con un objeto por línea) y crea una cuenta por cliente. Se procesa por "
+        "bloques con inserts en lote; emails ya registrados o repetidos se reportan como rechazados."
+    ),
+)
+async def import_customers(
+    request: Request,
+    facade: BankingFacade = Depends(get_facade),
+    fmt: str = Query(CSV, alias="format", description=f"Formato del cuerpo: {' | '.join(FORMATS)}"),
+    with_accounts: bool = Query(True, description="Crear una cuenta por cliente importado"),
+):
+    # El cuerpo se copia por partes a un archivo temporal (en memoria hasta 8 MB);
+    # la importación corre en el threadpool porque los repositorios son síncronos
+    with SpooledTemporaryFile(max_size=IMPORT_SPOOL_MAX_MEMORY, mode="w+b") as spool:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+        text = io.TextIOWrapper(spool, encoding="utf-8-sig", newline="")
+        try:
+            report = await run_in_threadpool(facade.import_customers, text, fmt, with_accounts)
+        except Exception as e:
+            raise to_http(e)
+        finally:
+            text.detach()
+
+    return ImportReportResponse(
+        processed=report.processed,
+        customers_created=report.customers_created,
+        accounts_created=report.accounts_created,
+        rejected_count=report.rejected_count,
+        rejected=[
+            RejectedRowResponse(line=r.line, email=r.email, reason=r.reason) for r in report.rejected
+        ],
+    )
+
@@ -0,0 +1,51 @@
+"""Serialización directa de listas de transacciones a JSON.
+
+El camino de `response_model` arma un TransactionResponse por fila y FastAPI lo
+vuelve a validar y serializar. Para listas se usa un TypeAdapter compilado una
+sola vez sobre un TypedDict con los mismos campos: cada transacción pasa a un
+dict y pydantic-core escribe los bytes JSON sin construir modelos ni validar.
+La salida es idéntica byte a byte a la de TransactionResponse.
+"""
+from datetime import datetime
+from decimal import Decimal
+from typing import Iterable, List
+
+from fastapi import Response
+from pydantic import TypeAdapter
+from typing_extensions import TypedDict
+
+from app.domain.entities import Transaction
+from app.domain.enums import TransactionStatus, TransactionType
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+class TransactionRow(TypedDict):
+    id: str
+    type: TransactionType
+    amount: Decimal
+    currency: str
+    status: TransactionStatus
+    created_at: datetime
+
+
+_transaction_list = TypeAdapter(List[TransactionRow])
+
+
+def transactions_json(transactions: Iterable[Transaction]) -> bytes:
+    return _transaction_list.dump_json([
+        {
+            "id": t.id,
+            "type": t.type,
+            "amount": t.amount,
+            "currency": t.currency,
+            "status": t.status,
+            "created_at": t.created_at,
+        }
+        for t in transactions
+    ])
+
+
+def transactions_response(transactions: Iterable[Transaction]) -> Response:
+    """Respuesta 200 ya serializada; FastAPI la envía sin pasar por response_model."""
+    return Response(content=transactions_json(transactions), media_type=JSON_MEDIA_TYPE)
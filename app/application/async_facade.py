@@ -0,0 +1,68 @@
+"""Fachada para el modo API_MODE=async.
+
+Lecturas: repositorios asíncronos (sin bloquear el event loop).
+Escrituras: la misma BankingFacade síncrona ejecutada con AsyncSession.run_sync,
+es decir, los mismos servicios, reglas de riesgo, comisiones y unidad de trabajo
+sobre la conexión asíncrona. El comportamiento de negocio es idéntico en ambos modos.
+"""
+from decimal import Decimal
+from typing import Callable, List, Optional, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.application.facade import BankingFacade
+from app.domain.entities import Account, Customer, Transaction
+from app.infra.archive import TransactionArchive
+from app.repositories.async_repo import AsyncSQLAccountRepository, AsyncSQLTransactionRepository
+from app.services.configuration_service import ConfigurationService
+from app.services.pagination import normalize_page
+
+T = TypeVar("T")
+
+
+class AsyncBankingFacade:
+    def __init__(
+        self,
+        session: AsyncSession,
+        config_service: ConfigurationService,
+        build_facade: Callable[[Session, ConfigurationService], BankingFacade],
+        archive: Optional[TransactionArchive] = None,
+    ):
+        self.session = session
+        self.config_service = config_service
+        self.build_facade = build_facade
+        self.account_repo = AsyncSQLAccountRepository(session)
+        self.transaction_repo = AsyncSQLTransactionRepository(session, archive)
+
+    async def _run(self, operation: Callable[[BankingFacade], T]) -> T:
+        """Ejecuta una operación de la fachada síncrona sobre la conexión asíncrona."""
+        return await self.session.run_sync(
+            lambda sync_session: operation(self.build_facade(sync_session, self.config_service))
+        )
+
+    async def create_customer(self, name: str, email: str) -> Customer:
+        return await self._run(lambda facade: facade.create_customer(name, email))
+
+    async def create_account(self, customer_id: str, currency: str = "USD") -> Account:
+        return await self._run(lambda facade: facade.create_account(customer_id, currency))
+
+    async def deposit(self, account_id: str, amount: Decimal) -> Transaction:
+        return await self._run(lambda facade: facade.deposit(account_id, amount))
+
+    async def withdraw(self, account_id: str, amount: Decimal) -> Transaction:
+        return await self._run(lambda facade: facade.withdraw(account_id, amount))
+
+    async def transfer(self, from_account: str, to_account: str, amount: Decimal) -> Transaction:
+        return await self._run(lambda facade: facade.transfer(from_account, to_account, amount))
+
+    async def get_account(self, account_id: str) -> Optional[Account]:
+        return await self.account_repo.get_by_id(account_id)
+
+    async def list_transactions(self, account_id: str, limit: int = 10, offset: int = 0,
+                                cursor: Optional[str] = None) -> List[Transaction]:
+        limit, offset, after = normalize_page(limit, offset, cursor)
+        return await self.transaction_repo.list_page(account_id, limit, offset, after)
+
+    async def latest_transaction_id(self, account_id: str) -> Optional[str]:
+        return await self.transaction_repo.latest_id(account_id)
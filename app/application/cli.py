@@ -0,0 +1,238 @@
+"""Comandos de línea para tareas operativas sobre la misma base de datos que la API.
+
+Uso:
+    python -m app.application.cli import-customers clientes.csv
+    python -m app.application.cli import-customers clientes.ndjson --no-accounts --chunk-size 5000
+    python -m app.application.cli backtest-risk --max-amount 800 --velocity 3 10 --daily-limit 1500
+    python -m app.application.cli snapshot-ledger --lag-seconds 60
+    python -m app.application.cli prune-risk-counters
+    python -m app.application.cli ledger-balance <account_id> --at 2025-01-31T23:59:59
+    python -m app.application.cli statement <account_id> 2025-01
+    python -m app.application.cli backfill-fees
+    python -m app.application.cli archive-transactions --older-than-days 180
+"""
+import argparse
+import json
+import os
+import sys
+from dataclasses import asdict
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import List, Optional
+
+from app.api.deps import get_config_service, get_facade
+from app.domain.exceptions import BankingError
+from app.infra.archive import TransactionArchive
+from app.infra.database import SessionLocal, init_db
+from app.services import archive_service, fee_backfill, risk_backtest
+from app.services.import_service import CSV, DEFAULT_CHUNK_SIZE, FORMATS, NDJSON
+from app.services.risk_strategies import DailyLimitRule, MaxAmountRule, VelocityRule
+
+
+def _guess_format(path: Path) -> str:
+    return NDJSON if path.suffix.lower() in (".ndjson", ".jsonl") else CSV
+
+
+def import_customers(args: argparse.Namespace) -> int:
+    path = Path(args.file)
+    fmt = args.format or _guess_format(path)
+    init_db()
+    session = SessionLocal()
+    try:
+        facade = get_facade(session, get_config_service())
+        with path.open(encoding="utf-8-sig", newline="") as stream:
+            report = facade.import_customers(stream, fmt, not args.no_accounts, args.chunk_size)
+    except BankingError as e:
+        print(f"Error: {e.message}", file=sys.stderr)
+        return 1
+    finally:
+        session.close()
+    print(json.dumps(asdict(report), ensure_ascii=False, indent=2))
+    return 0
+
+
+def backtest_risk(args: argparse.Namespace) -> int:
+    rules = []
+    if args.max_amount is not None:
+        rules.append(MaxAmountRule(args.max_amount))
+    if args.velocity is not None:
+        rules.append(VelocityRule(max_transactions=args.velocity[0], time_window_minutes=args.velocity[1]))
+    if args.daily_limit is not None:
+        rules.append(DailyLimitRule(args.daily_limit))
+    if not rules:
+        # Sin umbrales explícitos: las tres reglas con sus valores actuales
+        rules = [MaxAmountRule(), VelocityRule(), DailyLimitRule()]
+    statuses = None if args.all_statuses else risk_backtest.APPROVED_ONLY
+    init_db()
+    session = SessionLocal()
+    try:
+        archive = TransactionArchive(args.archive_dir) if args.archive_dir else None
+        chunks = risk_backtest.iter_history_chunks(session, args.chunk_size, statuses, archive)
+        report = risk_backtest.backtest(chunks, rules)
+    except BankingError as e:
+        print(f"Error: {e.message}", file=sys.stderr)
+        return 1
+    finally:
+        session.close()
+    print(json.dumps(asdict(report), ensure_ascii=False, indent=2))
+    return 0
+
+
+def _with_facade(action):
+    """Ejecuta action(facade) sobre una sesión nueva; errores de dominio -> código 1."""
+    init_db()
+    session = SessionLocal()
+    try:
+        return action(get_facade(session, get_config_service()))
+    except BankingError as e:
+        print(f"Error: {e.message}", file=sys.stderr)
+        return None
+    finally:
+        session.close()
+
+
+def snapshot_ledger(args: argparse.Namespace) -> int:
+    # Con margen: una operación que aún no hizo commit no puede quedar antes del snapshot
+    as_of = datetime.utcnow() - timedelta(seconds=args.lag_seconds)
+    taken = _with_facade(lambda facade: facade.snapshot_ledger(as_of))
+    if taken is None:
+        return 1
+    print(json.dumps({"as_of": as_of.isoformat(), "snapshots": taken}))
+    return 0
+
+
+def prune_risk_counters(args: argparse.Namespace) -> int:
+    pruned = _with_facade(lambda facade: facade.prune_risk_counters())
+    if pruned is None:
+        return 1
+    print(json.dumps({"pruned": pruned}))
+    return 0
+
+
+def ledger_balance(args: argparse.Namespace) -> int:
+    balance = _with_facade(lambda facade: facade.get_ledger_balance(args.account_id, args.at))
+    if balance is None:
+        return 1
+    at = (args.at or datetime.utcnow()).isoformat()
+    print(json.dumps({"account_id": args.account_id, "at": at, "balance": str(balance)}))
+    return 0
+
+
+def statement(args: argparse.Namespace) -> int:
+    result = _with_facade(lambda facade: facade.get_statement(args.account_id, args.period.year, args.period.month))
+    if result is None:
+        return 1
+    summary = asdict(result)
+    summary["closing_balance"] = result.closing_balance
+    print(json.dumps(summary, ensure_ascii=False, indent=2, default=str))
+    return 0
+
+
+def backfill_fees(args: argparse.Namespace) -> int:
+    init_db()
+    session = SessionLocal()
+    try:
+        report = fee_backfill.backfill_applied_fees(session, batch_size=args.batch_size)
+    finally:
+        session.close()
+    print(json.dumps(asdict(report), ensure_ascii=False, indent=2))
+    return 0
+
+
+def archive_transactions(args: argparse.Namespace) -> int:
+    if not args.dir:
+        print("Error: indicar --dir o ARCHIVE_DIR (el mismo directorio que lee la API)", file=sys.stderr)
+        return 1
+    cutoff = datetime.utcnow() - timedelta(days=args.older_than_days)
+    init_db()
+    session = SessionLocal()
+    try:
+        report = archive_service.archive_transactions(session, TransactionArchive(args.dir), cutoff,
+                                                      batch_size=args.batch_size)
+    except BankingError as e:
+        print(f"Error: {e.message}", file=sys.stderr)
+        return 1
+    finally:
+        session.close()
+    print(json.dumps(asdict(report), ensure_ascii=False, indent=2, default=str))
+    return 0
+
+
+def _month(value: str) -> date:
+    return datetime.strptime(value, "%Y-%m").date()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.application.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    importer = commands.add_parser("import-customers", help="Importa clientes desde CSV o NDJSON")
+    importer.add_argument("file", help="Archivo a importar (.csv, .ndjson o .jsonl)")
+    importer.add_argument("--format", choices=FORMATS, help="Por defecto se deduce de la extensión")
+    importer.add_argument("--no-accounts", action="store_true", help="No crear una cuenta por cliente")
+    importer.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                          help=f"Filas por bloque/commit (por defecto {DEFAULT_CHUNK_SIZE})")
+    importer.set_defaults(handler=import_customers)
+
+    backtester = commands.add_parser("backtest-risk",
+                                     help="Re-evalúa el historial con otros umbrales de riesgo")
+    backtester.add_argument("--max-amount", type=Decimal, help="Umbral de MaxAmountRule")
+    backtester.add_argument("--velocity", type=int, nargs=2, metavar=("MAX_TX", "MINUTOS"),
+                            help="Umbral y ventana de VelocityRule")
+    backtester.add_argument("--daily-limit", type=Decimal, help="Umbral de DailyLimitRule")
+    backtester.add_argument("--all-statuses", action="store_true",
+                            help="Incluir transacciones no APPROVED en las ventanas")
+    backtester.add_argument("--chunk-size", type=int, default=risk_backtest.DEFAULT_CHUNK_SIZE,
+                            help=f"Filas por bloque (por defecto {risk_backtest.DEFAULT_CHUNK_SIZE})")
+    backtester.add_argument("--archive-dir", default=os.environ.get("ARCHIVE_DIR"),
+                            help="Incluir el historial archivado en frío (por defecto ARCHIVE_DIR)")
+    backtester.set_defaults(handler=backtest_risk)
+
+    snapshotter = commands.add_parser("snapshot-ledger",
+                                      help="Guarda snapshots de saldo del libro mayor (para cron)")
+    snapshotter.add_argument("--lag-seconds", type=float, default=60,
+                             help="El snapshot cubre hasta ahora menos este margen (por defecto 60)")
+    snapshotter.set_defaults(handler=snapshot_ledger)
+
+    pruner = commands.add_parser("prune-risk-counters",
+                                 help="Borra contadores de riesgo que ninguna regla activa lee (para cron)")
+    pruner.set_defaults(handler=prune_risk_counters)
+
+    balancer = commands.add_parser("ledger-balance", help="Saldo de una cuenta según el libro mayor")
+    balancer.add_argument("account_id", help="Id de la cuenta (o system:cash / system:fees)")
+    balancer.add_argument("--at", type=datetime.fromisoformat, help="Fecha UTC (ISO 8601); por defecto ahora")
+    balancer.set_defaults(handler=ledger_balance)
+
+    statements = commands.add_parser("statement", help="Estado de cuenta mensual (materializa los meses cerrados)")
+    statements.add_argument("account_id", help="Id de la cuenta")
+    statements.add_argument("period", type=_month, help="Mes en formato YYYY-MM")
+    statements.set_defaults(handler=statement)
+
+    backfiller = commands.add_parser("backfill-fees",
+                                     help="Completa la comisión de depósitos y retiros viejos desde el libro mayor")
+    backfiller.add_argument("--batch-size", type=int, default=fee_backfill.DEFAULT_BATCH_SIZE,
+                            help=f"Transacciones por consulta al libro mayor (por defecto {fee_backfill.DEFAULT_BATCH_SIZE})")
+    backfiller.set_defaults(handler=backfill_fees)
+
+    archiver = commands.add_parser("archive-transactions",
+                                   help="Pasa las transacciones viejas al archivo en frío (para cron)")
+    archiver.add_argument("--older-than-days", type=float,
+                          default=float(os.environ.get("ARCHIVE_AFTER_DAYS", archive_service.DEFAULT_AFTER_DAYS)),
+                          help="Edad mínima de lo que se archiva (ARCHIVE_AFTER_DAYS; por defecto "
+                               f"{archive_service.DEFAULT_AFTER_DAYS})")
+    archiver.add_argument("--dir", default=os.environ.get("ARCHIVE_DIR"),
+                          help="Directorio de segmentos (por defecto ARCHIVE_DIR)")
+    archiver.add_argument("--batch-size", type=int, default=archive_service.DEFAULT_BATCH_SIZE,
+                          help=f"Filas leídas por bloque (por defecto {archive_service.DEFAULT_BATCH_SIZE})")
+    archiver.set_defaults(handler=archive_transactions)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,12 @@
+from datetime import datetime
 from decimal import Decimal
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, TypeVar
 
 from app.domain.entities import Customer, Account, Transaction
+from app.domain.statement import MonthlyStatement
 from app.domain.exceptions import ValidationError, NotFoundError, BankingError
-from app.repositories.base import CustomerRepository, AccountRepository, TransactionRepository
+from app.repositories.base import CustomerRepository, AccountRepository, LedgerRepository, TransactionRepository, UnitOfWork
+from app.repositories.memory import InMemoryUnitOfWork
 
 from app.services.configuration_service import ConfigurationService
 from app.services.account_service import AccountService
@@ -11,6 +14,12 @@ from app.services.customer_service import CustomerService
 from app.services.transfer_service import TransferService
 from app.services.deposit_service import DepositService
 from app.services.withdraw_service import WithdrawService
+from app.services.batch_service import BatchService, BatchOperation, BatchItemResult
+from app.services.import_service import DEFAULT_CHUNK_SIZE, ImportService, ImportReport
+from app.services.export_service import check_format, iter_export
+from app.services.statement_service import StatementService
+
+T = TypeVar("T")
 
 class BankingFacade:
     def __init__(
@@ -24,6 +33,9 @@ class BankingFacade:
         config_service: ConfigurationService,
         customer_service: CustomerService,
         account_service: AccountService,
+        uow: Optional[UnitOfWork] = None,
+        ledger_repo: Optional[LedgerRepository] = None,
+        statement_service: Optional[StatementService] = None,
     ):
         self.customer_repo = customer_repo
         self.account_repo = account_repo
@@ -34,19 +46,49 @@ class BankingFacade:
         self.config_service = config_service
         self.customer_service = customer_service
         self.account_service = account_service
+        self.uow = uow if uow is not None else InMemoryUnitOfWork()
+        self.ledger_repo = ledger_repo
+        self.statement_service = statement_service
+
+    def _atomic(self, operation: Callable[[], T]) -> T:
+        """Ejecuta una operación de escritura dentro de una sola unidad de trabajo (un commit)."""
+        with self.uow:
+            try:
+                result = operation()
+            except BankingError:
+                # Los rechazos de dominio se confirman igual: la transacción REJECTED
+                # queda registrada como auditoría (y cuenta para las reglas de riesgo)
+                self.uow.commit()
+                raise
+            self.uow.commit()
+            return result
+
+    def _read(self, operation: Callable[[], T]) -> T:
+        """Ejecuta una lectura y cierra la unidad de trabajo sin commit.
+
+        En SQL eso termina la transacción (rollback) y devuelve la conexión al pool
+        antes de que la API serialice la respuesta: si no, bajo carga los requests
+        retienen conexiones mientras esperan hilo y el pool se agota.
+        """
+        with self.uow:
+            return operation()
 
+    def _stream(self, produce: Callable[[], Iterable[T]]) -> Iterator[T]:
+        """Como _read, pero la unidad de trabajo sigue abierta mientras se consume el iterador."""
+        with self.uow:
+            yield from produce()
 
     def create_customer(self, name: str, email: str) -> Customer:
         # El servicio se encargará de validar el email y lanzar DuplicateEmailError
-        return self.customer_service.create_customer(name=name, email=email)
+        return self._atomic(lambda: self.customer_service.create_customer(name=name, email=email))
 
     def create_account(self, customer_id: str, currency: str = "USD") -> Account:
         # Esto retorna y sale de la función inmediatamente
-        return self.account_service.create_account(customer_id)
+        return self._atomic(lambda: self.account_service.create_account(customer_id))
 
     def deposit(self, account_id: str, amount: Decimal) -> Transaction:
         try:
-            return self.deposit_service.execute(account_id, amount)
+            return self._atomic(lambda: self.deposit_service.execute(account_id, amount))
         except BankingError:
             # Errores de dominio (risk, cuenta no operable, fondos, etc.) se propagan
             # para que la capa API los pueda mapear correctamente a HTTP (400/403/404)
@@ -56,7 +98,7 @@ class BankingFacade:
 
     def withdraw(self, account_id: str, amount: Decimal) -> Transaction:
         try:
-            return self.withdraw_service.execute(account_id, amount)
+            return self._atomic(lambda: self.withdraw_service.execute(account_id, amount))
         except BankingError:
             # Mantener errores de dominio para un mapeo HTTP consistente
             raise
@@ -65,19 +107,81 @@ class BankingFacade:
 
     def transfer(self, from_account: str, to_account: str, amount: Decimal) -> Transaction:
         try:
-            return self.transfer_service.execute(from_account, to_account, amount)
+            return self._atomic(lambda: self.transfer_service.execute(from_account, to_account, amount))
         except BankingError:
             # Mantener errores de dominio para un mapeo HTTP consistente
             raise
         except Exception as e:
             raise ValidationError(f"Error en transferencia: {str(e)}")
 
+    def execute_batch(self, operations: List[BatchOperation]) -> List[BatchItemResult]:
+        """Ejecuta un lote de depósitos/retiros/transferencias con commits por bloque.
+
+        No usa _atomic: BatchService maneja su propia unidad de trabajo por bloque.
+        """
+        batch_service = BatchService(
+            account_repo=self.account_repo,
+            deposit_service=self.deposit_service,
+            withdraw_service=self.withdraw_service,
+            transfer_service=self.transfer_service,
+            uow=self.uow,
+        )
+        return batch_service.execute(operations)
+
+    def import_customers(self, stream: TextIO, fmt: str, with_accounts: bool = True,
+                         chunk_size: int = DEFAULT_CHUNK_SIZE) -> ImportReport:
+        """Importa clientes (y una cuenta por cliente) desde CSV/NDJSON, con commits por bloque."""
+        import_service = ImportService(
+            customer_repo=self.customer_repo,
+            account_repo=self.account_repo,
+            uow=self.uow,
+            chunk_size=chunk_size,
+        )
+        return import_service.import_stream(stream, fmt, with_accounts)
+
     def get_account(self, account_id: str) -> Optional[Account]:
-        return self.account_service.get_account(account_id)
+        return self._read(lambda: self.account_service.get_account(account_id))
+
+    def list_transactions(self, account_id: str, limit: int = 10, offset: int = 0,
+                          cursor: Optional[str] = None) -> List[Transaction]:
+        return self._read(lambda: self.account_service.list_transactions(account_id, limit, offset, cursor))
 
-    def list_transactions(self, account_id: str, limit: int = 10, offset: int = 0) -> List[Transaction]:
-        return self.account_service.list_transactions(account_id, limit, offset)
+    def latest_transaction_id(self, account_id: str) -> Optional[str]:
+        return self._read(lambda: self.account_service.latest_transaction_id(account_id))
+
+    def export_transactions(self, account_id: str, fmt: str) -> Iterator[str]:
+        """Historial completo en bloques de texto NDJSON o CSV (ver export_service).
+
+        La cuenta y el formato se validan aquí, antes de enviar el primer byte.
+        """
+        check_format(fmt)
+        self.get_account(account_id)
+        return self._stream(lambda: iter_export(self.transaction_repo.iter_by_account(account_id), fmt))
     
+    def get_ledger_balance(self, account_id: str, at: Optional[datetime] = None) -> Decimal:
+        """Saldo según el libro mayor a una fecha (por defecto, ahora)."""
+        return self._read(lambda: self._ledger().balance_at(account_id, at))
+
+    def snapshot_ledger(self, as_of: datetime) -> int:
+        """Guarda un snapshot a as_of por cada cuenta con movimientos desde el anterior."""
+        return self._atomic(lambda: self._ledger().take_snapshots(as_of))
+
+    def prune_risk_counters(self, now: Optional[datetime] = None) -> int:
+        """Borra los contadores de riesgo fuera de la ventana más amplia de las reglas activas."""
+        horizon = self.config_service.get_current_risk_plan().minute_horizon
+        return self._atomic(lambda: self.transaction_repo.prune_counters(now or datetime.utcnow(), horizon))
+
+    def _ledger(self) -> LedgerRepository:
+        if self.ledger_repo is None:
+            raise ValidationError("La fachada no tiene libro mayor configurado")
+        return self.ledger_repo
+
+    def get_statement(self, account_id: str, year: int, month: int) -> MonthlyStatement:
+        """Estado de cuenta mensual; guarda los meses que materializa (ver statement_service)."""
+        if self.statement_service is None:
+            raise ValidationError("La fachada no tiene estados de cuenta configurados")
+        return self._atomic(lambda: self.statement_service.monthly(account_id, year, month))
+
     def get_config(self) -> Dict[str, Any]:
         """Retorna la configuración actual"""
         return self.config_service.get_full_config()
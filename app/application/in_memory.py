@@ -0,0 +1,28 @@
+"""Cableado de BankingFacade sobre los repositorios en memoria.
+
+Ejecuta exactamente los mismos servicios que la API, sin base de datos: sirve
+para simulaciones grandes y para perfilar la lógica de dominio de forma aislada.
+"""
+from typing import Optional
+
+from app.application.facade import BankingFacade
+from app.application.wiring import wire_facade
+from app.repositories.memory import (
+    InMemoryAccountRepo,
+    InMemoryCustomerRepo,
+    InMemoryLedgerRepo,
+    InMemoryTransactionRepo,
+    InMemoryUnitOfWork,
+)
+from app.services.configuration_service import ConfigurationService
+
+
+def build_in_memory_facade(config_service: Optional[ConfigurationService] = None) -> BankingFacade:
+    return wire_facade(
+        customer_repo=InMemoryCustomerRepo(),
+        account_repo=InMemoryAccountRepo(),
+        transaction_repo=InMemoryTransactionRepo(),
+        uow=InMemoryUnitOfWork(),
+        config_service=config_service or ConfigurationService(),
+        ledger_repo=InMemoryLedgerRepo(),
+    )
@@ -1,27 +1,49 @@
+import os
+from typing import Optional
+
 from fastapi import FastAPI
 
 from app.api.routes import router
 from app.infra.database import init_db
 
-app = FastAPI(
-    title="Fintech Mini Bank API",
-    description="API para clientes, cuentas y transacciones (deposit, withdraw, transfer).",
-    version="1.0.0",
-)
+# "sync": endpoints def sobre el motor síncrono (threadpool de FastAPI).
+# "async": los endpoints de mayor tráfico pasan a async def sobre un motor asíncrono.
+API_MODES = ("sync", "async")
+
+
+def create_app(mode: Optional[str] = None) -> FastAPI:
+    mode = mode or os.getenv("API_MODE", "sync")
+    if mode not in API_MODES:
+        raise ValueError(f"API_MODE inválido: {mode} (usar {' o '.join(API_MODES)})")
+
+    app = FastAPI(
+        title="Fintech Mini Bank API",
+        description="API para clientes, cuentas y transacciones (deposit, withdraw, transfer).",
+        version="1.0.0",
+    )
+    app.state.api_mode = mode
 
-@app.on_event("startup")
-def on_startup():
-    init_db()
+    if mode == "async":
+        # Import diferido: el modo síncrono no necesita el driver asíncrono instalado
+        from app.api.async_routes import async_router
+        from app.infra.async_database import init_async_db
 
+        # Se registra primero: sus rutas tienen prioridad sobre las síncronas equivalentes
+        app.include_router(async_router)
+        app.add_event_handler("startup", init_async_db)
+    else:
+        app.add_event_handler("startup", init_db)
 
-@app.get("/")
-def read_root():
-    return {"message": "API de Fintech Mini Bank funcionando correctamente"}
+    @app.get("/")
+    def read_root():
+        return {"message": "API de Fintech Mini Bank funcionando correctamente"}
 
+    @app.get("/health")
+    def health_check():
+        return {"status": "healthy", "mode": mode}
 
-@app.get("/health")
-def health_check():
-    return {"status": "healthy"}
+    app.include_router(router)
+    return app
 
 
-app.include_router(router)
\ No newline at end of file
+app = create_app()
@@ -0,0 +1,59 @@
+"""Cableado compartido de BankingFacade.
+
+Las estrategias de comisión y el plan de riesgo no tienen estado y se toman ya
+construidos de ConfigurationService (una instancia por versión de la
+configuración). Por request solo se crean los repositorios ligados a la sesión
+y los servicios que los envuelven, que son objetos de unos pocos atributos.
+"""
+from app.application.facade import BankingFacade
+from typing import Optional
+
+from app.repositories.base import (
+    AccountRepository,
+    CustomerRepository,
+    LedgerRepository,
+    StatementRepository,
+    TransactionRepository,
+    UnitOfWork,
+)
+from app.services.account_service import AccountService
+from app.services.configuration_service import ConfigurationService
+from app.services.customer_service import CustomerService
+from app.services.deposit_service import DepositService
+from app.services.statement_service import StatementService
+from app.services.transfer_service import TransferService
+from app.services.withdraw_service import WithdrawService
+
+
+def wire_facade(
+    customer_repo: CustomerRepository,
+    account_repo: AccountRepository,
+    transaction_repo: TransactionRepository,
+    uow: UnitOfWork,
+    config_service: ConfigurationService,
+    ledger_repo: Optional[LedgerRepository] = None,
+    account_reader: Optional[AccountRepository] = None,
+    statement_repo: Optional[StatementRepository] = None,
+) -> BankingFacade:
+    """account_reader: repositorio para las lecturas de cuentas (por defecto account_repo);
+    los servicios que mueven dinero siempre usan account_repo."""
+    fee_strategy = config_service.get_current_fee_strategy()
+    risk_plan = config_service.get_current_risk_plan()
+    account_reader = account_reader or account_repo
+    return BankingFacade(
+        customer_repo=customer_repo,
+        account_repo=account_repo,
+        transaction_repo=transaction_repo,
+        transfer_service=TransferService(account_repo, transaction_repo, fee_strategy, risk_plan, ledger_repo),
+        deposit_service=DepositService(account_repo, transaction_repo, fee_strategy, risk_plan, ledger_repo),
+        withdraw_service=WithdrawService(account_repo, transaction_repo, fee_strategy, risk_plan, ledger_repo),
+        config_service=config_service,
+        customer_service=CustomerService(customer_repo),
+        account_service=AccountService(customer_repo, account_reader, transaction_repo),
+        uow=uow,
+        ledger_repo=ledger_repo,
+        statement_service=(
+            # El saldo inicial puede anclarse en el saldo de la cuenta: se lee el confirmado, no el de la caché
+            StatementService(statement_repo, transaction_repo, account_repo) if statement_repo is not None else None
+        ),
+    )
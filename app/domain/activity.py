@@ -0,0 +1,148 @@
+"""Actividad reciente de una cuenta, tal como la consumen las reglas de riesgo.
+
+Las reglas solo necesitan "cuántas transacciones y por cuánto monto desde un
+instante". Esa pregunta se responde desde una lista de transacciones (tests,
+cálculos offline) o desde contadores agregados por minuto y por día que los
+repositorios mantienen al aprobar cada transacción (camino de producción).
+"""
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from datetime import datetime
+from decimal import Decimal
+from typing import Collection, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from app.domain.entities import Transaction
+
+MINUTE = "minute"
+DAY = "day"
+
+# Horizonte mínimo de los buckets por minuto que se leen para evaluar riesgo
+# (RiskPlan.minute_horizon lo amplía si alguna regla tiene una ventana más larga)
+MINUTE_HORIZON = 60
+
+
+def minute_bucket(at: datetime) -> datetime:
+    return at.replace(second=0, microsecond=0)
+
+
+def day_bucket(at: datetime) -> datetime:
+    return at.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+class AccountActivity(ABC):
+    """Conteos y sumas de transacciones de una cuenta desde un instante dado."""
+
+    @abstractmethod
+    def count_since(self, since: datetime) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def sum_since(self, since: datetime) -> Decimal:
+        raise NotImplementedError
+
+    def totals_since(
+        self, sinces: Sequence[datetime], sums_for: Optional[Collection[datetime]] = None
+    ) -> List[Tuple[int, Optional[Decimal]]]:
+        """(conteo, suma) de varias ventanas a la vez, para evaluar reglas en una pasada.
+
+        `sums_for` limita a qué ventanas se les calcula la suma (None: a todas); las
+        demás retornan None como suma.
+        """
+        return [
+            (self.count_since(since), self.sum_since(since) if sums_for is None or since in sums_for else None)
+            for since in sinces
+        ]
+
+
+class TransactionListActivity(AccountActivity):
+    """Actividad calculada recorriendo una lista de transacciones."""
+
+    def __init__(self, transactions: Iterable[Transaction]) -> None:
+        self._transactions = list(transactions)
+
+    def count_since(self, since: datetime) -> int:
+        return sum(1 for t in self._transactions if t.created_at >= since)
+
+    def sum_since(self, since: datetime) -> Decimal:
+        return sum((t.amount for t in self._transactions if t.created_at >= since), Decimal("0"))
+
+    def totals_since(
+        self, sinces: Sequence[datetime], sums_for: Optional[Collection[datetime]] = None
+    ) -> List[Tuple[int, Optional[Decimal]]]:
+        # Una pasada sobre el historial para la ventana más amplia; cada ventana
+        # más angosta se filtra sobre las transacciones de la anterior
+        window = self._transactions
+        by_since = {}
+        for since in sorted(set(sinces)):
+            window = [t for t in window if t.created_at >= since]
+            total = None
+            if sums_for is None or since in sums_for:
+                total = sum((t.amount for t in window), Decimal("0"))
+            by_since[since] = (len(window), total)
+        return [by_since[since] for since in sinces]
+
+
+class BucketedActivity(AccountActivity):
+    """Actividad leída de contadores agregados (transacciones APPROVED).
+
+    - Ventanas que empiezan a medianoche se responden con el bucket diario (exacto).
+    - El resto se responde sumando los buckets por minuto desde el minuto de `since`
+      (redondeo hacia atrás: como mucho incluye un minuto extra, nunca menos).
+    - `minutes_from`: primer bucket por minuto cargado. Una ventana que empieza antes
+      no se puede responder sin contar de menos y lanza ValueError.
+    """
+
+    def __init__(
+        self,
+        minute_buckets: Dict[datetime, Tuple[int, Decimal]],
+        day_start: datetime,
+        day_totals: Tuple[int, Decimal] = (0, Decimal("0")),
+        minutes_from: Optional[datetime] = None,
+    ) -> None:
+        self._minute_buckets = minute_buckets
+        self._day_start = day_start
+        self._day_totals = day_totals
+        self._minutes_from = minutes_from
+
+    def _minute_start(self, since: datetime) -> datetime:
+        start = minute_bucket(since)
+        if self._minutes_from is not None and start < self._minutes_from:
+            raise ValueError(
+                f"La ventana desde {since} empieza antes de los buckets por minuto cargados ({self._minutes_from})"
+            )
+        return start
+
+    def _totals_since(self, since: datetime) -> Tuple[int, Decimal]:
+        if since == self._day_start:
+            return self._day_totals
+        start = self._minute_start(since)
+        count, total = 0, Decimal("0")
+        for bucket, (bucket_count, bucket_sum) in self._minute_buckets.items():
+            if bucket >= start:
+                count += bucket_count
+                total += bucket_sum
+        return count, total
+
+    def totals_since(
+        self, sinces: Sequence[datetime], sums_for: Optional[Collection[datetime]] = None
+    ) -> List[Tuple[int, Optional[Decimal]]]:
+        return [
+            self._totals_since(since) if sums_for is None or since in sums_for else (self.count_since(since), None)
+            for since in sinces
+        ]
+
+    def count_since(self, since: datetime) -> int:
+        if since == self._day_start:
+            return self._day_totals[0]
+        start = self._minute_start(since)
+        return sum(count for bucket, (count, _) in self._minute_buckets.items() if bucket >= start)
+
+    def sum_since(self, since: datetime) -> Decimal:
+        return self._totals_since(since)[1]
+
+
+def as_activity(recent: Union[AccountActivity, Iterable[Transaction]]) -> AccountActivity:
+    """Acepta tanto contadores como la lista de transacciones recientes de antes."""
+    if isinstance(recent, AccountActivity):
+        return recent
+    return TransactionListActivity(recent)
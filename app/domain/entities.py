@@ -8,7 +8,9 @@ from typing import Optional, Dict, Any
 from app.domain.enums import AccountStatus, TransactionStatus, TransactionType
 from app.domain.exceptions import InvalidStatusTransition, ValidationError, AccountNotOperableError
 
-@dataclass
+# slots=True: las entidades no llevan __dict__ por instancia; los listados de historial
+# y las lecturas masivas crean muchas y el ahorro de memoria es directo.
+@dataclass(slots=True)
 class Customer:
     name: str
     email: str
@@ -26,7 +28,7 @@ class Customer:
         if "@" not in self.email:
             raise ValidationError("El formato del email es inválido")
 
-@dataclass
+@dataclass(slots=True)
 class Account:
     customer_id: str
     currency: str
@@ -88,7 +90,7 @@ class Account:
         
         self._status = new_status
 
-@dataclass
+@dataclass(slots=True)
 class Transaction:
     account_id: str
     amount: Decimal
@@ -8,6 +8,10 @@ class ValidationError(BankingError):
     """Error cuando los datos de entrada no cumplen las reglas básicas"""
     pass
 
+class MissingFeeError(ValidationError):
+    """Error cuando un depósito o retiro anterior a los estados de cuenta no registra su comisión (applied_fee)"""
+    pass
+
 class DuplicateEmailError(BankingError):
     """Lanzada cuando ya existe un cliente con el mismo email"""
     pass
@@ -33,6 +37,10 @@ class TransactionRejectedError(BankingError):
     """Error cuando una transacción falla las reglas de riesgo o fraude"""
     pass
 
+class IdempotencyConflictError(BankingError):
+    """Error cuando una Idempotency-Key se reusa con otro request o sigue en curso (mapeable a HTTP 409)"""
+    pass
+
 class InfrastructureError(BankingError):
     """Error para problemas técnicos de base de datos o conexión"""
     pass
\ No newline at end of file
@@ -0,0 +1,58 @@
+"""Libro mayor de partida doble: una fila por pierna (débito o crédito) de cada movimiento.
+
+Los montos van con signo desde el punto de vista de la cuenta (positivo = aumenta
+su saldo) y las piernas de una transacción siempre suman cero. El dinero que
+entra o sale del banco y las comisiones cobradas se asientan contra cuentas de
+sistema, que no existen en la tabla accounts:
+
+    depósito A, comisión F:      caja -A, cuenta +A    | cuenta -F, comisiones +F
+    retiro A, comisión F:        cuenta -A, caja +A    | cuenta -F, comisiones +F
+    transferencia A, comisión F: origen -A, destino +A | origen -F, comisiones +F
+"""
+from __future__ import annotations
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from typing import List
+
+from app.domain.entities import Transaction
+from app.domain.enums import TransactionType
+
+# Contrapartida de depósitos y retiros (dinero que entra o sale del banco)
+SYSTEM_CASH_ACCOUNT = "system:cash"
+# Comisiones cobradas: su saldo es el total cobrado
+SYSTEM_FEES_ACCOUNT = "system:fees"
+
+PRINCIPAL = "PRINCIPAL"
+FEE = "FEE"
+
+
+@dataclass(slots=True)
+class LedgerEntry:
+    transaction_id: str
+    account_id: str
+    amount: Decimal  # con signo: positivo acredita, negativo debita
+    kind: str = PRINCIPAL
+    created_at: datetime = field(default_factory=datetime.utcnow)
+
+
+def entries_for(transaction: Transaction, fee: Decimal, posted_at: datetime | None = None) -> List[LedgerEntry]:
+    """Piernas de una transacción aprobada (las de comisión solo si fee > 0)."""
+    posted_at = posted_at or datetime.utcnow()
+    amount = transaction.amount
+    if transaction.type == TransactionType.DEPOSIT:
+        source, target = SYSTEM_CASH_ACCOUNT, transaction.account_id
+    elif transaction.type == TransactionType.WITHDRAWAL:
+        source, target = transaction.account_id, SYSTEM_CASH_ACCOUNT
+    else:
+        source, target = transaction.account_id, transaction.target_account_id
+
+    entries = [
+        LedgerEntry(transaction.id, source, -amount, PRINCIPAL, posted_at),
+        LedgerEntry(transaction.id, target, amount, PRINCIPAL, posted_at),
+    ]
+    if fee > 0:
+        # La comisión la paga siempre la cuenta del cliente que origina la operación
+        entries.append(LedgerEntry(transaction.id, transaction.account_id, -fee, FEE, posted_at))
+        entries.append(LedgerEntry(transaction.id, SYSTEM_FEES_ACCOUNT, fee, FEE, posted_at))
+    return entries
@@ -0,0 +1,103 @@
+"""Estado de cuenta mensual: saldo inicial y final, conteos y montos por tipo y comisiones.
+
+Solo cuentan las transacciones APPROVED. Efecto de cada una en el saldo de la cuenta:
+
+    depósito A, comisión F:              +A - F
+    retiro A, comisión F:                -A - F
+    transferencia enviada A, comisión F: -A - F
+    transferencia recibida A:            +A
+
+La comisión sale del metadata `applied_fee` de la transacción. Los depósitos y
+retiros anteriores a los estados de cuenta no lo registraban: hasta correr
+`backfill-fees` (app/services/fee_backfill.py) los meses que los incluyen se
+rechazan (MissingFeeError) en vez de calcularse con comisión 0.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+
+from app.domain.entities import Transaction
+from app.domain.enums import TransactionType
+from app.domain.exceptions import MissingFeeError
+
+ZERO = Decimal("0")
+
+
+def month_start(period: date) -> datetime:
+    return datetime(period.year, period.month, 1)
+
+
+def next_month(period: date) -> date:
+    return date(period.year + period.month // 12, period.month % 12 + 1, 1)
+
+
+def previous_month(period: date) -> date:
+    return date(period.year - 1, 12, 1) if period.month == 1 else date(period.year, period.month - 1, 1)
+
+
+def period_of(moment: datetime) -> date:
+    return date(moment.year, moment.month, 1)
+
+
+def applied_fee(transaction: Transaction) -> Decimal:
+    fee = (transaction.metadata or {}).get("applied_fee")
+    if fee is None:
+        raise MissingFeeError(
+            f"La transacción {transaction.id} ({transaction.created_at:%Y-%m-%d}) no registra su comisión: "
+            "ejecutar backfill-fees antes de pedir este estado de cuenta"
+        )
+    return Decimal(fee)
+
+
+@dataclass(slots=True)
+class MonthlyStatement:
+    account_id: str
+    period: date  # primer día del mes
+    opening_balance: Decimal
+    # Movimientos con created_at < computed_through ya están sumados
+    computed_through: datetime
+    closed: bool = False
+    deposits_count: int = 0
+    deposits_total: Decimal = ZERO
+    withdrawals_count: int = 0
+    withdrawals_total: Decimal = ZERO
+    transfers_out_count: int = 0
+    transfers_out_total: Decimal = ZERO
+    transfers_in_count: int = 0
+    transfers_in_total: Decimal = ZERO
+    fees_total: Decimal = ZERO
+
+    @property
+    def period_end(self) -> datetime:
+        return month_start(next_month(self.period))
+
+    @property
+    def closing_balance(self) -> Decimal:
+        return (
+            self.opening_balance
+            + self.deposits_total
+            + self.transfers_in_total
+            - self.withdrawals_total
+            - self.transfers_out_total
+            - self.fees_total
+        )
+
+    def add(self, transaction: Transaction) -> None:
+        """Suma una transacción APPROVED de la cuenta (como origen o como destino)."""
+        amount = transaction.amount
+        if transaction.type == TransactionType.TRANSFER and transaction.account_id != self.account_id:
+            self.transfers_in_count += 1
+            self.transfers_in_total += amount
+            return
+        fee = applied_fee(transaction)
+        if transaction.type == TransactionType.DEPOSIT:
+            self.deposits_count += 1
+            self.deposits_total += amount
+        elif transaction.type == TransactionType.WITHDRAWAL:
+            self.withdrawals_count += 1
+            self.withdrawals_total += amount
+        else:
+            self.transfers_out_count += 1
+            self.transfers_out_total += amount
+        self.fees_total += fee
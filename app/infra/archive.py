@@ -0,0 +1,306 @@
+"""Archivo en frío de transacciones: segmentos comprimidos y columnares en disco local.
+
+El job de archivo (app/services/archive_service.py) pasa las transacciones
+anteriores a un corte a un segmento nuevo y las borra de la tabla. Las lecturas
+de historial, exportación y estados de cuenta toman de aquí todo lo anterior al
+`watermark` y de la tabla el resto (ver SQLTransactionRepository).
+
+Directorio:
+
+    manifest.json          {"watermark": ..., "segments": [...]}, se reemplaza de forma atómica
+    segment-000001.seg     append-only: un segmento no se modifica una vez escrito
+
+Cada segmento cubre [watermark anterior, su watermark) con las filas ordenadas por
+(account_id, created_at, id) en bloques de hasta BLOCK_ROWS filas de una sola
+cuenta. Un bloque es un objeto JSON de columnas (ids, montos como texto, instantes
+como deltas en microsegundos, ...) comprimido con zlib: los valores parecidos
+quedan juntos y comprimen mucho mejor que fila por fila. Al final va el índice,
+también comprimido:
+
+    blocks    [account_id, offset, largo, filas, primer instante, último instante]
+    accounts  account_id -> bloques de la cuenta, en orden cronológico
+    incoming  account_id -> [bloque, primer instante] con transferencias recibidas
+
+y un trailer fijo con offset y largo del índice. El índice se lee una vez por
+proceso; el historial de una cuenta solo descomprime sus bloques.
+
+    ARCHIVE_DIR    directorio del archivo (sin definir = sin archivo en frío)
+"""
+import json
+import os
+import struct
+import threading
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+from itertools import accumulate
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from app.domain.entities import Transaction
+from app.domain.enums import TransactionStatus, TransactionType
+from app.repositories.row_mapper import transaction_from_row
+
+MANIFEST = "manifest.json"
+MAGIC = b"TXSEG1"
+BLOCK_ROWS = 256
+ZLIB_LEVEL = 6
+
+# Offset y largo del índice + MAGIC, al final del archivo
+_TRAILER = struct.Struct("<QI6s")
+_EPOCH = datetime(1970, 1, 1)
+_TYPES = {t.value: t for t in TransactionType}
+_STATUSES = {s.value: s for s in TransactionStatus}
+_dumps = json.JSONEncoder(separators=(",", ":")).encode
+
+# Posiciones en una entrada de `blocks`
+_ROWS, _FIRST, _LAST = 3, 4, 5
+
+
+def _to_micros(at: datetime) -> int:
+    delta = at - _EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _from_micros(micros: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=micros)
+
+
+def _encode_block(rows: Sequence[Transaction]) -> bytes:
+    micros = [_to_micros(t.created_at) for t in rows]
+    columns = {
+        "id": [t.id for t in rows],
+        "target_account_id": [t.target_account_id for t in rows],
+        "type": [t.type.value for t in rows],
+        "amount": [str(t.amount) for t in rows],
+        "currency": [t.currency for t in rows],
+        "status": [t.status.value for t in rows],
+        "created_at": [b - a for a, b in zip([0] + micros, micros)],
+        "metadata": [t.metadata for t in rows],
+    }
+    return zlib.compress(_dumps(columns).encode("utf-8"), ZLIB_LEVEL)
+
+
+def _decode_block(account_id: str, data: bytes) -> List[Transaction]:
+    c = json.loads(zlib.decompress(data))
+    rows = zip(
+        c["id"],
+        [account_id] * len(c["id"]),
+        c["target_account_id"],
+        map(_TYPES.__getitem__, c["type"]),
+        map(Decimal, c["amount"]),
+        c["currency"],
+        map(_STATUSES.__getitem__, c["status"]),
+        map(_from_micros, accumulate(c["created_at"])),
+        c["metadata"],
+    )
+    return [transaction_from_row(row) for row in rows]
+
+
+@dataclass
+class SegmentInfo:
+    name: str
+    rows: int
+    size_bytes: int
+
+
+def write_segment(path: Path, transactions: Iterable[Transaction]) -> int:
+    """Escribe un segmento con `transactions`, que deben venir ordenadas por
+    (account_id, created_at, id). Solo retiene un bloque a la vez; retorna las filas."""
+    blocks: List[List[Any]] = []
+    accounts: Dict[str, List[int]] = {}
+    incoming: Dict[str, List[List[int]]] = {}
+    tmp = path.with_suffix(".tmp")
+    with tmp.open("wb") as f:
+        def flush(rows: List[Transaction]) -> None:
+            data = _encode_block(rows)
+            block = len(blocks)
+            account_id = rows[0].account_id
+            blocks.append([account_id, f.tell(), len(data), len(rows),
+                           _to_micros(rows[0].created_at), _to_micros(rows[-1].created_at)])
+            accounts.setdefault(account_id, []).append(block)
+            received: Dict[str, int] = {}
+            for t in rows:
+                if t.target_account_id is not None and t.target_account_id not in received:
+                    received[t.target_account_id] = _to_micros(t.created_at)
+            for target, first in received.items():
+                incoming.setdefault(target, []).append([block, first])
+            f.write(data)
+
+        rows: List[Transaction] = []
+        for transaction in transactions:
+            if rows and (transaction.account_id != rows[0].account_id or len(rows) == BLOCK_ROWS):
+                flush(rows)
+                rows = []
+            rows.append(transaction)
+        if rows:
+            flush(rows)
+        index = zlib.compress(_dumps({"blocks": blocks, "accounts": accounts, "incoming": incoming}).encode("utf-8"))
+        offset = f.tell()
+        f.write(index)
+        f.write(_TRAILER.pack(offset, len(index), MAGIC))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return sum(block[_ROWS] for block in blocks)
+
+
+class Segment:
+    """Segmento ya escrito: el índice se carga al abrirlo y los bloques se leen bajo demanda."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with path.open("rb") as f:
+            f.seek(-_TRAILER.size, os.SEEK_END)
+            offset, length, magic = _TRAILER.unpack(f.read(_TRAILER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path} no es un segmento de transacciones")
+            f.seek(offset)
+            index = json.loads(zlib.decompress(f.read(length)))
+        self.blocks: List[List[Any]] = index["blocks"]
+        self.accounts: Dict[str, List[int]] = index["accounts"]
+        self.incoming: Dict[str, List[List[int]]] = index["incoming"]
+
+    def read_block(self, block: int) -> List[Transaction]:
+        account_id, offset, length = self.blocks[block][:3]
+        with self.path.open("rb") as f:
+            f.seek(offset)
+            data = f.read(length)
+        return _decode_block(account_id, data)
+
+
+class TransactionArchive:
+    """Segmentos listados en el manifest. Las lecturas son seguras entre hilos y
+    procesos (cada una hace un `stat` del manifest y lo recarga si cambió); solo
+    el job de archivo escribe, de a una corrida por vez."""
+
+    def __init__(self, directory: str | os.PathLike) -> None:
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+        self._version: Optional[Tuple[int, int, int]] = None
+        self._watermark: Optional[datetime] = None
+        self._segments: List[Segment] = []
+        # Los segmentos no cambian: su índice se abre una sola vez
+        self._opened: Dict[str, Segment] = {}
+
+    def _state(self) -> Tuple[Optional[datetime], List[Segment]]:
+        path = self.directory / MANIFEST
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None, []
+        version = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if version != self._version:
+                manifest = json.loads(path.read_text(encoding="utf-8"))
+                self._segments = [self._open(name) for name in manifest["segments"]]
+                self._watermark = datetime.fromisoformat(manifest["watermark"])
+                self._version = version
+            return self._watermark, self._segments
+
+    def _open(self, name: str) -> Segment:
+        segment = self._opened.get(name)
+        if segment is None:
+            segment = self._opened[name] = Segment(self.directory / name)
+        return segment
+
+    @property
+    def watermark(self) -> Optional[datetime]:
+        """Todo lo anterior a este instante está en el archivo (None = archivo vacío)."""
+        return self._state()[0]
+
+    def account_ids(self) -> List[str]:
+        """Cuentas con transacciones archivadas como origen, ordenadas."""
+        return sorted({account_id for segment in self._state()[1] for account_id in segment.accounts})
+
+    def iter_account(self, account_id: str) -> Iterator[Transaction]:
+        """Transacciones archivadas de la cuenta (como origen), más antiguas primero."""
+        for segment in self._state()[1]:
+            for block in segment.accounts.get(account_id, ()):
+                yield from segment.read_block(block)
+
+    def page(self, account_id: str, limit: int, offset: int = 0,
+             after: Optional[Tuple[datetime, str]] = None) -> List[Transaction]:
+        """Como list_page: más recientes primero, salteando `offset` filas posteriores a `after`.
+
+        Los bloques que el offset saltea por completo no se descomprimen.
+        """
+        page: List[Transaction] = []
+        after_micros = _to_micros(after[0]) if after is not None else None
+        for segment in reversed(self._state()[1]):
+            for block in reversed(segment.accounts.get(account_id, ())):
+                meta = segment.blocks[block]
+                if after_micros is not None and meta[_FIRST] > after_micros:
+                    continue
+                if offset >= meta[_ROWS] and (after_micros is None or meta[_LAST] < after_micros):
+                    offset -= meta[_ROWS]
+                    continue
+                for transaction in reversed(segment.read_block(block)):
+                    if after is not None and (transaction.created_at, transaction.id) >= after:
+                        continue
+                    if offset:
+                        offset -= 1
+                        continue
+                    page.append(transaction)
+                    if len(page) == limit:
+                        return page
+        return page
+
+    def iter_movements(self, account_id: str, start: datetime, end: datetime) -> Iterator[Transaction]:
+        """APPROVED archivadas con created_at en [start, end) donde la cuenta es origen o destino."""
+        start_micros, end_micros = _to_micros(start), _to_micros(end)
+        for segment in self._state()[1]:
+            received = (block for block, _ in segment.incoming.get(account_id, ()))
+            for block in dict.fromkeys([*segment.accounts.get(account_id, ()), *received]):
+                meta = segment.blocks[block]
+                if meta[_LAST] < start_micros or meta[_FIRST] >= end_micros:
+                    continue
+                for transaction in segment.read_block(block):
+                    if (transaction.status == TransactionStatus.APPROVED
+                            and start <= transaction.created_at < end
+                            and account_id in (transaction.account_id, transaction.target_account_id)):
+                        yield transaction
+
+    def first_activity(self, account_id: str) -> Optional[datetime]:
+        # Los segmentos cubren rangos de tiempo crecientes: alcanza con el primero que tenga la cuenta
+        for segment in self._state()[1]:
+            firsts = [first for _, first in segment.incoming.get(account_id, ())]
+            blocks = segment.accounts.get(account_id)
+            if blocks:
+                firsts.append(segment.blocks[blocks[0]][_FIRST])
+            if firsts:
+                return _from_micros(min(firsts))
+        return None
+
+    def append(self, transactions: Iterable[Transaction], watermark: datetime) -> Optional[SegmentInfo]:
+        """Escribe un segmento con `transactions` (ordenadas por cuenta, created_at, id)
+        y publica el manifest con el segmento y el nuevo watermark."""
+        current, segments = self._state()
+        if current is not None and watermark < current:
+            raise ValueError(f"El watermark no puede retroceder ({watermark} < {current})")
+        self.directory.mkdir(parents=True, exist_ok=True)
+        names = [segment.path.name for segment in segments]
+        path = self.directory / f"segment-{len(names) + 1:06d}.seg"
+        rows = write_segment(path, transactions)
+        info = None
+        if rows:
+            names.append(path.name)
+            info = SegmentInfo(path.name, rows, path.stat().st_size)
+        else:
+            path.unlink()
+        self._write_manifest(watermark, names)
+        return info
+
+    def _write_manifest(self, watermark: datetime, segments: List[str]) -> None:
+        tmp = self.directory / f"{MANIFEST}.tmp"
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump({"watermark": watermark.isoformat(), "segments": segments}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.directory / MANIFEST)
+
+
+def archive_from_env(env: Mapping[str, str] = os.environ) -> Optional[TransactionArchive]:
+    directory = env.get("ARCHIVE_DIR")
+    return TransactionArchive(directory) if directory else None
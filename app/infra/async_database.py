@@ -0,0 +1,50 @@
+"""Conexión asíncrona a base de datos para el modo API_MODE=async.
+
+Usa la misma base que app/infra/database.py: la URL se deriva de DATABASE_URL
+cambiando el driver (aiosqlite para SQLite, asyncpg para PostgreSQL), o se fija
+con ASYNC_DATABASE_URL.
+"""
+import os
+from typing import AsyncGenerator
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.infra.database import DATABASE_URL, DB_PROFILE
+from app.infra.db_config import apply_sqlite_pragmas, engine_kwargs
+from app.repositories.models import Base
+
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+
+def to_async_url(url: str) -> str:
+    """sqlite:///./fintech.db -> sqlite+aiosqlite:///./fintech.db (igual para PostgreSQL)."""
+    scheme, sep, rest = url.partition("://")
+    return f"{_ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", to_async_url(DATABASE_URL))
+
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    echo=os.getenv("SQL_ECHO", "0") == "1",
+    **engine_kwargs(ASYNC_DATABASE_URL, DB_PROFILE, is_async=True),
+)
+apply_sqlite_pragmas(async_engine.sync_engine, DB_PROFILE.sqlite_pragmas)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency de FastAPI: yield una sesión asíncrona por request."""
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+async def init_async_db() -> None:
+    """Crea las tablas si no existen (sobre la conexión asíncrona)."""
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
@@ -6,20 +6,22 @@ from typing import Generator
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
 
+from app.infra.db_config import apply_sqlite_pragmas, engine_kwargs, load_profile
 from app.repositories.models import Base
 
 DATABASE_URL = os.getenv(
     "DATABASE_URL",
     "sqlite:///./fintech.db"
 )
-# Ajuste para SQLite (check_same_thread=False para uso con FastAPI)
-connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
+# Perfil de pool/dialecto (DB_PROFILE y overrides DB_*, ver app/infra/db_config.py)
+DB_PROFILE = load_profile()
 
 engine = create_engine(
     DATABASE_URL,
-    connect_args=connect_args,
     echo=os.getenv("SQL_ECHO", "0") == "1",
+    **engine_kwargs(DATABASE_URL, DB_PROFILE),
 )
+apply_sqlite_pragmas(engine, DB_PROFILE.sqlite_pragmas)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
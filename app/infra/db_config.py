@@ -0,0 +1,149 @@
+"""Perfiles de conexión: tamaño de pool, pre-ping y PRAGMAs de SQLite.
+
+El perfil se elige con DB_PROFILE y cada valor se puede sobrescribir por
+variable de entorno:
+
+    DB_PROFILE           default | postgres-prod | sqlite-fast
+    DB_POOL_SIZE         conexiones que el pool mantiene abiertas
+    DB_MAX_OVERFLOW      conexiones extra permitidas sobre pool_size
+    DB_POOL_TIMEOUT      segundos de espera por una conexión libre
+    DB_POOL_RECYCLE      segundos de vida máxima de una conexión (-1 = sin límite)
+    DB_POOL_PRE_PING     1/0: verificar la conexión antes de entregarla
+    DB_SQLITE_PRAGMAS    "journal_mode=WAL;synchronous=NORMAL;..."
+
+Tamaño de pool: en modo sync cada request ocupa un hilo del threadpool (40 por
+defecto), así que pool_size + max_overflow por debajo de eso hace que los
+requests esperen conexión; /infra/pool muestra esas esperas.
+"""
+import os
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, Mapping, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+
+from app.infra.pool_stats import InstrumentedAsyncQueuePool, InstrumentedQueuePool
+
+DEFAULT_PROFILE = "default"
+
+
+@dataclass(frozen=True)
+class EngineProfile:
+    name: str
+    # None = valor por defecto de SQLAlchemy
+    pool_size: Optional[int] = None
+    max_overflow: Optional[int] = None
+    pool_timeout: Optional[float] = None
+    pool_recycle: Optional[int] = None
+    pool_pre_ping: bool = False
+    sqlite_pragmas: Dict[str, str] = field(default_factory=dict)
+    connect_args: Dict[str, Any] = field(default_factory=dict)
+
+
+PROFILES: Dict[str, EngineProfile] = {
+    # Comportamiento previo: defaults de SQLAlchemy, con el pool instrumentado
+    "default": EngineProfile(name="default"),
+    "postgres-prod": EngineProfile(
+        name="postgres-prod",
+        pool_size=20,
+        max_overflow=20,
+        pool_timeout=10,
+        pool_recycle=1800,
+        pool_pre_ping=True,
+        connect_args={"connect_timeout": 5, "application_name": "fintech-api"},
+    ),
+    "sqlite-fast": EngineProfile(
+        name="sqlite-fast",
+        pool_size=20,
+        max_overflow=20,
+        pool_timeout=10,
+        sqlite_pragmas={
+            # WAL: lectores y el escritor no se bloquean entre sí
+            "journal_mode": "WAL",
+            # NORMAL en WAL: fsync en checkpoints, no en cada commit (durable ante crash
+            # del proceso; ante corte de energía se pueden perder los últimos commits)
+            "synchronous": "NORMAL",
+            "mmap_size": "268435456",
+            "cache_size": "-65536",
+            "temp_store": "MEMORY",
+            "busy_timeout": "5000",
+        },
+    ),
+}
+
+
+def parse_pragmas(raw: str) -> Dict[str, str]:
+    pragmas = {}
+    for item in raw.split(";"):
+        if item.strip():
+            name, _, value = item.partition("=")
+            name, value = name.strip(), value.strip()
+            if not name.isidentifier() or not value.replace("-", "").isalnum():
+                raise ValueError(f"PRAGMA inválido en DB_SQLITE_PRAGMAS: {item!r}")
+            pragmas[name] = value
+    return pragmas
+
+
+def load_profile(name: Optional[str] = None, env: Mapping[str, str] = os.environ) -> EngineProfile:
+    name = name or env.get("DB_PROFILE", DEFAULT_PROFILE)
+    if name not in PROFILES:
+        raise ValueError(f"DB_PROFILE inválido: {name} (usar {', '.join(PROFILES)})")
+    profile = PROFILES[name]
+    overrides: Dict[str, Any] = {}
+    for var, attr, cast in (
+        ("DB_POOL_SIZE", "pool_size", int),
+        ("DB_MAX_OVERFLOW", "max_overflow", int),
+        ("DB_POOL_TIMEOUT", "pool_timeout", float),
+        ("DB_POOL_RECYCLE", "pool_recycle", int),
+    ):
+        if env.get(var):
+            overrides[attr] = cast(env[var])
+    if env.get("DB_POOL_PRE_PING"):
+        overrides["pool_pre_ping"] = env["DB_POOL_PRE_PING"] == "1"
+    if env.get("DB_SQLITE_PRAGMAS"):
+        overrides["sqlite_pragmas"] = {**profile.sqlite_pragmas, **parse_pragmas(env["DB_SQLITE_PRAGMAS"])}
+    return replace(profile, **overrides)
+
+
+def _is_sqlite_memory(url) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def engine_kwargs(database_url: str, profile: EngineProfile, is_async: bool = False) -> Dict[str, Any]:
+    """Argumentos para create_engine/create_async_engine según URL y perfil."""
+    url = make_url(database_url)
+    is_sqlite = url.get_backend_name() == "sqlite"
+    connect_args: Dict[str, Any] = {}
+    if is_sqlite and not is_async:
+        connect_args["check_same_thread"] = False
+    if not is_sqlite:
+        connect_args.update(profile.connect_args)
+
+    kwargs: Dict[str, Any] = {"pool_pre_ping": profile.pool_pre_ping}
+    if connect_args:
+        kwargs["connect_args"] = connect_args
+    if _is_sqlite_memory(url):
+        # SQLite en memoria: un pool por conexión propio del dialecto, sin dimensionar
+        return kwargs
+
+    kwargs["poolclass"] = InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool
+    for attr in ("pool_size", "max_overflow", "pool_timeout", "pool_recycle"):
+        value = getattr(profile, attr)
+        if value is not None:
+            kwargs[attr] = value
+    return kwargs
+
+
+def apply_sqlite_pragmas(engine: Engine, pragmas: Mapping[str, str]) -> None:
+    """Ejecuta los PRAGMA en cada conexión nueva del pool (solo SQLite)."""
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
@@ -0,0 +1,219 @@
+"""Respuestas guardadas por Idempotency-Key para los POST de /transactions/*.
+
+Un cliente que reintenta con la misma key recibe la respuesta original sin que
+el movimiento de dinero se ejecute otra vez:
+
+- LRU en el proceso con TTL: los reintentos al mismo worker no tocan la base.
+- Tabla idempotency_keys (si hay engine): la key se reserva con un INSERT antes
+  de ejecutar (fila con status_code NULL = en curso) y se completa con la
+  respuesta al terminar, así los reintentos que caen en otro worker también la ven.
+- Duplicados concurrentes: en el mismo proceso esperan un Event del primero; entre
+  workers consultan la fila hasta que se complete. Si no se completa dentro de
+  IDEMPOTENCY_WAIT_SECONDS se responde 409.
+
+La key se libera (sin guardar respuesta) cuando el primer intento falla por un
+error de infraestructura, para que el reintento pueda ejecutarse.
+
+La reserva en curso dura IDEMPOTENCY_LEASE_SECONDS; el TTL corre recién desde que
+se guarda la respuesta. Si el proceso muere (o falla el guardado de la respuesta)
+después del commit del movimiento, los reintentos en otros workers responden 409
+hasta que vence la reserva; a partir de ahí la key se considera libre y el
+reintento ejecuta el movimiento de nuevo. La reserva tiene que durar más que el
+movimiento más lento: si vence mientras el primer intento sigue corriendo, el
+reintento también se ejecuta.
+
+    IDEMPOTENCY_TTL_SECONDS     vida de una key con respuesta (por defecto 24 h)
+    IDEMPOTENCY_LEASE_SECONDS   vida de una reserva en curso (por defecto 60 s)
+    IDEMPOTENCY_CACHE_SIZE      keys que guarda el LRU en memoria
+    IDEMPOTENCY_WAIT_SECONDS    espera máxima por un duplicado en curso
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Mapping, Optional, Tuple
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+
+from app.domain.exceptions import IdempotencyConflictError, ValidationError
+from app.repositories.models import IdempotencyKeyModel
+
+DEFAULT_TTL_SECONDS = 24 * 3600
+DEFAULT_LEASE_SECONDS = 60.0
+DEFAULT_CACHE_SIZE = 10_000
+DEFAULT_WAIT_SECONDS = 10.0
+MAX_KEY_LENGTH = 255
+
+# Cada cuánto se consulta la fila de un duplicado que corre en otro worker
+_POLL_SECONDS = 0.05
+# Como mucho un DELETE de keys vencidas por intervalo y proceso
+_PURGE_INTERVAL_SECONDS = 60.0
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    fingerprint: str
+    status_code: int
+    body: str  # JSON tal como se respondió
+
+
+class IdempotencyStore:
+    def __init__(
+        self,
+        engine: Optional[Engine] = None,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        wait_seconds: float = DEFAULT_WAIT_SECONDS,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+    ) -> None:
+        self.engine = engine
+        self.ttl_seconds = ttl_seconds
+        self.lease_seconds = lease_seconds
+        self.cache_size = cache_size
+        self.wait_seconds = wait_seconds
+        self._lock = threading.Lock()
+        # key -> (vence en time.monotonic(), respuesta)
+        self._cache: "OrderedDict[str, Tuple[float, StoredResponse]]" = OrderedDict()
+        self._in_flight: Dict[str, threading.Event] = {}
+        self._purged_at = 0.0
+
+    def begin(self, key: str, fingerprint: str) -> Optional[StoredResponse]:
+        """Respuesta guardada para `key`, o None si este request queda a cargo de ejecutarla.
+
+        Con None el llamador debe terminar con complete() o release().
+        """
+        if not key or len(key) > MAX_KEY_LENGTH:
+            raise ValidationError(f"Idempotency-Key debe tener entre 1 y {MAX_KEY_LENGTH} caracteres")
+        deadline = time.monotonic() + self.wait_seconds
+        while True:
+            with self._lock:
+                stored = self._cached(key)
+                event = None if stored is not None else self._in_flight.get(key)
+                if stored is None and event is None:
+                    self._in_flight[key] = threading.Event()
+            if stored is not None:
+                return self._checked(stored, fingerprint)
+            if event is None:
+                break
+            # Otro hilo de este proceso ejecuta la misma key: esperar su resultado
+            if not event.wait(max(deadline - time.monotonic(), 0)):
+                raise IdempotencyConflictError(f"La operación con Idempotency-Key {key} sigue en curso")
+
+        try:
+            stored = self._claim(key, fingerprint, deadline)
+        except BaseException:
+            self._finish(key, None)
+            raise
+        if stored is not None:
+            self._finish(key, stored)
+            return self._checked(stored, fingerprint)
+        return None
+
+    def complete(self, key: str, fingerprint: str, status_code: int, body: str) -> None:
+        stored = StoredResponse(fingerprint, status_code, body)
+        try:
+            if self.engine is not None:
+                table = IdempotencyKeyModel.__table__
+                with self.engine.begin() as conn:
+                    conn.execute(update(table).where(table.c.key == key).values(
+                        status_code=status_code, response=body,
+                        expires_at=datetime.utcnow() + timedelta(seconds=self.ttl_seconds),
+                    ))
+        finally:
+            self._finish(key, stored)
+
+    def release(self, key: str) -> None:
+        """Descarta la reserva: el próximo request con la key se ejecuta de nuevo."""
+        try:
+            if self.engine is not None:
+                table = IdempotencyKeyModel.__table__
+                with self.engine.begin() as conn:
+                    conn.execute(delete(table).where(table.c.key == key, table.c.status_code.is_(None)))
+        finally:
+            self._finish(key, None)
+
+    def _cached(self, key: str) -> Optional[StoredResponse]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires_at, stored = entry
+        if expires_at <= time.monotonic():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return stored
+
+    def _finish(self, key: str, stored: Optional[StoredResponse]) -> None:
+        with self._lock:
+            if stored is not None:
+                self._cache[key] = (time.monotonic() + self.ttl_seconds, stored)
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+            event = self._in_flight.pop(key, None)
+        if event is not None:
+            event.set()
+
+    @staticmethod
+    def _checked(stored: StoredResponse, fingerprint: str) -> StoredResponse:
+        if stored.fingerprint != fingerprint:
+            raise IdempotencyConflictError("La Idempotency-Key ya se usó con otro request")
+        return stored
+
+    def _claim(self, key: str, fingerprint: str, deadline: float) -> Optional[StoredResponse]:
+        """Reserva la key en la tabla por lease_seconds; si ya tiene respuesta la retorna.
+
+        Una reserva vencida sin respuesta se borra y se vuelve a tomar.
+        """
+        if self.engine is None:
+            return None
+        table = IdempotencyKeyModel.__table__
+        self._purge_expired()
+        while True:
+            now = datetime.utcnow()
+            with self.engine.connect() as conn:
+                row = conn.execute(select(table).where(table.c.key == key)).first()
+                if row is not None and row.expires_at <= now:
+                    conn.execute(delete(table).where(table.c.key == key, table.c.expires_at <= now))
+                    row = None
+                if row is None:
+                    try:
+                        conn.execute(insert(table).values(
+                            key=key, fingerprint=fingerprint, created_at=now,
+                            expires_at=now + timedelta(seconds=self.lease_seconds),
+                        ))
+                        conn.commit()
+                        return None
+                    except IntegrityError:
+                        # Otro worker la reservó primero
+                        conn.rollback()
+                        continue
+                conn.rollback()
+            if row.status_code is not None:
+                return StoredResponse(row.fingerprint, row.status_code, row.response)
+            # En curso en otro worker
+            if time.monotonic() >= deadline:
+                raise IdempotencyConflictError(f"La operación con Idempotency-Key {key} sigue en curso")
+            time.sleep(_POLL_SECONDS)
+
+    def _purge_expired(self) -> None:
+        if time.monotonic() - self._purged_at < _PURGE_INTERVAL_SECONDS:
+            return
+        self._purged_at = time.monotonic()
+        table = IdempotencyKeyModel.__table__
+        with self.engine.begin() as conn:
+            conn.execute(delete(table).where(table.c.expires_at <= datetime.utcnow()))
+
+
+def idempotency_store_from_env(engine: Optional[Engine], env: Mapping[str, str] = os.environ) -> IdempotencyStore:
+    return IdempotencyStore(
+        engine,
+        ttl_seconds=float(env.get("IDEMPOTENCY_TTL_SECONDS", DEFAULT_TTL_SECONDS)),
+        cache_size=int(env.get("IDEMPOTENCY_CACHE_SIZE", DEFAULT_CACHE_SIZE)),
+        wait_seconds=float(env.get("IDEMPOTENCY_WAIT_SECONDS", DEFAULT_WAIT_SECONDS)),
+        lease_seconds=float(env.get("IDEMPOTENCY_LEASE_SECONDS", DEFAULT_LEASE_SECONDS)),
+    )
@@ -0,0 +1,101 @@
+"""Instrumentación del pool de conexiones.
+
+InstrumentedQueuePool (y su variante asíncrona) mide cuánto espera cada checkout
+hasta obtener una conexión utilizable y acumula un histograma de esas esperas,
+además de los timeouts. pool_status() junta esas métricas con el estado actual
+del pool (conexiones en uso, libres y overflow) para exponerlas en /infra/pool.
+"""
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Límites superiores (segundos) de los buckets del histograma de espera
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class PoolStats:
+    """Contadores de checkouts, timeouts y tiempos de espera (thread-safe)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self._buckets = [0] * (len(WAIT_BUCKETS) + 1)
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        index = next((i for i, limit in enumerate(WAIT_BUCKETS) if seconds <= limit), len(WAIT_BUCKETS))
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            self._buckets[index] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            waits = self.checkouts + self.timeouts
+            labels = [f"<={limit}s" for limit in WAIT_BUCKETS] + [f">{WAIT_BUCKETS[-1]}s"]
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": round(self.wait_total / waits * 1000, 3) if waits else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+                "wait_histogram": dict(zip(labels, self._buckets)),
+            }
+
+
+class _InstrumentedPoolMixin:
+    stats: PoolStats
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.stats.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        self.stats.record_wait(time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        # engine.dispose() recrea el pool: las métricas acumuladas se conservan
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_status(engine: Engine) -> Dict[str, Any]:
+    pool = engine.pool
+    status: Dict[str, Any] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            max_overflow=pool._max_overflow,
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+        )
+    stats: Optional[PoolStats] = getattr(pool, "stats", None)
+    if stats is not None:
+        status.update(stats.snapshot())
+    return status
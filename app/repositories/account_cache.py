@@ -0,0 +1,163 @@
+"""Caché de cuentas (LRU con TTL) para las lecturas de GET /accounts/{id} y del historial.
+
+CachedAccountRepository envuelve a SQLAccountRepository:
+
+- get_by_id con read_through=True responde desde el caché del proceso. Solo lo usa
+  el camino de lectura (AccountService). Depósitos, retiros y transferencias usan
+  read_through=False: siempre leen la fila vigente y debitan con el UPDATE
+  condicional, así que un valor en caché nunca autoriza un débito.
+- debit/credit/update anotan la cuenta en la sesión y se invalida al confirmarse
+  el commit (after_commit); un rollback no cambia nada en la base y no invalida.
+- Una lectura que empezó antes de una invalidación no guarda su resultado
+  (contador de invalidaciones), para no reinstalar un saldo viejo.
+
+Cada worker tiene su propio caché: un cambio hecho en otro worker se ve como
+mucho ACCOUNT_CACHE_TTL_SECONDS después.
+
+    ACCOUNT_CACHE_SIZE          cuentas en caché (0 = sin caché)
+    ACCOUNT_CACHE_TTL_SECONDS   vida máxima de una entrada
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from copy import copy
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.domain.entities import Account
+
+DEFAULT_CACHE_SIZE = 10_000
+DEFAULT_TTL_SECONDS = 1.0
+
+# Clave en session.info con las cuentas modificadas en la transacción en curso
+_DIRTY_KEY = "account_cache_dirty"
+
+
+class AccountCache:
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE, ttl_seconds: float = DEFAULT_TTL_SECONDS) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # account_id -> (vence en time.monotonic(), cuenta)
+        self._entries: "OrderedDict[str, Tuple[float, Account]]" = OrderedDict()
+        self._invalidations = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    def get_or_load(self, account_id: str, load: Callable[[str], Optional[Account]]) -> Optional[Account]:
+        if not self.enabled:
+            return load(account_id)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(account_id)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(account_id)
+                self.hits += 1
+                return copy(entry[1])
+            self.misses += 1
+            seen = self._invalidations
+
+        account = load(account_id)
+        if account is None:
+            return None
+        with self._lock:
+            if self._invalidations == seen:
+                self._entries[account_id] = (time.monotonic() + self.ttl_seconds, copy(account))
+                self._entries.move_to_end(account_id)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return account
+
+    def invalidate(self, account_ids: Iterable[str]) -> None:
+        with self._lock:
+            self._invalidations += 1
+            for account_id in account_ids:
+                self._entries.pop(account_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._invalidations += 1
+            self._entries.clear()
+
+    def track(self, session: Session, account_ids: Iterable[str]) -> None:
+        """Invalida las cuentas cuando la transacción en curso de `session` haga commit."""
+        dirty = session.info.get(_DIRTY_KEY)
+        if dirty is None:
+            dirty = session.info[_DIRTY_KEY] = set()
+            event.listen(session, "after_commit", self._after_commit)
+            event.listen(session, "after_rollback", self._after_rollback)
+        dirty.update(account_ids)
+
+    def _after_commit(self, session: Session) -> None:
+        dirty = session.info.get(_DIRTY_KEY)
+        if dirty:
+            self.invalidate(dirty)
+            dirty.clear()
+
+    @staticmethod
+    def _after_rollback(session: Session) -> None:
+        dirty = session.info.get(_DIRTY_KEY)
+        if dirty:
+            dirty.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self._invalidations,
+            }
+
+
+class CachedAccountRepository:
+    """Mismo contrato que el repositorio envuelto; ver el docstring del módulo."""
+
+    def __init__(self, inner, cache: AccountCache, read_through: bool = True) -> None:
+        self._inner = inner
+        self.cache = cache
+        self.read_through = read_through
+        self.session: Session = inner.session
+
+    def get_by_id(self, account_id: str) -> Optional[Account]:
+        if not self.read_through:
+            return self._inner.get_by_id(account_id)
+        return self.cache.get_or_load(account_id, self._inner.get_by_id)
+
+    def debit(self, account_id: str, amount: Decimal) -> bool:
+        self.cache.track(self.session, (account_id,))
+        return self._inner.debit(account_id, amount)
+
+    def credit(self, account_id: str, amount: Decimal) -> bool:
+        self.cache.track(self.session, (account_id,))
+        return self._inner.credit(account_id, amount)
+
+    def update(self, account: Account) -> None:
+        self.cache.track(self.session, (account.id,))
+        self._inner.update(account)
+
+    def __getattr__(self, name: str):
+        return getattr(self._inner, name)
+
+
+def account_cache_from_env(env: Mapping[str, str] = os.environ) -> AccountCache:
+    return AccountCache(
+        max_size=int(env.get("ACCOUNT_CACHE_SIZE", DEFAULT_CACHE_SIZE)),
+        ttl_seconds=float(env.get("ACCOUNT_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)),
+    )
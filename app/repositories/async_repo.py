@@ -0,0 +1,78 @@
+"""Repositorios de solo lectura sobre AsyncSession (modo API_MODE=async).
+
+Las lecturas del camino caliente (cuenta, cliente, historial) se resuelven con
+los mismos selects Core y mapeadores de filas que los repositorios SQL, pero sin
+bloquear el event loop. Las escrituras no se duplican aquí: AsyncBankingFacade
+las ejecuta con los repositorios y servicios síncronos vía AsyncSession.run_sync.
+"""
+from __future__ import annotations
+import asyncio
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.entities import Customer, Account, Transaction
+from app.infra.archive import TransactionArchive
+from app.repositories.row_mapper import (
+    ACCOUNTS,
+    CUSTOMERS,
+    account_from_row,
+    customer_from_row,
+    first_or_none,
+    select_accounts,
+    select_customers,
+    select_latest_transaction_id,
+    select_transaction_count,
+    select_transaction_page,
+    transaction_from_row,
+)
+
+
+class AsyncSQLCustomerRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_by_id(self, customer_id: str) -> Optional[Customer]:
+        rows = await self.session.execute(select_customers().where(CUSTOMERS.c.id == customer_id))
+        return first_or_none(rows, customer_from_row)
+
+    async def get_by_email(self, email: str) -> Optional[Customer]:
+        rows = await self.session.execute(select_customers().where(CUSTOMERS.c.email == email))
+        return first_or_none(rows, customer_from_row)
+
+
+class AsyncSQLAccountRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_by_id(self, account_id: str) -> Optional[Account]:
+        rows = await self.session.execute(select_accounts().where(ACCOUNTS.c.id == account_id))
+        return first_or_none(rows, account_from_row)
+
+
+class AsyncSQLTransactionRepository:
+    def __init__(self, session: AsyncSession, archive: Optional[TransactionArchive] = None):
+        self.session = session
+        self.archive = archive
+
+    async def list_page(self, account_id: str, limit: int, offset: int = 0,
+                        after: Optional[Tuple[datetime, str]] = None) -> list[Transaction]:
+        """Como SQLTransactionRepository.list_page; el archivo (manifest y segmentos) se lee en un hilo aparte."""
+        watermark = None
+        if self.archive is not None:
+            # watermark hace stat del manifest y puede releerlo: disco, fuera del event loop
+            watermark = await asyncio.to_thread(getattr, self.archive, "watermark")
+        rows = await self.session.execute(select_transaction_page(account_id, limit, offset, after, since=watermark))
+        page = [transaction_from_row(r) for r in rows]
+        if watermark is None or len(page) == limit:
+            return page
+        skip = 0
+        if not page and offset:
+            count = await self.session.execute(select_transaction_count(account_id, after, since=watermark))
+            skip = offset - count.scalar()
+        return page + await asyncio.to_thread(self.archive.page, account_id, limit - len(page), skip, after)
+
+    async def latest_id(self, account_id: str) -> Optional[str]:
+        rows = await self.session.execute(select_latest_transaction_id(account_id))
+        return rows.scalar()
@@ -1,20 +1,36 @@
 from __future__ import annotations
-from typing import Protocol, Optional
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, Iterable, Iterator, Protocol, Optional, Sequence, Set, Tuple
+from app.domain.activity import MINUTE_HORIZON, AccountActivity
 from app.domain.entities import Customer, Account, Transaction
 from app.domain.enums import TransactionStatus
+from app.domain.ledger import LedgerEntry
+from app.domain.statement import MonthlyStatement
 
 class CustomerRepository(Protocol):
     def add(self, customer: Customer) -> None: ...
     def get_by_id(self, customer_id: str) -> Optional[Customer]: ...
     def get_by_email(self, email: str) -> Optional[Customer]: ...
+    def find_existing_emails(self, emails: Iterable[str]) -> Set[str]: ...
+    def add_many(self, customers: Sequence[Customer]) -> None: ...
     def list(self) -> list[Customer]: ...
 
 class AccountRepository(Protocol):
     def add(self, account: Account) -> None: ...
+    def add_many(self, accounts: Sequence[Account]) -> None: ...
     def get_by_id(self, account_id: str) -> Optional[Account]: ...
+    def get_many(self, account_ids: Iterable[str]) -> Dict[str, Account]: ...
+    def lock_many(self, account_ids: Iterable[str]) -> Dict[str, Account]:
+        """Como get_many, pero bloquea las cuentas hasta el fin de la transacción,
+        siempre en orden de id: dos operaciones sobre las mismas cuentas esperan
+        una a la otra en lugar de bloquearse mutuamente (deadlock)."""
+        ...
     def list_by_customer(self, customer_id: str) -> list[Account]: ...
     def update(self, account: Account) -> None: ...
     def find_by_currency(self, currency: str) -> list[Account]: ...
+    def debit(self, account_id: str, amount: Decimal) -> bool: ...
+    def credit(self, account_id: str, amount: Decimal) -> bool: ...
 
 class TransactionRepository(Protocol):
     def add(self, transaction: Transaction) -> None: ...
@@ -22,3 +38,44 @@ class TransactionRepository(Protocol):
     def update_status(self, transaction_id: str, status: TransactionStatus) -> None: ...
     def list_by_account(self, account_id: str) -> list[Transaction]: ...
     def list_recent(self, account_id: str, minutes: int) -> list[Transaction]: ...
+    def list_page(self, account_id: str, limit: int, offset: int = 0,
+                  after: Optional[Tuple[datetime, str]] = None) -> list[Transaction]: ...
+    def latest_id(self, account_id: str) -> Optional[str]: ...
+    def iter_by_account(self, account_id: str, batch_size: int = 1000) -> Iterator[Transaction]:
+        """Historial completo en orden cronológico, sin materializarlo en una lista."""
+        ...
+    def iter_movements(self, account_id: str, start: datetime, end: datetime) -> Iterator[Transaction]:
+        """APPROVED con created_at en [start, end) donde la cuenta es origen o destino."""
+        ...
+    def first_activity(self, account_id: str) -> Optional[datetime]:
+        """created_at de la primera transacción de la cuenta (como origen o destino)."""
+        ...
+    def get_activity(self, account_id: str, now: Optional[datetime] = None,
+                     horizon_minutes: int = MINUTE_HORIZON) -> AccountActivity:
+        """Contadores de los últimos `horizon_minutes` minutos y del día de `now`."""
+        ...
+    def prune_counters(self, now: datetime, horizon_minutes: int = MINUTE_HORIZON) -> int:
+        """Borra los contadores que get_activity(now, horizon_minutes) ya no lee; retorna cuántos."""
+        ...
+
+class LedgerRepository(Protocol):
+    def add_entries(self, entries: Sequence[LedgerEntry]) -> None: ...
+    def balance_at(self, account_id: str, at: Optional[datetime] = None) -> Decimal:
+        """Saldo según el libro mayor: último snapshot <= at más las piernas posteriores."""
+        ...
+    def take_snapshots(self, as_of: datetime) -> int:
+        """Nuevo snapshot (a as_of) para cada cuenta con piernas desde su último snapshot."""
+        ...
+
+class StatementRepository(Protocol):
+    def get(self, account_id: str, period: date) -> Optional[MonthlyStatement]: ...
+    def latest_before(self, account_id: str, period: date) -> Optional[MonthlyStatement]: ...
+    def save(self, statement: MonthlyStatement) -> None: ...
+
+class UnitOfWork(Protocol):
+    """Delimita una operación de negocio: los repositorios solo preparan cambios
+    y la unidad de trabajo los confirma (o descarta) de una sola vez."""
+    def __enter__(self) -> "UnitOfWork": ...
+    def __exit__(self, exc_type, exc, tb) -> None: ...
+    def commit(self) -> None: ...
+    def rollback(self) -> None: ...
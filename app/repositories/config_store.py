@@ -0,0 +1,231 @@
+"""Almacenes de la configuración de estrategias (fee activo y reglas de riesgo).
+
+Cada guardado aumenta una versión monótona. ConfigurationService compara esa
+versión con la de su snapshot compilado y solo recarga cuando cambió, así que
+con varios workers todos terminan viendo la misma configuración.
+
+    CONFIG_STORE              memory (por defecto) | file | db
+    CONFIG_FILE               ruta del JSON para CONFIG_STORE=file
+    CONFIG_REFRESH_SECONDS    cada cuánto se consulta la versión en la BD (db)
+
+- memory: la configuración vive en el proceso (un solo worker, tests).
+- file: JSON local; la versión se revisa con un stat por lectura (mtime y tamaño)
+  y el archivo se reescribe de forma atómica bajo un lock de archivo.
+- db: fila única en strategy_config. La versión se consulta como mucho una vez
+  cada CONFIG_REFRESH_SECONDS por worker: un cambio hecho en otro worker se ve
+  con ese retraso máximo; los cambios propios se ven de inmediato.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, Mapping, Optional, Protocol
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+
+from app.repositories.models import StrategyConfigModel
+
+try:
+    import fcntl
+except ImportError:  # Windows: solo se serializan los hilos del proceso
+    fcntl = None
+
+DEFAULT_FEE_TYPE = "flat"
+DEFAULT_RISK_RULES = {"max_amount": True, "velocity": True, "daily_limit": True}
+DEFAULT_REFRESH_SECONDS = 1.0
+
+MEMORY = "memory"
+FILE = "file"
+DB = "db"
+STORES = (MEMORY, FILE, DB)
+
+_CONFIG_ROW_ID = 1
+
+
+@dataclass(frozen=True)
+class StoredConfig:
+    version: int = 0
+    fee_type: str = DEFAULT_FEE_TYPE
+    risk_rules: Dict[str, bool] = field(default_factory=lambda: dict(DEFAULT_RISK_RULES))
+
+
+# Recibe la configuración vigente y retorna la nueva, o None si no hay cambio
+ConfigChange = Callable[[StoredConfig], Optional[StoredConfig]]
+
+
+class ConfigStore(Protocol):
+    def version(self) -> int:
+        """Versión vigente; debe ser barata porque se llama en cada request."""
+        ...
+
+    def load(self) -> StoredConfig: ...
+
+    def update(self, change: ConfigChange) -> StoredConfig:
+        """Aplica `change` sobre la última configuración de forma atómica."""
+        ...
+
+
+class InMemoryConfigStore:
+    def __init__(self, initial: Optional[StoredConfig] = None) -> None:
+        self._config = initial or StoredConfig()
+        self._lock = threading.Lock()
+
+    def version(self) -> int:
+        return self._config.version
+
+    def load(self) -> StoredConfig:
+        return self._config
+
+    def update(self, change: ConfigChange) -> StoredConfig:
+        with self._lock:
+            new = change(self._config)
+            if new is not None:
+                self._config = StoredConfig(self._config.version + 1, new.fee_type, dict(new.risk_rules))
+            return self._config
+
+
+def _to_json(config: StoredConfig) -> str:
+    return json.dumps({"version": config.version, "fee": config.fee_type, "risk": config.risk_rules})
+
+
+def _from_json(raw: str) -> StoredConfig:
+    data = json.loads(raw)
+    return StoredConfig(int(data["version"]), data["fee"], {**DEFAULT_RISK_RULES, **data["risk"]})
+
+
+class FileConfigStore:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        # (mtime_ns, tamaño) del archivo leído la última vez y su contenido
+        self._seen: Optional[tuple] = None
+        self._config = StoredConfig()
+
+    def _stat(self) -> Optional[tuple]:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def version(self) -> int:
+        return self.load().version
+
+    def load(self) -> StoredConfig:
+        stat = self._stat()
+        if stat is not None and stat != self._seen:
+            with open(self.path, encoding="utf-8") as f:
+                self._config = _from_json(f.read())
+            self._seen = stat
+        return self._config
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        with self._lock, open(f"{self.path}.lock", "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+    def update(self, change: ConfigChange) -> StoredConfig:
+        with self._exclusive():
+            current = self.load()
+            new = change(current)
+            if new is None:
+                return current
+            config = StoredConfig(current.version + 1, new.fee_type, dict(new.risk_rules))
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(_to_json(config))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            return self.load()
+
+
+class SQLConfigStore:
+    def __init__(self, engine: Engine, refresh_seconds: float = DEFAULT_REFRESH_SECONDS) -> None:
+        self.engine = engine
+        self.refresh_seconds = refresh_seconds
+        self._config: Optional[StoredConfig] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def version(self) -> int:
+        config = self._config
+        if config is None or time.monotonic() - self._checked_at >= self.refresh_seconds:
+            with self._lock:
+                if self._config is None or time.monotonic() - self._checked_at >= self.refresh_seconds:
+                    self._refresh()
+            config = self._config
+        return config.version
+
+    def load(self) -> StoredConfig:
+        self.version()
+        return self._config
+
+    def _refresh(self) -> None:
+        table = StrategyConfigModel.__table__
+        with self.engine.connect() as conn:
+            version = conn.execute(select(table.c.version).where(table.c.id == _CONFIG_ROW_ID)).scalar()
+            if version is None or self._config is None or version != self._config.version:
+                self._config = self._read_row(conn)
+        self._checked_at = time.monotonic()
+
+    def _read_row(self, conn) -> StoredConfig:
+        table = StrategyConfigModel.__table__
+        row = conn.execute(select(table).where(table.c.id == _CONFIG_ROW_ID)).first()
+        if row is None:
+            return self._create_row(conn)
+        return StoredConfig(row.version, row.fee_type, {**DEFAULT_RISK_RULES, **row.risk_rules})
+
+    def _create_row(self, conn) -> StoredConfig:
+        table = StrategyConfigModel.__table__
+        config = StoredConfig()
+        try:
+            conn.execute(insert(table).values(
+                id=_CONFIG_ROW_ID, version=config.version, fee_type=config.fee_type, risk_rules=config.risk_rules,
+            ))
+            conn.commit()
+        except IntegrityError:
+            # Otro worker la creó primero
+            conn.rollback()
+            return self._read_row(conn)
+        return config
+
+    def update(self, change: ConfigChange) -> StoredConfig:
+        table = StrategyConfigModel.__table__
+        with self._lock, self.engine.connect() as conn:
+            while True:
+                current = self._read_row(conn)
+                new = change(current)
+                if new is None:
+                    conn.rollback()
+                    self._config, self._checked_at = current, time.monotonic()
+                    return current
+                # Compare-and-swap sobre la versión: si otro worker guardó en el medio,
+                # se relee y se vuelve a aplicar el cambio
+                result = conn.execute(
+                    update(table)
+                    .where(table.c.id == _CONFIG_ROW_ID, table.c.version == current.version)
+                    .values(version=current.version + 1, fee_type=new.fee_type, risk_rules=dict(new.risk_rules))
+                )
+                conn.commit()
+                if result.rowcount == 1:
+                    self._config = StoredConfig(current.version + 1, new.fee_type, dict(new.risk_rules))
+                    self._checked_at = time.monotonic()
+                    return self._config
+
+
+def config_store_from_env(engine: Engine, env: Mapping[str, str] = os.environ) -> ConfigStore:
+    kind = env.get("CONFIG_STORE", MEMORY)
+    if kind == MEMORY:
+        return InMemoryConfigStore()
+    if kind == FILE:
+        return FileConfigStore(env.get("CONFIG_FILE", "./strategy_config.json"))
+    if kind == DB:
+        return SQLConfigStore(engine, float(env.get("CONFIG_REFRESH_SECONDS", DEFAULT_REFRESH_SECONDS)))
+    raise ValueError(f"CONFIG_STORE inválido: {kind} (usar {', '.join(STORES)})")
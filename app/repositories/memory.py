@@ -1,15 +1,50 @@
 from __future__ import annotations
-from datetime import datetime, timedelta
-from typing import Optional, List, Dict
+from bisect import bisect_left, bisect_right
+from copy import copy
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Optional, Iterable, Iterator, List, Dict, Sequence, Set, Tuple
+from app.domain.activity import (
+    DAY,
+    MINUTE,
+    MINUTE_HORIZON,
+    AccountActivity,
+    BucketedActivity,
+    day_bucket,
+    minute_bucket,
+)
 from app.domain.entities import Customer, Account, Transaction
-from app.domain.enums import TransactionStatus
+from app.domain.enums import AccountStatus, TransactionStatus
+from app.domain.ledger import LedgerEntry
+from app.domain.statement import MonthlyStatement
+
+class InMemoryUnitOfWork:
+    """Unidad de trabajo sin efecto: los repos en memoria aplican los cambios al instante."""
+    def __enter__(self) -> "InMemoryUnitOfWork":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+    def commit(self) -> None:
+        pass
+
+    def rollback(self) -> None:
+        pass
 
 class InMemoryCustomerRepo:
+    """Repo de clientes con índice hash por email (get_by_email en O(1))."""
     def __init__(self) -> None:
         self._data: Dict[str, Customer] = {}
+        self._by_email: Dict[str, str] = {}
+        # Email con el que quedó indexado cada cliente (la entidad puede mutar antes de update)
+        self._indexed_email: Dict[str, str] = {}
     
     def add(self, customer: Customer) -> None:
+        self._unindex(customer.id)
         self._data[customer.id] = customer
+        self._by_email[customer.email] = customer.id
+        self._indexed_email[customer.id] = customer.email
     
     def get_by_id(self, customer_id: str) -> Optional[Customer]:
         """Retorna None si no existe, cumpliendo con el nuevo Protocol"""
@@ -17,39 +52,178 @@ class InMemoryCustomerRepo:
 
     def get_by_email(self, email: str) -> Optional[Customer]:
         """Busca por email y retorna None si no lo encuentra"""
-        return next((c for c in self._data.values() if c.email == email), None)
+        customer_id = self._by_email.get(email)
+        return self._data.get(customer_id) if customer_id else None
+
+    def find_existing_emails(self, emails: Iterable[str]) -> Set[str]:
+        return {email for email in emails if email in self._by_email}
+
+    def add_many(self, customers: Sequence[Customer]) -> None:
+        for customer in customers:
+            self.add(customer)
+
+    def update(self, customer: Customer) -> None:
+        if customer.id in self._data:
+            self.add(customer)
 
     def list(self) -> List[Customer]:
         return list(self._data.values())
 
+    def _unindex(self, customer_id: str) -> None:
+        email = self._indexed_email.pop(customer_id, None)
+        if email is not None and self._by_email.get(email) == customer_id:
+            del self._by_email[email]
+
 class InMemoryAccountRepo:
+    """Guarda y retorna copias, como un repo SQL: el balance almacenado solo cambia vía debit/credit.
+
+    Mantiene índices hash por customer_id y por moneda (dicts usados como sets
+    ordenados, así los listados conservan el orden de inserción).
+    """
     def __init__(self) -> None:
         self._data: Dict[str, Account] = {}
+        self._by_customer: Dict[str, Dict[str, None]] = {}
+        self._by_currency: Dict[str, Dict[str, None]] = {}
     
     def add(self, account: Account) -> None:
-        self._data[account.id] = account
+        self._unindex(account.id)
+        self._data[account.id] = copy(account)
+        self._by_customer.setdefault(account.customer_id, {})[account.id] = None
+        self._by_currency.setdefault(account.currency, {})[account.id] = None
+
+    def add_many(self, accounts: Sequence[Account]) -> None:
+        for account in accounts:
+            self.add(account)
     
     def get_by_id(self, account_id: str) -> Optional[Account]:
         """Retorna None en lugar de lanzar NotFoundError"""
-        return self._data.get(account_id)
+        account = self._data.get(account_id)
+        return copy(account) if account else None
+
+    def get_many(self, account_ids: Iterable[str]) -> Dict[str, Account]:
+        return {i: copy(self._data[i]) for i in account_ids if i in self._data}
+
+    def lock_many(self, account_ids: Iterable[str]) -> Dict[str, Account]:
+        # Sin transacciones en memoria: debit/credit ya validan contra el saldo vigente
+        return self.get_many(sorted(set(account_ids)))
+
+    def get_by_customer(self, customer_id: str) -> List[Account]:
+        return [copy(self._data[i]) for i in self._by_customer.get(customer_id, ())]
 
     def list_by_customer(self, customer_id: str) -> List[Account]:
-        return [acc for acc in self._data.values() if acc.customer_id == customer_id]
+        return self.get_by_customer(customer_id)
 
     def update(self, account: Account) -> None:
         """Actualiza solo si existe, sin lanzar excepción si falla"""
         if account.id in self._data:
-            self._data[account.id] = account
+            self.add(account)
 
     def find_by_currency(self, currency: str) -> List[Account]:
-        return [acc for acc in self._data.values() if acc.currency == currency]
+        return [copy(self._data[i]) for i in self._by_currency.get(currency, ())]
+
+    def _unindex(self, account_id: str) -> None:
+        previous = self._data.get(account_id)
+        if previous is None:
+            return
+        self._by_customer.get(previous.customer_id, {}).pop(account_id, None)
+        self._by_currency.get(previous.currency, {}).pop(account_id, None)
+
+    def debit(self, account_id: str, amount: Decimal) -> bool:
+        account = self._data.get(account_id)
+        if account is None or account.status != AccountStatus.ACTIVE or account.balance < amount:
+            return False
+        account.apply_debit(amount)
+        return True
+
+    def credit(self, account_id: str, amount: Decimal) -> bool:
+        account = self._data.get(account_id)
+        if account is None or account.status != AccountStatus.ACTIVE:
+            return False
+        account.apply_credit(amount)
+        return True
+
+class _AccountTimeline:
+    """Índice de una cuenta: arreglos paralelos de timestamps e ids ordenados por (created_at, id).
+
+    bisect trabaja directo sobre los datetimes (sin armar tuplas); el id solo se
+    compara para desempatar transacciones con el mismo created_at.
+    """
+    __slots__ = ("times", "ids")
+
+    def __init__(self) -> None:
+        self.times: List[datetime] = []
+        self.ids: List[str] = []
+
+    def position(self, created_at: datetime, transaction_id: str) -> int:
+        lo = bisect_left(self.times, created_at)
+        hi = bisect_right(self.times, created_at, lo)
+        return bisect_left(self.ids, transaction_id, lo, hi)
+
+    def insert(self, created_at: datetime, transaction_id: str) -> None:
+        # Caso común (transacciones nuevas): va al final, append en O(1)
+        if not self.times or created_at > self.times[-1]:
+            self.times.append(created_at)
+            self.ids.append(transaction_id)
+            return
+        i = self.position(created_at, transaction_id)
+        self.times.insert(i, created_at)
+        self.ids.insert(i, transaction_id)
+
+    def remove(self, created_at: datetime, transaction_id: str) -> None:
+        i = self.position(created_at, transaction_id)
+        del self.times[i]
+        del self.ids[i]
+
+    def since(self, limit: datetime) -> int:
+        return bisect_left(self.times, limit)
+
+
+def _prune_counters(counters: Dict[Tuple[str, datetime], list], since: datetime, today: datetime) -> int:
+    """Borra los buckets por minuto anteriores a `since` y los por día anteriores a `today`."""
+    stale = [key for key in counters if key[1] < (since if key[0] == MINUTE else today)]
+    for key in stale:
+        del counters[key]
+    return len(stale)
+
 
 class InMemoryTransactionRepo:
+    """Repo de transacciones completo (mismo contrato que SQLTransactionRepository).
+
+    Cada cuenta tiene un _AccountTimeline ordenado por tiempo: ventanas recientes
+    y paginación cuestan O(log n + k) en lugar de recorrer todas las transacciones,
+    lo que permite perfilar los servicios reales con millones de transacciones.
+    """
     def __init__(self) -> None:
         self._data: Dict[str, Transaction] = {}
+        self._by_account: Dict[str, _AccountTimeline] = {}
+        # Transferencias recibidas, por cuenta destino
+        self._incoming: Dict[str, _AccountTimeline] = {}
+        # Clave con la que quedó indexada cada transacción: (account_id, created_at)
+        self._indexed_key: Dict[str, Tuple[str, datetime]] = {}
+        # Contadores de riesgo: account_id -> (granularidad, bucket) -> [conteo, suma]
+        self._counters: Dict[str, Dict[Tuple[str, datetime], list]] = {}
+        self._counted: Set[str] = set()
 
     def add(self, transaction: Transaction) -> None:
+        previous = self._indexed_key.get(transaction.id)
+        if previous is not None:
+            account_id, created_at = previous
+            self._by_account[account_id].remove(created_at, transaction.id)
+            target = self._data[transaction.id].target_account_id
+            if target is not None:
+                self._incoming[target].remove(created_at, transaction.id)
         self._data[transaction.id] = transaction
+        self._indexed_key[transaction.id] = (transaction.account_id, transaction.created_at)
+        self._timeline(self._by_account, transaction.account_id).insert(transaction.created_at, transaction.id)
+        if transaction.target_account_id is not None:
+            self._timeline(self._incoming, transaction.target_account_id).insert(transaction.created_at, transaction.id)
+
+    @staticmethod
+    def _timeline(index: Dict[str, _AccountTimeline], account_id: str) -> _AccountTimeline:
+        timeline = index.get(account_id)
+        if timeline is None:
+            timeline = index[account_id] = _AccountTimeline()
+        return timeline
 
     def get_by_id(self, transaction_id: str) -> Optional[Transaction]:
         return self._data.get(transaction_id)
@@ -60,11 +234,157 @@ class InMemoryTransactionRepo:
         if transaction:
             transaction.transition_to(status)
             self._data[transaction_id] = transaction
+            if status == TransactionStatus.APPROVED and transaction_id not in self._counted:
+                self._counted.add(transaction_id)
+                self._record_approved(transaction)
+
+    def _record_approved(self, transaction: Transaction) -> None:
+        for granularity, bucket in ((MINUTE, minute_bucket(transaction.created_at)),
+                                    (DAY, day_bucket(transaction.created_at))):
+            counters = self._counters.setdefault(transaction.account_id, {})
+            counter = counters.setdefault((granularity, bucket), [0, Decimal("0")])
+            counter[0] += 1
+            counter[1] += transaction.amount
+
+    def get_activity(self, account_id: str, now: Optional[datetime] = None,
+                     horizon_minutes: int = MINUTE_HORIZON) -> AccountActivity:
+        now = now or datetime.utcnow()
+        today = day_bucket(now)
+        since = minute_bucket(now - timedelta(minutes=horizon_minutes))
+        counters = self._counters.get(account_id, {})
+        # Lo anterior a la ventana no se vuelve a leer: se descarta al pasar
+        _prune_counters(counters, since, today)
+        minutes = {}
+        for offset in range(horizon_minutes + 1):
+            bucket = since + timedelta(minutes=offset)
+            counter = counters.get((MINUTE, bucket))
+            if counter:
+                minutes[bucket] = (counter[0], counter[1])
+        day = counters.get((DAY, today), [0, Decimal("0")])
+        return BucketedActivity(minutes, today, (day[0], day[1]), minutes_from=since)
+
+    def prune_counters(self, now: datetime, horizon_minutes: int = MINUTE_HORIZON) -> int:
+        since = minute_bucket(now - timedelta(minutes=horizon_minutes))
+        return sum(_prune_counters(counters, since, day_bucket(now)) for counters in self._counters.values())
+
+    def find_by_account(self, account_id: str) -> List[Transaction]:
+        timeline = self._by_account.get(account_id)
+        return [self._data[i] for i in timeline.ids] if timeline else []
 
     def list_by_account(self, account_id: str) -> List[Transaction]:
-        return [t for t in self._data.values() if t.account_id == account_id]
+        return self.find_by_account(account_id)
+
+    def find_recent(self, account_id: str, minutes: int) -> List[Transaction]:
+        timeline = self._by_account.get(account_id)
+        if timeline is None:
+            return []
+        start = timeline.since(datetime.utcnow() - timedelta(minutes=minutes))
+        return [self._data[i] for i in timeline.ids[start:]]
 
     def list_recent(self, account_id: str, minutes: int) -> List[Transaction]:
-        limit = datetime.utcnow() - timedelta(minutes=minutes)
-        return [t for t in self._data.values() 
-                if t.account_id == account_id and t.created_at >= limit]
+        return self.find_recent(account_id, minutes)
+
+    def list_page(self, account_id: str, limit: int, offset: int = 0,
+                  after: Optional[Tuple[datetime, str]] = None) -> List[Transaction]:
+        timeline = self._by_account.get(account_id)
+        if timeline is None:
+            return []
+        # Más recientes primero: se recorre el índice hacia atrás desde `after` (o el final)
+        end = timeline.position(*after) if after is not None else len(timeline.ids)
+        stop = max(end - offset - limit, 0)
+        return [self._data[timeline.ids[i]] for i in range(end - offset - 1, stop - 1, -1)]
+
+    def latest_id(self, account_id: str) -> Optional[str]:
+        timeline = self._by_account.get(account_id)
+        return timeline.ids[-1] if timeline is not None and timeline.ids else None
+
+    def iter_by_account(self, account_id: str, batch_size: int = 1000) -> Iterator[Transaction]:
+        timeline = self._by_account.get(account_id)
+        if timeline is None:
+            return
+        for transaction_id in list(timeline.ids):
+            yield self._data[transaction_id]
+
+    def iter_movements(self, account_id: str, start: datetime, end: datetime) -> Iterator[Transaction]:
+        for index in (self._by_account, self._incoming):
+            timeline = index.get(account_id)
+            if timeline is None:
+                continue
+            for transaction_id in timeline.ids[timeline.since(start):timeline.since(end)]:
+                transaction = self._data[transaction_id]
+                if transaction.status == TransactionStatus.APPROVED:
+                    yield transaction
+
+    def first_activity(self, account_id: str) -> Optional[datetime]:
+        firsts = [index[account_id].times[0] for index in (self._by_account, self._incoming)
+                  if index.get(account_id) is not None and index[account_id].times]
+        return min(firsts, default=None)
+
+
+class InMemoryLedgerRepo:
+    """Libro mayor en memoria: por cuenta, piernas y snapshots ordenados por fecha."""
+    def __init__(self) -> None:
+        self.entries: List[LedgerEntry] = []
+        # account_id -> (fechas, montos) en orden de created_at
+        self._by_account: Dict[str, Tuple[List[datetime], List[Decimal]]] = {}
+        # account_id -> (fechas as_of, saldos) en orden de as_of
+        self._snapshots: Dict[str, Tuple[List[datetime], List[Decimal]]] = {}
+
+    def add_entries(self, entries: Sequence[LedgerEntry]) -> None:
+        for entry in entries:
+            self.entries.append(entry)
+            times, amounts = self._by_account.setdefault(entry.account_id, ([], []))
+            i = bisect_right(times, entry.created_at)
+            times.insert(i, entry.created_at)
+            amounts.insert(i, entry.amount)
+
+    def _since_snapshot(self, account_id: str, at: datetime) -> Tuple[Optional[datetime], Decimal]:
+        as_ofs, balances = self._snapshots.get(account_id, ([], []))
+        i = bisect_right(as_ofs, at)
+        return (as_ofs[i - 1], balances[i - 1]) if i else (None, Decimal("0"))
+
+    def _sum(self, account_id: str, after: Optional[datetime], until: datetime) -> Decimal:
+        times, amounts = self._by_account.get(account_id, ([], []))
+        start = bisect_right(times, after) if after is not None else 0
+        return sum(amounts[start:bisect_right(times, until)], Decimal("0"))
+
+    def balance_at(self, account_id: str, at: Optional[datetime] = None) -> Decimal:
+        at = at or datetime.utcnow()
+        as_of, balance = self._since_snapshot(account_id, at)
+        return balance + self._sum(account_id, as_of, at)
+
+    def take_snapshots(self, as_of: datetime) -> int:
+        taken = 0
+        for account_id, (times, _) in self._by_account.items():
+            as_ofs, balances = self._snapshots.setdefault(account_id, ([], []))
+            last, balance = (as_ofs[-1], balances[-1]) if as_ofs else (None, Decimal("0"))
+            if last is not None and last >= as_of:
+                continue
+            start = bisect_right(times, last) if last is not None else 0
+            if start == bisect_right(times, as_of):
+                continue  # sin piernas nuevas: el último snapshot sigue vigente
+            as_ofs.append(as_of)
+            balances.append(balance + self._sum(account_id, last, as_of))
+            taken += 1
+        return taken
+
+
+class InMemoryStatementRepo:
+    """Estados de cuenta por (cuenta, mes); guarda y entrega copias, como la tabla."""
+    def __init__(self) -> None:
+        self._data: Dict[Tuple[str, date], MonthlyStatement] = {}
+
+    def get(self, account_id: str, period: date) -> Optional[MonthlyStatement]:
+        statement = self._data.get((account_id, period))
+        return copy(statement) if statement is not None else None
+
+    def latest_before(self, account_id: str, period: date) -> Optional[MonthlyStatement]:
+        periods = [p for (a, p) in self._data if a == account_id and p < period]
+        return self.get(account_id, max(periods)) if periods else None
+
+    def save(self, statement: MonthlyStatement) -> None:
+        # Como el upsert SQL: un guardado concurrente con un corte anterior no pisa al más nuevo
+        key = (statement.account_id, statement.period)
+        current = self._data.get(key)
+        if current is None or current.computed_through <= statement.computed_through:
+            self._data[key] = copy(statement)
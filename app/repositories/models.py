@@ -1,9 +1,9 @@
 from __future__ import annotations
 from typing import Optional, List, Any
-from sqlalchemy import String, ForeignKey, Numeric, Enum as SQLEnum, DateTime, JSON, Boolean
+from sqlalchemy import String, ForeignKey, Numeric, Enum as SQLEnum, Date, DateTime, JSON, Boolean, Index, Integer, Text
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 from app.domain.enums import AccountStatus, TransactionStatus, TransactionType
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 
 class Base(DeclarativeBase):
@@ -41,4 +41,88 @@ class TransactionModel(Base):
     status: Mapped[TransactionStatus] = mapped_column(SQLEnum(TransactionStatus), default=TransactionStatus.PENDING)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     extra_data: Mapped[Optional[dict[str, Any]]] = mapped_column("metadata", JSON, nullable=True)
-    account: Mapped[AccountModel] = relationship(back_populates="transactions")
\ No newline at end of file
+    account: Mapped[AccountModel] = relationship(back_populates="transactions")
+
+# Historial por cuenta: ORDER BY created_at DESC, id DESC + LIMIT sale directo del índice
+# (id desempata filas con el mismo created_at para que la paginación sea estable)
+Index(
+    "ix_transactions_account_id_created_at",
+    TransactionModel.account_id,
+    TransactionModel.created_at.desc(),
+    TransactionModel.id.desc(),
+)
+# Transferencias recibidas por una cuenta en un rango de fechas (estados de cuenta)
+Index("ix_transactions_target_account_id_created_at", TransactionModel.target_account_id, TransactionModel.created_at)
+
+class RiskCounterModel(Base):
+    """Agregado por cuenta y bucket de tiempo (minuto o día) de transacciones APPROVED."""
+    __tablename__ = "account_risk_counters"
+
+    account_id: Mapped[str] = mapped_column(String, primary_key=True)
+    granularity: Mapped[str] = mapped_column(String(6), primary_key=True)  # "minute" | "day"
+    bucket_start: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+    tx_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    amount_sum: Mapped[Decimal] = mapped_column(Numeric(20, 4), nullable=False, default=Decimal("0"))
+
+class StrategyConfigModel(Base):
+    """Configuración de estrategias compartida entre workers (una sola fila, id=1)."""
+    __tablename__ = "strategy_config"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    fee_type: Mapped[str] = mapped_column(String(20), nullable=False)
+    risk_rules: Mapped[dict[str, bool]] = mapped_column(JSON, nullable=False)
+
+class IdempotencyKeyModel(Base):
+    """Respuesta guardada por Idempotency-Key (status_code NULL = request en curso)."""
+    __tablename__ = "idempotency_keys"
+
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+    status_code: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    response: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+
+class LedgerEntryModel(Base):
+    """Pierna del libro mayor (ver app/domain/ledger.py); solo se insertan filas."""
+    __tablename__ = "ledger_entries"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    # Sin FK a transactions: la transacción puede pasar al archivo en frío y las piernas quedan
+    transaction_id: Mapped[str] = mapped_column(String, nullable=False, index=True)
+    account_id: Mapped[str] = mapped_column(String, nullable=False)
+    amount: Mapped[Decimal] = mapped_column(Numeric(20, 4), nullable=False)
+    kind: Mapped[str] = mapped_column(String(10), nullable=False)  # "PRINCIPAL" | "FEE"
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+# Saldo a una fecha: SUM(amount) de la cuenta desde su último snapshot, directo del índice
+Index("ix_ledger_entries_account_id_created_at", LedgerEntryModel.account_id, LedgerEntryModel.created_at)
+
+class LedgerSnapshotModel(Base):
+    """Saldo de una cuenta según el libro mayor, con todas las piernas hasta as_of."""
+    __tablename__ = "ledger_snapshots"
+
+    account_id: Mapped[str] = mapped_column(String, primary_key=True)
+    as_of: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+    balance: Mapped[Decimal] = mapped_column(Numeric(20, 4), nullable=False)
+
+class AccountStatementModel(Base):
+    """Estado de cuenta mensual materializado (ver app/domain/statement.py)."""
+    __tablename__ = "account_statements"
+
+    account_id: Mapped[str] = mapped_column(String, primary_key=True)
+    period: Mapped[date] = mapped_column(Date, primary_key=True)
+    opening_balance: Mapped[Decimal] = mapped_column(Numeric(20, 4), nullable=False)
+    closing_balance: Mapped[Decimal] = mapped_column(Numeric(20, 4), nullable=False)
+    computed_through: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    closed: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    deposits_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    deposits_total: Mapped[Decimal] = mapped_column(Numeric(20, 4), nullable=False, default=0)
+    withdrawals_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    withdrawals_total: Mapped[Decimal] = mapped_column(Numeric(20, 4), nullable=False, default=0)
+    transfers_out_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    transfers_out_total: Mapped[Decimal] = mapped_column(Numeric(20, 4), nullable=False, default=0)
+    transfers_in_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    transfers_in_total: Mapped[Decimal] = mapped_column(Numeric(20, 4), nullable=False, default=0)
+    fees_total: Mapped[Decimal] = mapped_column(Numeric(20, 4), nullable=False, default=0)
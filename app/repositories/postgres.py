@@ -16,7 +16,7 @@ class PostgresCustomerRepo:
             status=customer.active,
         )
         self.session.add(model)
-        self.session.commit()
+        self.session.flush()
 
     def get_by_id(self, customer_id: str) -> Optional[Customer]:
         # Ahora retorna None si no se encuentra
@@ -56,7 +56,7 @@ class PostgresAccountRepo:
             status=account.status
         )
         self.session.add(model)
-        self.session.commit()
+        self.session.flush()
 
     def get_by_id(self, account_id: str) -> Optional[Account]:
         model = self.session.get(AccountModel, account_id)
@@ -84,7 +84,7 @@ class PostgresTransactionRepo:
             created_at=transaction.created_at
         )
         self.session.add(model)
-        self.session.commit()
+        self.session.flush()
 
     def get_by_id(self, transaction_id: str) -> Optional[Transaction]:
         model = self.session.get(TransactionModel, transaction_id)
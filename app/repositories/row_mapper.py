@@ -0,0 +1,117 @@
+"""Mapeo directo de filas de SQLAlchemy Core a entidades de dominio.
+
+Las lecturas masivas (historial, ventanas, exportaciones) no necesitan objetos
+Model del ORM ni el identity map: se selecciona con las columnas de la tabla y
+cada fila se convierte en la entidad asignando sus slots directamente. Se omite
+__post_init__ porque los datos ya fueron validados al persistirse.
+"""
+from datetime import datetime
+from typing import Any, Optional, Sequence, Tuple
+
+from sqlalchemy import Select, func, select, tuple_
+
+from app.domain.entities import Customer, Account, Transaction
+from app.repositories.models import CustomerModel, AccountModel, TransactionModel
+
+# Tablas de Core: los repositorios filtran con sus columnas (p. ej. TRANSACTIONS.c.account_id)
+CUSTOMERS = CustomerModel.__table__
+ACCOUNTS = AccountModel.__table__
+TRANSACTIONS = TransactionModel.__table__
+
+CUSTOMER_COLUMNS = (CUSTOMERS.c.id, CUSTOMERS.c.name, CUSTOMERS.c.email, CUSTOMERS.c.status)
+ACCOUNT_COLUMNS = (
+    ACCOUNTS.c.id,
+    ACCOUNTS.c.customer_id,
+    ACCOUNTS.c.currency,
+    ACCOUNTS.c.balance,
+    ACCOUNTS.c.status,
+)
+TRANSACTION_COLUMNS = (
+    TRANSACTIONS.c.id,
+    TRANSACTIONS.c.account_id,
+    TRANSACTIONS.c.target_account_id,
+    TRANSACTIONS.c.type,
+    TRANSACTIONS.c.amount,
+    TRANSACTIONS.c.currency,
+    TRANSACTIONS.c.status,
+    TRANSACTIONS.c.created_at,
+    TRANSACTIONS.c.metadata,
+)
+
+_new = object.__new__
+
+
+def select_customers() -> Select:
+    return select(*CUSTOMER_COLUMNS)
+
+
+def select_accounts() -> Select:
+    return select(*ACCOUNT_COLUMNS)
+
+
+def select_transactions() -> Select:
+    return select(*TRANSACTION_COLUMNS)
+
+
+def _account_history(stmt: Select, account_id: str, after: Optional[Tuple[datetime, str]],
+                     since: Optional[datetime]) -> Select:
+    c = TRANSACTIONS.c
+    stmt = stmt.where(c.account_id == account_id)
+    if after is not None:
+        stmt = stmt.where(tuple_(c.created_at, c.id) < after)
+    if since is not None:
+        stmt = stmt.where(c.created_at >= since)
+    return stmt
+
+
+def select_transaction_page(account_id: str, limit: int, offset: int = 0,
+                            after: Optional[Tuple[datetime, str]] = None,
+                            since: Optional[datetime] = None) -> Select:
+    """Página del historial de una cuenta, más recientes primero (ver list_page).
+
+    `since`: solo filas con created_at >= since (lo anterior está en el archivo en frío).
+    """
+    c = TRANSACTIONS.c
+    stmt = _account_history(select_transactions(), account_id, after, since)
+    return stmt.order_by(c.created_at.desc(), c.id.desc()).limit(limit).offset(offset)
+
+
+def select_transaction_count(account_id: str, after: Optional[Tuple[datetime, str]] = None,
+                             since: Optional[datetime] = None) -> Select:
+    """Cantidad de filas que recorre select_transaction_page sin limit ni offset."""
+    return _account_history(select(func.count()).select_from(TRANSACTIONS), account_id, after, since)
+
+
+def select_latest_transaction_id(account_id: str) -> Select:
+    """Id de la transacción más reciente de la cuenta (solo el índice, sin la fila)."""
+    c = TRANSACTIONS.c
+    return (
+        select(c.id)
+        .where(c.account_id == account_id)
+        .order_by(c.created_at.desc(), c.id.desc())
+        .limit(1)
+    )
+
+
+def customer_from_row(row: Sequence[Any]) -> Customer:
+    customer = _new(Customer)
+    customer.id, customer.name, customer.email, customer.active = row
+    return customer
+
+
+def account_from_row(row: Sequence[Any]) -> Account:
+    account = _new(Account)
+    account.id, account.customer_id, account.currency, account._balance, account._status = row
+    return account
+
+
+def transaction_from_row(row: Sequence[Any]) -> Transaction:
+    tx = _new(Transaction)
+    (tx.id, tx.account_id, tx.target_account_id, tx.type, tx.amount,
+     tx.currency, tx._status, tx.created_at, tx.metadata) = row
+    return tx
+
+
+def first_or_none(rows, mapper) -> Optional[Any]:
+    row = rows.first()
+    return mapper(row) if row is not None else None
@@ -1,10 +1,89 @@
 from __future__ import annotations
-from typing import Optional
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Set, Tuple
+from sqlalchemy import and_, delete, func, insert, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
+from app.domain.activity import (
+    DAY,
+    MINUTE,
+    MINUTE_HORIZON,
+    AccountActivity,
+    BucketedActivity,
+    day_bucket,
+    minute_bucket,
+)
 from app.domain.entities import Customer, Account, Transaction
-from app.domain.enums import TransactionStatus
-from app.repositories.models import CustomerModel, AccountModel, TransactionModel
-from app.repositories.base import CustomerRepository, AccountRepository, TransactionRepository
+from app.domain.enums import AccountStatus, TransactionStatus
+from app.domain.exceptions import ValidationError
+from app.domain.ledger import LedgerEntry
+from app.domain.statement import MonthlyStatement
+from app.infra.archive import TransactionArchive
+from app.repositories.models import (
+    CustomerModel,
+    AccountModel,
+    TransactionModel,
+    RiskCounterModel,
+    LedgerEntryModel,
+    LedgerSnapshotModel,
+    AccountStatementModel,
+)
+from app.repositories.base import (
+    CustomerRepository,
+    AccountRepository,
+    TransactionRepository,
+    LedgerRepository,
+    StatementRepository,
+    UnitOfWork,
+)
+from app.repositories.row_mapper import (
+    ACCOUNTS,
+    CUSTOMERS,
+    TRANSACTIONS,
+    account_from_row,
+    customer_from_row,
+    first_or_none,
+    select_accounts,
+    select_customers,
+    select_latest_transaction_id,
+    select_transaction_count,
+    select_transaction_page,
+    select_transactions,
+    transaction_from_row,
+)
+
+# Dialectos con INSERT ... ON CONFLICT DO UPDATE para los contadores de riesgo
+_UPSERT_INSERTS = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+
+
+class SQLAlchemyUnitOfWork(UnitOfWork):
+    """Unidad de trabajo sobre una Session de SQLAlchemy.
+
+    Los repositorios SQL solo hacen flush (envían el SQL dentro de la transacción
+    abierta); el commit ocurre una sola vez aquí. Si el bloque termina sin commit
+    explícito, los cambios se descartan con rollback.
+    """
+    def __init__(self, session: Session):
+        self.session = session
+        self._committed = False
+
+    def __enter__(self) -> "SQLAlchemyUnitOfWork":
+        self._committed = False
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if not self._committed:
+            self.session.rollback()
+
+    def commit(self) -> None:
+        self.session.commit()
+        self._committed = True
+
+    def rollback(self) -> None:
+        self.session.rollback()
+        self._committed = True
 
 class SQLCustomerRepository(CustomerRepository):
     def __init__(self, session: Session):
@@ -13,16 +92,31 @@ class SQLCustomerRepository(CustomerRepository):
     def add(self, customer: Customer) -> None:
         model = CustomerModel(id=customer.id, name=customer.name, email=customer.email, status=customer.active)
         self.session.add(model)
-        self.session.commit()
+        self.session.flush()
 
     def get_by_id(self, customer_id: str) -> Optional[Customer]:
-        model = self.session.query(CustomerModel).filter_by(id=customer_id).first()
-        return Customer(id=model.id, name=model.name, email=model.email, active=model.status) if model else None
+        rows = self.session.execute(select_customers().where(CUSTOMERS.c.id == customer_id))
+        return first_or_none(rows, customer_from_row)
 
     def get_by_email(self, email: str) -> Optional[Customer]:
         """Implementación solicitada por mecueval"""
-        model = self.session.query(CustomerModel).filter_by(email=email).first()
-        return Customer(id=model.id, name=model.name, email=model.email, active=model.status) if model else None
+        rows = self.session.execute(select_customers().where(CUSTOMERS.c.email == email))
+        return first_or_none(rows, customer_from_row)
+
+    def find_existing_emails(self, emails: Iterable[str]) -> Set[str]:
+        """Cuáles de los emails ya existen, con un solo SELECT sobre el índice único."""
+        emails = list(emails)
+        if not emails:
+            return set()
+        return set(self.session.scalars(select(CUSTOMERS.c.email).where(CUSTOMERS.c.email.in_(emails))))
+
+    def add_many(self, customers: Sequence[Customer]) -> None:
+        """INSERT en lote (executemany de Core, sin objetos del ORM)."""
+        if not customers:
+            return
+        self.session.execute(insert(CustomerModel.__table__), [
+            {"id": c.id, "name": c.name, "email": c.email, "status": c.active} for c in customers
+        ])
 
     def update(self, customer: Customer) -> None:
         """Implementación solicitada por mecueval"""
@@ -31,7 +125,7 @@ class SQLCustomerRepository(CustomerRepository):
             model.name = customer.name
             model.email = customer.email
             model.status = customer.active
-            self.session.commit()
+            self.session.flush()
 
 class SQLAccountRepository(AccountRepository):
     def __init__(self, session: Session):
@@ -47,37 +141,125 @@ class SQLAccountRepository(AccountRepository):
             status=account.status
         )
         self.session.add(model)
-        self.session.commit()
+        self.session.flush()
+
+    def add_many(self, accounts: Sequence[Account]) -> None:
+        """INSERT en lote (executemany de Core, sin objetos del ORM)."""
+        if not accounts:
+            return
+        self.session.execute(insert(AccountModel.__table__), [
+            {"id": a.id, "customer_id": a.customer_id, "balance": a.balance,
+             "currency": a.currency, "status": a.status}
+            for a in accounts
+        ])
 
     def get_by_id(self, account_id: str) -> Optional[Account]:
-        model = self.session.query(AccountModel).filter_by(id=account_id).first()
-        if not model: return None
-        return Account(id=model.id, customer_id=model.customer_id, _balance=model.balance, currency=model.currency, _status=model.status)
+        # Lectura Core: siempre refleja los UPDATE condicionales (debit/credit) ya enviados
+        rows = self.session.execute(select_accounts().where(ACCOUNTS.c.id == account_id))
+        return first_or_none(rows, account_from_row)
+
+    def get_many(self, account_ids: Iterable[str]) -> Dict[str, Account]:
+        """Carga varias cuentas con un solo SELECT ... WHERE id IN (...). Omite las inexistentes."""
+        ids = list(dict.fromkeys(account_ids))
+        if not ids:
+            return {}
+        rows = self.session.execute(select_accounts().where(ACCOUNTS.c.id.in_(ids)))
+        return {account.id: account for account in map(account_from_row, rows)}
+
+    def lock_many(self, account_ids: Iterable[str]) -> Dict[str, Account]:
+        """SELECT ... WHERE id IN (...) ORDER BY id FOR UPDATE.
+
+        PostgreSQL bloquea las filas en el orden del ORDER BY. SQLite no tiene
+        bloqueo por fila: un UPDATE sin efecto toma el lock de escritura de la base,
+        que serializa a los escritores hasta el commit. Debe ser lo primero que se
+        escribe en la transacción (si antes se leyó, SQLite puede rechazar el
+        lock con "database is locked" en vez de esperar).
+        """
+        ids = sorted(set(account_ids))
+        if not ids:
+            return {}
+        if self.session.get_bind().dialect.name == "sqlite":
+            self.session.execute(
+                update(AccountModel)
+                .where(AccountModel.id.in_(ids))
+                .values(balance=AccountModel.balance)
+                .execution_options(synchronize_session=False)
+            )
+        rows = self.session.execute(
+            select_accounts().where(ACCOUNTS.c.id.in_(ids)).order_by(ACCOUNTS.c.id).with_for_update()
+        )
+        return {account.id: account for account in map(account_from_row, rows)}
 
     def get_by_customer(self, customer_id: str) -> list[Account]:
         """Implementación solicitada por mecueval"""
-        models = self.session.query(AccountModel).filter_by(customer_id=customer_id).all()
-        return [Account(id=m.id, customer_id=m.customer_id, _balance=m.balance, currency=m.currency, _status=m.status) for m in models]
+        rows = self.session.execute(select_accounts().where(ACCOUNTS.c.customer_id == customer_id))
+        return [account_from_row(r) for r in rows]
 
     def list_by_customer(self, customer_id: str) -> list[Account]:
         return self.get_by_customer(customer_id)
 
     def update(self, account: Account) -> None:
+        """Persiste el estado de la cuenta. El balance solo cambia con debit/credit,
+        así una copia leída antes no puede pisar movimientos concurrentes."""
         model = self.session.query(AccountModel).filter_by(id=account.id).first()
         if model:
-            model.balance = account.balance
             model.status = account.status
-            self.session.commit()
+            self.session.flush()
+
+    def debit(self, account_id: str, amount: Decimal) -> bool:
+        """Débito atómico en la BD (sin SELECT previo).
+
+        UPDATE accounts SET balance = balance - :x
+        WHERE id = :id AND balance >= :x AND status = 'ACTIVE'
+        Retorna False si no se afectó ninguna fila (fondos o estado cambiaron).
+        """
+        if amount <= 0:
+            raise ValidationError("El monto a debitar debe ser positivo")
+        stmt = (
+            update(AccountModel)
+            .where(
+                AccountModel.id == account_id,
+                AccountModel.balance >= amount,
+                AccountModel.status == AccountStatus.ACTIVE,
+            )
+            .values(balance=AccountModel.balance - amount)
+            .execution_options(synchronize_session=False)
+        )
+        return self.session.execute(stmt).rowcount == 1
+
+    def credit(self, account_id: str, amount: Decimal) -> bool:
+        """Crédito atómico en la BD; retorna False si la cuenta no existe o no está ACTIVE."""
+        if amount <= 0:
+            raise ValidationError("El monto a acreditar debe ser positivo")
+        stmt = (
+            update(AccountModel)
+            .where(
+                AccountModel.id == account_id,
+                AccountModel.status == AccountStatus.ACTIVE,
+            )
+            .values(balance=AccountModel.balance + amount)
+            .execution_options(synchronize_session=False)
+        )
+        return self.session.execute(stmt).rowcount == 1
 
     def find_by_currency(self, currency: str) -> list[Account]:
         """Implementación solicitada por mecueval"""
-        models = self.session.query(AccountModel).filter_by(currency=currency).all()
-        return [Account(id=m.id, customer_id=m.customer_id, _balance=m.balance, currency=m.currency, _status=m.status) for m in models]
+        rows = self.session.execute(select_accounts().where(ACCOUNTS.c.currency == currency))
+        return [account_from_row(r) for r in rows]
 
 class SQLTransactionRepository(TransactionRepository):
-    """Clase completa solicitada por mecueval"""
-    def __init__(self, session: Session):
+    """Clase completa solicitada por mecueval
+
+    Con `archive`, historial, exportación y movimientos leen de los segmentos lo
+    anterior al watermark del archivo en frío y de la tabla solo lo posterior
+    (aunque el job aún no haya borrado esas filas, ver app/services/archive_service.py).
+    """
+    def __init__(self, session: Session, archive: Optional[TransactionArchive] = None):
         self.session = session
+        self.archive = archive
+
+    def _watermark(self) -> Optional[datetime]:
+        return self.archive.watermark if self.archive is not None else None
 
     def add(self, transaction: Transaction) -> None:
         model = TransactionModel(
@@ -92,49 +274,319 @@ class SQLTransactionRepository(TransactionRepository):
             extra_data=getattr(transaction, "metadata", None),
         )
         self.session.add(model)
-        self.session.commit()
+        self.session.flush()
 
     def get_by_id(self, transaction_id: str) -> Optional[Transaction]:
-        model = self.session.query(TransactionModel).filter_by(id=transaction_id).first()
-        if not model: return None
-        return Transaction(
-            id=model.id, account_id=model.account_id, target_account_id=model.target_account_id,
-            type=model.type, amount=model.amount, currency=getattr(model, "currency", "USD"),
-            _status=model.status, created_at=model.created_at,
-            metadata=getattr(model, "extra_data", None),
-        )
+        rows = self.session.execute(select_transactions().where(TRANSACTIONS.c.id == transaction_id))
+        return first_or_none(rows, transaction_from_row)
 
     def update_status(self, transaction_id: str, status: TransactionStatus) -> None:
         model = self.session.query(TransactionModel).filter_by(id=transaction_id).first()
         if model:
+            newly_approved = status == TransactionStatus.APPROVED and model.status != TransactionStatus.APPROVED
             model.status = status
-            self.session.commit()
+            if newly_approved:
+                self._record_approved(model.account_id, model.amount, model.created_at)
+            self.session.flush()
+
+    def _record_approved(self, account_id: str, amount: Decimal, created_at: datetime) -> None:
+        """Suma la transacción aprobada a sus buckets por minuto y por día."""
+        for granularity, bucket in ((MINUTE, minute_bucket(created_at)), (DAY, day_bucket(created_at))):
+            self._bump_counter(account_id, granularity, bucket, amount)
+
+    def _bump_counter(self, account_id: str, granularity: str, bucket: datetime, amount: Decimal) -> None:
+        key = (
+            RiskCounterModel.account_id == account_id,
+            RiskCounterModel.granularity == granularity,
+            RiskCounterModel.bucket_start == bucket,
+        )
+        increments = {
+            "tx_count": RiskCounterModel.tx_count + 1,
+            "amount_sum": RiskCounterModel.amount_sum + amount,
+        }
+        row = dict(account_id=account_id, granularity=granularity, bucket_start=bucket,
+                   tx_count=1, amount_sum=amount)
+        dialect_insert = _UPSERT_INSERTS.get(self.session.get_bind().dialect.name)
+        if dialect_insert is not None:
+            stmt = dialect_insert(RiskCounterModel).values(**row).on_conflict_do_update(
+                index_elements=["account_id", "granularity", "bucket_start"], set_=increments,
+            )
+            self.session.execute(stmt)
+            return
+        updated = self.session.execute(
+            update(RiskCounterModel).where(*key).values(**increments)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if not updated:
+            self.session.execute(insert(RiskCounterModel).values(**row))
+
+    def prune_counters(self, now: datetime, horizon_minutes: int = MINUTE_HORIZON) -> int:
+        """Borra los buckets que get_activity ya no lee: por minuto anteriores a la
+        ventana de `horizon_minutes` y por día anteriores a hoy."""
+        since = minute_bucket(now - timedelta(minutes=horizon_minutes))
+        return self.session.execute(
+            delete(RiskCounterModel).where(or_(
+                and_(RiskCounterModel.granularity == MINUTE, RiskCounterModel.bucket_start < since),
+                and_(RiskCounterModel.granularity == DAY, RiskCounterModel.bucket_start < day_bucket(now)),
+            )).execution_options(synchronize_session=False)
+        ).rowcount
+
+    def get_activity(self, account_id: str, now: Optional[datetime] = None,
+                     horizon_minutes: int = MINUTE_HORIZON) -> AccountActivity:
+        """Actividad para las reglas de riesgo leída de los contadores agregados.
+
+        Lee a lo sumo horizon_minutes + 1 buckets por minuto y el bucket del día:
+        el costo no depende de cuántas transacciones tenga la cuenta.
+        """
+        now = now or datetime.utcnow()
+        today = day_bucket(now)
+        since = minute_bucket(now - timedelta(minutes=horizon_minutes))
+        rows = self.session.execute(
+            select(
+                RiskCounterModel.granularity,
+                RiskCounterModel.bucket_start,
+                RiskCounterModel.tx_count,
+                RiskCounterModel.amount_sum,
+            ).where(
+                RiskCounterModel.account_id == account_id,
+                or_(
+                    and_(
+                        RiskCounterModel.granularity == MINUTE,
+                        RiskCounterModel.bucket_start.between(since, minute_bucket(now)),
+                    ),
+                    and_(RiskCounterModel.granularity == DAY, RiskCounterModel.bucket_start == today),
+                ),
+            )
+        ).all()
+        minutes = {}
+        day_totals = (0, Decimal("0"))
+        for granularity, bucket, count, total in rows:
+            if granularity == DAY:
+                day_totals = (count, total)
+            else:
+                minutes[bucket] = (count, total)
+        return BucketedActivity(minutes, today, day_totals, minutes_from=since)
 
     def find_by_account(self, account_id: str) -> list[Transaction]:
-        models = self.session.query(TransactionModel).filter_by(account_id=account_id).all()
-        return [Transaction(
-            id=m.id, account_id=m.account_id, target_account_id=m.target_account_id,
-            type=m.type, amount=m.amount, currency=getattr(m, "currency", "USD"),
-            _status=m.status, created_at=m.created_at,
-            metadata=getattr(m, "extra_data", None),
-        ) for m in models]
+        rows = self.session.execute(select_transactions().where(TRANSACTIONS.c.account_id == account_id))
+        return [transaction_from_row(r) for r in rows]
 
     def list_by_account(self, account_id: str) -> list[Transaction]:
         return self.find_by_account(account_id)
 
     def find_recent(self, account_id: str, minutes: int) -> list[Transaction]:
-        from datetime import datetime, timedelta
         limit = datetime.utcnow() - timedelta(minutes=minutes)
-        models = self.session.query(TransactionModel).filter(
-            TransactionModel.account_id == account_id,
-            TransactionModel.created_at >= limit
-        ).all()
-        return [Transaction(
-            id=m.id, account_id=m.account_id, target_account_id=m.target_account_id,
-            type=m.type, amount=m.amount, currency=getattr(m, "currency", "USD"),
-            _status=m.status, created_at=m.created_at,
-            metadata=getattr(m, "extra_data", None),
-        ) for m in models]
+        rows = self.session.execute(
+            select_transactions().where(
+                TRANSACTIONS.c.account_id == account_id,
+                TRANSACTIONS.c.created_at >= limit,
+            )
+        )
+        return [transaction_from_row(r) for r in rows]
 
     def list_recent(self, account_id: str, minutes: int) -> list[Transaction]:
-        return self.find_recent(account_id, minutes)
\ No newline at end of file
+        return self.find_recent(account_id, minutes)
+
+    def list_page(self, account_id: str, limit: int, offset: int = 0,
+                  after: Optional[Tuple[datetime, str]] = None) -> list[Transaction]:
+        """Página del historial (más recientes primero) con ORDER BY/LIMIT/OFFSET en SQL.
+
+        Usa el índice (account_id, created_at DESC, id DESC): el costo depende del
+        tamaño de la página y no del historial completo de la cuenta. Con `after`
+        (created_at, id) de la última fila vista, la página es un seek keyset.
+        Si la tabla no alcanza para llenar la página se sigue en el archivo en frío.
+        """
+        watermark = self._watermark()
+        stmt = select_transaction_page(account_id, limit, offset, after, since=watermark)
+        page = [transaction_from_row(r) for r in self.session.execute(stmt)]
+        if watermark is None or len(page) == limit:
+            return page
+        skip = 0
+        if not page and offset:
+            # El offset pasó todas las filas de la tabla: lo que sobra se saltea en el archivo
+            count = select_transaction_count(account_id, after, since=watermark)
+            skip = offset - self.session.execute(count).scalar()
+        return page + self.archive.page(account_id, limit - len(page), skip, after)
+
+    def latest_id(self, account_id: str) -> Optional[str]:
+        return self.session.execute(select_latest_transaction_id(account_id)).scalar()
+
+    def iter_by_account(self, account_id: str, batch_size: int = 1000) -> Iterator[Transaction]:
+        """Historial completo (más antiguas primero) leído por bloques de `batch_size`.
+
+        Con yield_per SQLAlchemy usa un cursor del servidor (stream_results) y solo
+        trae un bloque de filas a la vez, sin importar el tamaño del historial.
+        Lo archivado va primero: es todo anterior a lo que queda en la tabla.
+        """
+        stmt = select_transactions().where(TRANSACTIONS.c.account_id == account_id)
+        watermark = self._watermark()
+        if watermark is not None:
+            yield from self.archive.iter_account(account_id)
+            stmt = stmt.where(TRANSACTIONS.c.created_at >= watermark)
+        stmt = stmt.order_by(TRANSACTIONS.c.created_at, TRANSACTIONS.c.id).execution_options(yield_per=batch_size)
+        for row in self.session.execute(stmt):
+            yield transaction_from_row(row)
+
+    def iter_movements(self, account_id: str, start: datetime, end: datetime) -> Iterator[Transaction]:
+        watermark = self._watermark()
+        if watermark is not None and start < watermark:
+            yield from self.archive.iter_movements(account_id, start, min(end, watermark))
+            start = watermark
+        if start >= end:
+            return
+        stmt = (
+            select_transactions()
+            .where(
+                or_(TRANSACTIONS.c.account_id == account_id, TRANSACTIONS.c.target_account_id == account_id),
+                TRANSACTIONS.c.created_at >= start,
+                TRANSACTIONS.c.created_at < end,
+                TRANSACTIONS.c.status == TransactionStatus.APPROVED,
+            )
+            .execution_options(yield_per=1000)
+        )
+        for row in self.session.execute(stmt):
+            yield transaction_from_row(row)
+
+    def first_activity(self, account_id: str) -> Optional[datetime]:
+        if self.archive is not None:
+            archived = self.archive.first_activity(account_id)
+            if archived is not None:
+                return archived
+        # Un MIN por índice (origen y destino) en vez de un MIN sobre el OR
+        firsts = [
+            self.session.execute(select(func.min(TRANSACTIONS.c.created_at)).where(column == account_id)).scalar()
+            for column in (TRANSACTIONS.c.account_id, TRANSACTIONS.c.target_account_id)
+        ]
+        return min((f for f in firsts if f is not None), default=None)
+
+
+_entries = LedgerEntryModel.__table__.c
+_snapshots = LedgerSnapshotModel.__table__.c
+
+
+class SQLLedgerRepository(LedgerRepository):
+    """Libro mayor en SQL: solo INSERT; los saldos históricos salen del último snapshot."""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def add_entries(self, entries: Sequence[LedgerEntry]) -> None:
+        if not entries:
+            return
+        # executemany de Core dentro de la transacción de la operación: mismo commit
+        self.session.execute(insert(LedgerEntryModel.__table__), [
+            {"transaction_id": e.transaction_id, "account_id": e.account_id, "amount": e.amount,
+             "kind": e.kind, "created_at": e.created_at}
+            for e in entries
+        ])
+
+    def balance_at(self, account_id: str, at: Optional[datetime] = None) -> Decimal:
+        at = at or datetime.utcnow()
+        snapshot = self.session.execute(
+            select(_snapshots.as_of, _snapshots.balance)
+            .where(_snapshots.account_id == account_id, _snapshots.as_of <= at)
+            .order_by(_snapshots.as_of.desc())
+            .limit(1)
+        ).first()
+        conditions = [_entries.account_id == account_id, _entries.created_at <= at]
+        if snapshot is not None:
+            conditions.append(_entries.created_at > snapshot.as_of)
+        delta = self.session.execute(select(func.sum(_entries.amount)).where(*conditions)).scalar()
+        base = snapshot.balance if snapshot is not None else Decimal("0")
+        return Decimal(base) + Decimal(delta or 0)
+
+    def take_snapshots(self, as_of: datetime) -> int:
+        # Por cuenta: su último snapshot (fecha y saldo) y la suma de sus piernas en (último, as_of]
+        last = (
+            select(_snapshots.account_id, func.max(_snapshots.as_of).label("as_of"))
+            .group_by(_snapshots.account_id)
+            .subquery()
+        )
+        previous = LedgerSnapshotModel.__table__.alias("previous")
+        source = (
+            LedgerEntryModel.__table__
+            .outerjoin(last, last.c.account_id == _entries.account_id)
+            .outerjoin(previous, and_(previous.c.account_id == last.c.account_id, previous.c.as_of == last.c.as_of))
+        )
+        rows = self.session.execute(
+            select(_entries.account_id, previous.c.balance, func.sum(_entries.amount))
+            .select_from(source)
+            .where(_entries.created_at <= as_of, or_(last.c.as_of.is_(None), _entries.created_at > last.c.as_of))
+            .group_by(_entries.account_id, previous.c.balance)
+        ).all()
+        if rows:
+            self.session.execute(insert(LedgerSnapshotModel.__table__), [
+                {"account_id": account_id, "as_of": as_of, "balance": Decimal(base or 0) + Decimal(delta)}
+                for account_id, base, delta in rows
+            ])
+        return len(rows)
+
+
+_STATEMENT_FIELDS = (
+    "opening_balance",
+    "computed_through",
+    "closed",
+    "deposits_count",
+    "deposits_total",
+    "withdrawals_count",
+    "withdrawals_total",
+    "transfers_out_count",
+    "transfers_out_total",
+    "transfers_in_count",
+    "transfers_in_total",
+    "fees_total",
+)
+
+
+class SQLStatementRepository(StatementRepository):
+    """Estados de cuenta mensuales en account_statements (una fila por cuenta y mes)."""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    @staticmethod
+    def _to_entity(model: AccountStatementModel) -> MonthlyStatement:
+        return MonthlyStatement(
+            account_id=model.account_id,
+            period=model.period,
+            **{name: getattr(model, name) for name in _STATEMENT_FIELDS},
+        )
+
+    def get(self, account_id: str, period: date) -> Optional[MonthlyStatement]:
+        # populate_existing: save escribe con SQL directo, la instancia del identity map puede estar vieja
+        model = self.session.get(AccountStatementModel, (account_id, period), populate_existing=True)
+        return self._to_entity(model) if model is not None else None
+
+    def latest_before(self, account_id: str, period: date) -> Optional[MonthlyStatement]:
+        model = self.session.execute(
+            select(AccountStatementModel)
+            .where(AccountStatementModel.account_id == account_id, AccountStatementModel.period < period)
+            .order_by(AccountStatementModel.period.desc())
+            .limit(1)
+            .execution_options(populate_existing=True)
+        ).scalar()
+        return self._to_entity(model) if model is not None else None
+
+    def save(self, statement: MonthlyStatement) -> None:
+        """Inserta o actualiza la fila del mes con un solo upsert.
+
+        Dos pedidos pueden materializar el mismo mes a la vez: el INSERT no choca
+        con la clave primaria y la fila nunca retrocede a un corte anterior.
+        """
+        table = AccountStatementModel.__table__
+        values = {name: getattr(statement, name) for name in _STATEMENT_FIELDS}
+        values["closing_balance"] = statement.closing_balance
+        key = (table.c.account_id == statement.account_id, table.c.period == statement.period)
+        newer = table.c.computed_through <= statement.computed_through
+        dialect_insert = _UPSERT_INSERTS.get(self.session.get_bind().dialect.name)
+        if dialect_insert is not None:
+            stmt = dialect_insert(table).values(account_id=statement.account_id, period=statement.period, **values)
+            self.session.execute(stmt.on_conflict_do_update(
+                index_elements=["account_id", "period"], set_=values,
+                where=table.c.computed_through <= stmt.excluded.computed_through,
+            ))
+            return
+        updated = self.session.execute(update(table).where(*key, newer).values(**values)).rowcount
+        if not updated and self.session.execute(select(table.c.period).where(*key)).first() is None:
+            self.session.execute(insert(table).values(account_id=statement.account_id, period=statement.period,
+                                                      **values))
@@ -1,5 +1,6 @@
 from datetime import datetime
-from pydantic import BaseModel, Field, field_validator, ValidationInfo
+from typing import Optional
+from pydantic import BaseModel, Field, field_validator, model_validator, ValidationInfo
 from decimal import Decimal
 
 from app.domain.enums import AccountStatus, TransactionStatus, TransactionType
@@ -73,3 +74,82 @@ class TransactionResponse(BaseModel):
     currency: str
     status: TransactionStatus
     created_at: datetime
+
+
+# Lote de transacciones
+
+MAX_BATCH_OPERATIONS = 10_000
+
+class BatchOperationRequest(BaseModel):
+    type: TransactionType = Field(description="DEPOSIT, WITHDRAWAL o TRANSFER")
+    account_id: str = Field(min_length=1, description="Cuenta a operar (origen en transferencias)")
+    to_account_id: Optional[str] = Field(default=None, description="Cuenta destino (solo TRANSFER)")
+    amount: Decimal = Field(gt=0, description="Monto de la operación")
+
+    @model_validator(mode="after")
+    def target_matches_type(self) -> "BatchOperationRequest":
+        if self.type == TransactionType.TRANSFER:
+            if not self.to_account_id:
+                raise ValueError("to_account_id es obligatorio en transferencias")
+            if self.to_account_id == self.account_id:
+                raise ValueError("account_id y to_account_id deben ser diferentes")
+        elif self.to_account_id is not None:
+            raise ValueError("to_account_id solo aplica a transferencias")
+        return self
+
+class BatchRequest(BaseModel):
+    operations: list[BatchOperationRequest] = Field(
+        min_length=1, max_length=MAX_BATCH_OPERATIONS, description="Operaciones en orden de ejecución"
+    )
+
+class BatchItemResponse(BaseModel):
+    index: int
+    executed: bool
+    transaction: Optional[TransactionResponse] = None
+    error: Optional[str] = None
+    error_status: Optional[int] = Field(
+        default=None, description="Código HTTP que habría retornado la operación individual"
+    )
+
+class BatchResponse(BaseModel):
+    approved: int
+    failed: int
+    not_executed: int
+    results: list[BatchItemResponse]
+
+
+# Importación masiva
+
+class RejectedRowResponse(BaseModel):
+    line: int
+    email: Optional[str] = None
+    reason: str
+
+class ImportReportResponse(BaseModel):
+    processed: int
+    customers_created: int
+    accounts_created: int
+    rejected_count: int
+    rejected: list[RejectedRowResponse] = Field(
+        description="Muestra de filas rechazadas (las primeras 100); el total está en rejected_count"
+    )
+
+
+# Estados de cuenta
+
+class MovementSummary(BaseModel):
+    count: int
+    total: Decimal
+
+class StatementResponse(BaseModel):
+    account_id: str
+    period: str = Field(description="Mes del estado de cuenta (YYYY-MM)")
+    opening_balance: Decimal
+    closing_balance: Decimal
+    deposits: MovementSummary
+    withdrawals: MovementSummary
+    transfers_out: MovementSummary
+    transfers_in: MovementSummary
+    fees_total: Decimal
+    closed: bool = Field(description="true si el mes ya cerró y el estado no va a cambiar")
+    computed_through: datetime = Field(description="Movimientos incluidos hasta esta fecha (UTC)")
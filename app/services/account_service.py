@@ -1,10 +1,12 @@
 from decimal import Decimal
+from typing import Optional
 
 from app.domain.entities import Account, Transaction
 from app.domain.enums import AccountStatus
 from app.domain.exceptions import NotFoundError
 
 from app.repositories.base import CustomerRepository, AccountRepository, TransactionRepository
+from app.services.pagination import normalize_page
 
 class AccountService:
     def __init__(self, customers: CustomerRepository, 
@@ -31,11 +33,14 @@ class AccountService:
             raise NotFoundError("Cuenta no encontrada")
         return account
 
-    def list_transactions(self, account_id: str, limit: int = 10, offset: int = 0) -> list[Transaction]:
-        if limit < 1:
-            limit = 10
-        if offset < 0:
-            offset = 0
-        all_tx = self.transactions.list_by_account(account_id)
-        sorted_tx = sorted(all_tx, key=lambda t: t.created_at, reverse=True)
-        return sorted_tx[offset : offset + limit]
+    def list_transactions(self, account_id: str, limit: int = 10, offset: int = 0,
+                          cursor: Optional[str] = None) -> list[Transaction]:
+        limit, offset, after = normalize_page(limit, offset, cursor)
+        # El repositorio ordena y pagina (en SQL, sobre el índice por cuenta)
+        if after is None:
+            return self.transactions.list_page(account_id, limit, offset)
+        return self.transactions.list_page(account_id, limit, after=after)
+
+    def latest_transaction_id(self, account_id: str) -> Optional[str]:
+        """Id de la transacción más reciente de la cuenta (validador del historial)."""
+        return self.transactions.latest_id(account_id)
@@ -0,0 +1,67 @@
+"""Job de archivo en frío: pasa las transacciones viejas de la tabla a segmentos en disco.
+
+Cada corrida mueve las filas con created_at en [watermark actual, corte) y deja
+el sistema consistente aunque el proceso muera entre pasos:
+
+1. Escribe las filas en un segmento nuevo (ver app/infra/archive.py).
+2. Publica el manifest con el segmento y watermark = corte. Desde aquí las
+   lecturas toman del archivo todo lo anterior al corte e ignoran esas filas en
+   la tabla, aunque sigan ahí.
+3. Borra de la tabla todo lo anterior al corte y hace commit. Si una corrida
+   murió antes de este paso, la siguiente borra lo que quedó sin archivarlo otra vez.
+
+El corte tiene que ser al menos MIN_AGE anterior a ahora: una operación que todavía
+no hizo commit no puede quedar antes del corte (se borraría sin pasar al archivo).
+Los riesgos, el libro mayor y los estados de cuenta no se tocan.
+"""
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from app.domain.exceptions import ValidationError
+from app.infra.archive import TransactionArchive
+from app.repositories.row_mapper import TRANSACTIONS, select_transactions, transaction_from_row
+
+DEFAULT_AFTER_DAYS = 180
+DEFAULT_BATCH_SIZE = 5000
+MIN_AGE = timedelta(days=1)
+
+
+@dataclass
+class ArchiveReport:
+    watermark: datetime
+    archived: int
+    deleted: int
+    segment: Optional[str]
+    segment_bytes: int
+
+
+def archive_transactions(session: Session, archive: TransactionArchive, cutoff: datetime,
+                         now: Optional[datetime] = None, batch_size: int = DEFAULT_BATCH_SIZE) -> ArchiveReport:
+    now = now or datetime.utcnow()
+    if cutoff > now - MIN_AGE:
+        raise ValidationError(f"El corte de archivo debe ser anterior a {now - MIN_AGE:%Y-%m-%d %H:%M}")
+    previous = archive.watermark
+    if previous is not None and cutoff < previous:
+        raise ValidationError(f"El corte no puede ser anterior al ya archivado ({previous.isoformat()})")
+
+    c = TRANSACTIONS.c
+    stmt = select_transactions().where(c.created_at < cutoff)
+    if previous is not None:
+        stmt = stmt.where(c.created_at >= previous)
+    # El segmento necesita las filas agrupadas por cuenta; se leen por bloques (cursor del servidor)
+    stmt = stmt.order_by(c.account_id, c.created_at, c.id).execution_options(yield_per=batch_size)
+    segment = archive.append(map(transaction_from_row, session.execute(stmt)), cutoff)
+
+    deleted = session.execute(delete(TRANSACTIONS).where(c.created_at < cutoff)).rowcount
+    session.commit()
+    return ArchiveReport(
+        watermark=cutoff,
+        archived=segment.rows if segment else 0,
+        deleted=deleted,
+        segment=segment.name if segment else None,
+        segment_bytes=segment.size_bytes if segment else 0,
+    )
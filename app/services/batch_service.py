@@ -0,0 +1,181 @@
+from copy import copy
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.domain.entities import Account, Transaction
+from app.domain.enums import TransactionType
+from app.domain.exceptions import BankingError, InfrastructureError, ValidationError
+from app.repositories.base import AccountRepository, UnitOfWork
+from app.services.deposit_service import DepositService
+from app.services.transfer_service import TransferService
+from app.services.withdraw_service import WithdrawService
+
+# Operaciones confirmadas por commit: acota la cantidad de commits de un lote
+# y lo que se pierde si la base de datos falla a mitad de camino
+DEFAULT_CHUNK_SIZE = 500
+
+
+@dataclass(slots=True)
+class BatchOperation:
+    type: TransactionType
+    account_id: str
+    amount: Decimal
+    target_account_id: Optional[str] = None
+
+
+@dataclass(slots=True)
+class BatchItemResult:
+    """Resultado de una operación del lote, en la misma posición que en la solicitud.
+
+    - transaction: la transacción APPROVED si la operación se aplicó.
+    - error: el error de dominio (rechazo de riesgo, fondos, cuenta no operable...).
+    - executed=False: la operación no quedó aplicada porque el bloque se revirtió.
+    """
+    index: int
+    transaction: Optional[Transaction] = None
+    error: Optional[BankingError] = None
+    executed: bool = True
+
+
+class _PreloadedAccountRepo:
+    """Vista del repositorio de cuentas con las cuentas del bloque ya cargadas.
+
+    get_by_id responde desde memoria (una sola consulta IN por bloque, que además
+    bloquea las cuentas en orden de id hasta el commit del bloque). Los débitos
+    y créditos siguen siendo UPDATE condicionales en la BD; si uno se aplica, el
+    saldo en memoria se ajusta igual, y si falla la cuenta se vuelve a leer.
+    """
+
+    def __init__(self, inner: AccountRepository, account_ids: Iterable[str]) -> None:
+        self._inner = inner
+        self._requested = set(account_ids)
+        self._accounts: Dict[str, Account] = inner.lock_many(self._requested)
+
+    def get_by_id(self, account_id: str) -> Optional[Account]:
+        account_id = str(account_id)
+        if account_id not in self._requested:
+            return self._inner.get_by_id(account_id)
+        if account_id not in self._accounts:
+            # Cuenta inexistente al cargar el bloque, o invalidada tras un UPDATE fallido
+            account = self._inner.get_by_id(account_id)
+            if account is None:
+                return None
+            self._accounts[account_id] = account
+        return copy(self._accounts[account_id])
+
+    def lock_many(self, account_ids: Iterable[str]) -> Dict[str, Account]:
+        # Las cuentas del bloque ya quedaron bloqueadas al cargarlo
+        accounts = {i: self.get_by_id(i) for i in sorted(set(map(str, account_ids)))}
+        return {i: account for i, account in accounts.items() if account is not None}
+
+    def debit(self, account_id: str, amount: Decimal) -> bool:
+        return self._apply(account_id, self._inner.debit(account_id, amount), -amount)
+
+    def credit(self, account_id: str, amount: Decimal) -> bool:
+        return self._apply(account_id, self._inner.credit(account_id, amount), amount)
+
+    def _apply(self, account_id: str, applied: bool, delta: Decimal) -> bool:
+        if not applied:
+            self._accounts.pop(account_id, None)
+        elif account_id in self._accounts:
+            self._accounts[account_id]._balance += delta
+        return applied
+
+    def __getattr__(self, name: str):
+        return getattr(self._inner, name)
+
+
+class BatchService:
+    """Ejecuta muchas operaciones con la misma semántica que DepositService,
+    WithdrawService y TransferService, pero por bloques.
+
+    Por cada bloque: una consulta para cargar todas las cuentas involucradas y un
+    único commit. Los errores de dominio se reportan por operación y no detienen
+    el lote (la transacción REJECTED queda registrada, igual que en la API
+    unitaria). Un error de infraestructura revierte el bloque en curso y el lote
+    se detiene: esas operaciones y las siguientes se reportan como no ejecutadas.
+    """
+
+    def __init__(
+        self,
+        account_repo: AccountRepository,
+        deposit_service: DepositService,
+        withdraw_service: WithdrawService,
+        transfer_service: TransferService,
+        uow: UnitOfWork,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        if chunk_size <= 0:
+            raise ValidationError("El tamaño de bloque debe ser mayor a cero")
+        self.account_repo = account_repo
+        self.deposit_service = deposit_service
+        self.withdraw_service = withdraw_service
+        self.transfer_service = transfer_service
+        self.uow = uow
+        self.chunk_size = chunk_size
+
+    def execute(self, operations: Sequence[BatchOperation]) -> List[BatchItemResult]:
+        results: List[BatchItemResult] = []
+        for start in range(0, len(operations), self.chunk_size):
+            chunk = operations[start:start + self.chunk_size]
+            chunk_results, failure = self._run_chunk(start, chunk)
+            results.extend(chunk_results)
+            if failure is not None:
+                results.extend(
+                    BatchItemResult(index=i, error=failure, executed=False)
+                    for i in range(start + len(chunk), len(operations))
+                )
+                break
+        return results
+
+    def _run_chunk(
+        self, offset: int, chunk: Sequence[BatchOperation]
+    ) -> Tuple[List[BatchItemResult], Optional[BankingError]]:
+        account_ids = set()
+        for op in chunk:
+            account_ids.add(op.account_id)
+            if op.target_account_id:
+                account_ids.add(op.target_account_id)
+
+        with self.uow:
+            accounts = _PreloadedAccountRepo(self.account_repo, account_ids)
+            handlers = self._handlers(accounts)
+            results: List[BatchItemResult] = []
+            for index, op in enumerate(chunk, start=offset):
+                try:
+                    results.append(BatchItemResult(index=index, transaction=handlers[op.type](op)))
+                except BankingError as e:
+                    results.append(BatchItemResult(index=index, error=e))
+                except Exception as e:
+                    self.uow.rollback()
+                    # Falla del servidor, no de los datos del lote: se reporta como 500
+                    failure = InfrastructureError(f"Lote interrumpido en la operación {index}: {str(e)}")
+                    return [
+                        BatchItemResult(index=i, error=failure, executed=False)
+                        for i in range(offset, offset + len(chunk))
+                    ], failure
+            self.uow.commit()
+        return results, None
+
+    def _handlers(self, accounts: _PreloadedAccountRepo):
+        """Servicios del bloque: mismas estrategias, repositorio de cuentas precargado."""
+        def build(service, cls):
+            return cls(
+                account_repo=accounts,
+                transaction_repo=service.transaction_repo,
+                fee_strategy=service.fee_strategy,
+                risk_strategies=service.risk_plan,
+                ledger_repo=service.ledger_repo,
+            )
+
+        deposit = build(self.deposit_service, DepositService)
+        withdraw = build(self.withdraw_service, WithdrawService)
+        transfer = build(self.transfer_service, TransferService)
+        return {
+            TransactionType.DEPOSIT: lambda op: deposit.execute(op.account_id, op.amount),
+            TransactionType.WITHDRAWAL: lambda op: withdraw.execute(op.account_id, op.amount),
+            TransactionType.TRANSFER: lambda op: transfer.execute(
+                op.account_id, op.target_account_id, op.amount
+            ),
+        }
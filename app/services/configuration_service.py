@@ -1,5 +1,7 @@
-from decimal import Decimal
-from typing import Dict, Any
+from dataclasses import replace
+from typing import Dict, Any, List, Optional, Tuple
+
+from app.repositories.config_store import DEFAULT_RISK_RULES, ConfigStore, InMemoryConfigStore, StoredConfig
 
 from app.services.fee_strategies import (
     FeeStrategy,
@@ -8,7 +10,9 @@ from app.services.fee_strategies import (
     PercentFeeStrategy,
     TieredFeeStrategy
 )
+from app.services.risk_engine import RiskPlan
 from app.services.risk_strategies import (
+    RiskStrategy,
     MaxAmountRule,
     VelocityRule,
     DailyLimitRule
@@ -16,74 +20,77 @@ from app.services.risk_strategies import (
 
 
 class ConfigurationService:
-    """Servicio que mantiene la configuración actual de estrategias en memoria.
+    """Servicio que expone la configuración actual de estrategias.
     
     Guarda qué estrategia de fee está activa y qué reglas de riesgo están habilitadas.
     Los valores de las estrategias son fijos (no configurables individualmente).
+
+    La configuración vive en un ConfigStore (memoria, archivo o BD; ver
+    app/repositories/config_store.py) con una versión que aumenta en cada cambio
+    efectivo. El servicio mantiene un snapshot compilado (estrategias ya
+    construidas, sin estado) y solo lo reconstruye cuando cambia la versión.
     """
     
-    def __init__(self):
-        # Configuración por defecto
-        self._fee_type = "flat"  # "no", "flat", "percent", "tiered"
-        
-        self._risk_rules = {
-            "max_amount": True,
-            "velocity": True,
-            "daily_limit": True
-        }
-    
+    def __init__(self, store: Optional[ConfigStore] = None):
+        self.store = store if store is not None else InMemoryConfigStore()
+        # (config, fee, plan de riesgo) de la última compilación; se reemplaza de una sola vez
+        self._compiled: Optional[Tuple[StoredConfig, FeeStrategy, RiskPlan]] = None
+
+    @property
+    def version(self) -> int:
+        return self.store.version()
+
+    def _snapshot(self) -> Tuple[StoredConfig, FeeStrategy, RiskPlan]:
+        compiled = self._compiled
+        if compiled is None or compiled[0].version != self.store.version():
+            config = self.store.load()
+            compiled = (config, _build_fee_strategy(config.fee_type), RiskPlan(_build_risk_strategies(config.risk_rules)))
+            self._compiled = compiled
+        return compiled
+
     # ============================================
     # MÉTODOS PARA FEE STRATEGY
     # ============================================
     
     def get_current_fee_strategy(self) -> FeeStrategy:
-        """Retorna la instancia de FeeStrategy según la configuración actual"""
-        if self._fee_type == "flat":
-            return FlatFeeStrategy()
-        elif self._fee_type == "percent":
-            return PercentFeeStrategy()
-        elif self._fee_type == "tiered":
-            return TieredFeeStrategy()
-        else:  # "no" o cualquier otro
-            return NoFeeStrategy()
+        """Retorna la instancia de FeeStrategy según la configuración actual (compartida)"""
+        return self._snapshot()[1]
     
     def set_fee_strategy(self, fee_type: str) -> None:
         """Cambia la estrategia de fee activa"""
         valid_types = ["no", "flat", "percent", "tiered"]
         if fee_type in valid_types:
-            self._fee_type = fee_type
+            self.store.update(
+                lambda config: None if config.fee_type == fee_type else replace(config, fee_type=fee_type)
+            )
     
     def get_current_fee_type(self) -> str:
         """Retorna el tipo de fee actual (para el frontend)"""
-        return self._fee_type
+        return self._snapshot()[0].fee_type
     
     # ============================================
     # MÉTODOS PARA RISK STRATEGIES
     # ============================================
     
-    def get_current_risk_strategies(self) -> list:
-        """Retorna la lista de reglas de riesgo activas"""
-        strategies = []
-        
-        if self._risk_rules["max_amount"]:
-            strategies.append(MaxAmountRule())
-        
-        if self._risk_rules["velocity"]:
-            strategies.append(VelocityRule())
-        
-        if self._risk_rules["daily_limit"]:
-            strategies.append(DailyLimitRule())
-        
-        return strategies
+    def get_current_risk_strategies(self) -> List[RiskStrategy]:
+        """Retorna la lista de reglas de riesgo activas (compartida: no modificarla)"""
+        return self._snapshot()[2].rules
+
+    def get_current_risk_plan(self) -> RiskPlan:
+        """Reglas activas compiladas para evaluarse en una pasada (compartido)"""
+        return self._snapshot()[2]
     
     def set_risk_rule(self, rule_name: str, enabled: bool) -> None:
         """Activa o desactiva una regla de riesgo específica"""
-        if rule_name in self._risk_rules:
-            self._risk_rules[rule_name] = enabled
+        if rule_name in DEFAULT_RISK_RULES:
+            self.store.update(
+                lambda config: None if config.risk_rules.get(rule_name) == enabled
+                else replace(config, risk_rules={**config.risk_rules, rule_name: enabled})
+            )
     
     def get_risk_rules_status(self) -> Dict[str, bool]:
         """Retorna el estado de activación de cada regla de riesgo"""
-        return self._risk_rules.copy()
+        return dict(self._snapshot()[0].risk_rules)
     
     # ============================================
     # MÉTODOS PARA OBTENER CONFIGURACIÓN COMPLETA
@@ -91,7 +98,34 @@ class ConfigurationService:
     
     def get_full_config(self) -> Dict[str, Any]:
         """Retorna toda la configuración actual (para el frontend)"""
+        config = self._snapshot()[0]
         return {
-            "fee": self._fee_type,
-            "risk": self._risk_rules.copy()
-        }
\ No newline at end of file
+            "fee": config.fee_type,
+            "risk": dict(config.risk_rules)
+        }
+
+
+def _build_fee_strategy(fee_type: str) -> FeeStrategy:
+    if fee_type == "flat":
+        return FlatFeeStrategy()
+    elif fee_type == "percent":
+        return PercentFeeStrategy()
+    elif fee_type == "tiered":
+        return TieredFeeStrategy()
+    else:  # "no" o cualquier otro
+        return NoFeeStrategy()
+
+
+def _build_risk_strategies(risk_rules: Dict[str, bool]) -> List[RiskStrategy]:
+    strategies = []
+    
+    if risk_rules.get("max_amount"):
+        strategies.append(MaxAmountRule())
+    
+    if risk_rules.get("velocity"):
+        strategies.append(VelocityRule())
+    
+    if risk_rules.get("daily_limit"):
+        strategies.append(DailyLimitRule())
+    
+    return strategies
@@ -1,15 +1,19 @@
 from decimal import Decimal
+from typing import Optional, Union
 from uuid import UUID
 
 from app.domain.entities import Account, Transaction
 from app.domain.enums import TransactionStatus, TransactionType
 from app.domain.exceptions import (
+    AccountNotOperableError,
     TransactionRejectedError,
     ValidationError,
 )
 from app.domain.factories import TransactionFactory
-from app.repositories.base import AccountRepository, TransactionRepository
+from app.domain.ledger import entries_for
+from app.repositories.base import AccountRepository, LedgerRepository, TransactionRepository
 from app.services.fee_strategies import FeeStrategy
+from app.services.risk_engine import RiskPlan, as_risk_plan
 from app.services.risk_strategies import RiskStrategy
 
 
@@ -24,12 +28,16 @@ class DepositService:
         account_repo: AccountRepository,
         transaction_repo: TransactionRepository,
         fee_strategy: FeeStrategy,
-        risk_strategies: list[RiskStrategy],
+        risk_strategies: Union[RiskPlan, list[RiskStrategy]],
+        ledger_repo: Optional[LedgerRepository] = None,
     ):
         self.account_repo = account_repo
         self.transaction_repo = transaction_repo
         self.fee_strategy = fee_strategy
-        self.risk_strategies = risk_strategies
+        # Las reglas se evalúan compiladas en un RiskPlan (una pasada por transacción)
+        self.risk_plan = as_risk_plan(risk_strategies)
+        self.risk_strategies = self.risk_plan.rules
+        self.ledger_repo = ledger_repo
     
     def execute(self, account_id: UUID, amount: Decimal) -> Transaction:
         """Ejecuta un depósito en la cuenta especificada.
@@ -47,31 +55,37 @@ class DepositService:
         # 2. Verificar que la cuenta pueda operar
         account.check_can_operate()
         
-        # 3. Crear transacción (PENDING)
+        # 3. Crear transacción (PENDING) con la comisión que se aplicará
+        #    (metadata applied_fee, igual que las transferencias del builder)
+        fee = self.fee_strategy.calculate_fee(amount)
         transaction = TransactionFactory.get_creator(TransactionType.DEPOSIT).create(amount, account_id)
+        transaction.metadata = {"applied_fee": str(fee)}
         self.transaction_repo.add(transaction)
         
         try:
-            # 4. Obtener transacciones recientes para reglas de riesgo
-            recent = self.transaction_repo.find_recent(str(account_id), minutes=60)
+            # 4. Obtener la actividad reciente (contadores agregados) para reglas de riesgo
+            recent = self.transaction_repo.get_activity(str(account_id), horizon_minutes=self.risk_plan.minute_horizon)
             
             # 5. Aplicar TODAS las reglas de riesgo
-            for rule in self.risk_strategies:
-                is_valid, message = rule.validate(transaction, account, recent)
-                if not is_valid:
-                    # Rechazar transacción
-                    transaction.transition_to(TransactionStatus.REJECTED)
-                    self.transaction_repo.update_status(transaction.id, transaction.status)
-                    raise TransactionRejectedError(message)
-            
-            # 6. Calcular comisión (si aplica)
-            fee = self.fee_strategy.calculate_fee(amount)
+            is_valid, message = self.risk_plan.evaluate(transaction, account, recent)
+            if not is_valid:
+                # Rechazar transacción
+                transaction.transition_to(TransactionStatus.REJECTED)
+                self.transaction_repo.update_status(transaction.id, transaction.status)
+                raise TransactionRejectedError(message)
             
-            # 7. Aplicar el depósito (monto - comisión)
+            # 6. Aplicar el depósito (monto - comisión) con un UPDATE atómico en la BD
             account.apply_credit(amount - fee)
-            self.account_repo.update(account)
+            if not self.account_repo.credit(account.id, amount - fee):
+                raise AccountNotOperableError(
+                    f"No se puede operar: la cuenta {account.id} dejó de estar ACTIVE"
+                )
+            
+            # Piernas del libro mayor (incluida la comisión) en la misma unidad de trabajo
+            if self.ledger_repo is not None:
+                self.ledger_repo.add_entries(entries_for(transaction, fee))
             
-            # 8. Aprobar transacción
+            # 7. Aprobar transacción
             transaction.transition_to(TransactionStatus.APPROVED)
             self.transaction_repo.update_status(transaction.id, transaction.status)
             
@@ -79,7 +93,8 @@ class DepositService:
             
         except Exception as e:
             # Si algo falla, aseguramos que la transacción quede REJECTED
-            if transaction.status != TransactionStatus.REJECTED:
+            # (solo si sigue PENDING, para no ocultar el error original)
+            if transaction.status == TransactionStatus.PENDING:
                 transaction.transition_to(TransactionStatus.REJECTED)
                 self.transaction_repo.update_status(transaction.id, transaction.status)
             raise e
\ No newline at end of file
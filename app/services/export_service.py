@@ -0,0 +1,83 @@
+"""Exportación del historial completo de una cuenta en NDJSON o CSV.
+
+Las transacciones llegan del repositorio como un iterador (cursor del servidor en
+SQL) y se escriben en bloques de texto de `chunk_size` filas: solo se retiene el
+bloque en curso, así la memoria no depende del tamaño del historial.
+"""
+import csv
+import io
+import json
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator
+
+from app.domain.entities import Transaction
+from app.domain.exceptions import ValidationError
+from app.services.import_service import CSV, FORMATS
+
+DEFAULT_CHUNK_SIZE = 1000
+
+EXPORT_COLUMNS = (
+    "id",
+    "account_id",
+    "target_account_id",
+    "type",
+    "amount",
+    "currency",
+    "status",
+    "fee",
+    "created_at",
+)
+
+# Un solo encoder para todas las filas (json.dumps con argumentos crea uno por llamada)
+_encode = json.JSONEncoder(ensure_ascii=False).encode
+
+
+def check_format(fmt: str) -> str:
+    if fmt not in FORMATS:
+        raise ValidationError(f"Formato de exportación no soportado: {fmt} (usar {', '.join(FORMATS)})")
+    return fmt
+
+
+def export_record(transaction: Transaction) -> Dict[str, Any]:
+    """Fila de auditoría: montos como texto (sin pérdida de precisión) y fecha ISO 8601."""
+    metadata = transaction.metadata or {}
+    return {
+        "id": transaction.id,
+        "account_id": transaction.account_id,
+        "target_account_id": transaction.target_account_id,
+        "type": transaction.type.value,
+        "amount": str(transaction.amount),
+        "currency": transaction.currency,
+        "status": transaction.status.value,
+        "fee": metadata.get("applied_fee"),
+        "created_at": transaction.created_at.isoformat(),
+    }
+
+
+def _ndjson_chunks(records: Iterator[Dict[str, Any]], chunk_size: int) -> Iterator[str]:
+    while chunk := list(islice(records, chunk_size)):
+        yield "".join([_encode(r) + "\n" for r in chunk])
+
+
+def _csv_chunks(records: Iterator[Dict[str, Any]], chunk_size: int) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS, lineterminator="\n")
+    writer.writeheader()
+    while chunk := list(islice(records, chunk_size)):
+        writer.writerows(chunk)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        # Historial vacío: solo el encabezado
+        yield buffer.getvalue()
+
+
+def iter_export(transactions: Iterable[Transaction], fmt: str,
+                chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """Bloques de texto listos para enviar (NDJSON: un objeto por línea; CSV con encabezado)."""
+    records = map(export_record, transactions)
+    if check_format(fmt) == CSV:
+        return _csv_chunks(records, chunk_size)
+    return _ndjson_chunks(records, chunk_size)
+
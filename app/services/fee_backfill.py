@@ -0,0 +1,101 @@
+"""Completa `applied_fee` en depósitos y retiros anteriores a los estados de cuenta.
+
+Hasta los estados de cuenta solo las transferencias guardaban su comisión en el
+metadata; los depósitos y retiros aprobados antes no la tienen y el estado de
+cuenta de un mes que los incluye se rechaza (ver app/domain/statement.py).
+
+La comisión cobrada se recupera del libro mayor: es lo que debitan las piernas
+FEE de la transacción en la cuenta del cliente (sin piernas FEE, la comisión fue
+0). Las transacciones anteriores al libro mayor no tienen piernas y quedan sin
+completar: se informan en el reporte y sus meses se siguen rechazando. Tampoco
+se tocan las que ya pasaron al archivo en frío (los segmentos no se modifican).
+
+Los estados de cuenta ya guardados de las cuentas afectadas, desde el mes de su
+primera transacción incompleta, se borran: se vuelven a calcular al pedirlos.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, List, Tuple
+
+from sqlalchemy import bindparam, delete, select, update
+from sqlalchemy.orm import Session
+
+from app.domain.enums import TransactionStatus, TransactionType
+from app.domain.ledger import FEE
+from app.domain.statement import period_of
+from app.repositories.models import AccountStatementModel, LedgerEntryModel
+from app.repositories.row_mapper import TRANSACTIONS
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Dialectos donde el filtro "sin applied_fee" va en el WHERE (en el resto se filtra en Python)
+_JSON_PATH_DIALECTS = ("sqlite", "postgresql")
+
+_STATEMENTS = AccountStatementModel.__table__
+_LEDGER = LedgerEntryModel.__table__
+
+
+@dataclass
+class FeeBackfillReport:
+    updated: int
+    # Sin piernas en el libro mayor: la comisión no se puede reconstruir
+    unresolved: int
+    statements_deleted: int
+
+
+def backfill_applied_fees(session: Session, batch_size: int = DEFAULT_BATCH_SIZE) -> FeeBackfillReport:
+    c = TRANSACTIONS.c
+    stmt = (
+        select(c.id, c.account_id, c.created_at, c.metadata)
+        .where(c.type.in_([TransactionType.DEPOSIT, TransactionType.WITHDRAWAL]),
+               c.status == TransactionStatus.APPROVED)
+        .order_by(c.created_at, c.id)
+    )
+    if session.get_bind().dialect.name in _JSON_PATH_DIALECTS:
+        stmt = stmt.where(c.metadata["applied_fee"].as_string().is_(None))
+
+    updated = unresolved = 0
+    first_missing: Dict[str, datetime] = {}
+    # Por bloques desde un cursor del servidor: no se retiene el historial en memoria
+    for rows in session.execute(stmt.execution_options(yield_per=batch_size)).partitions():
+        batch = [row for row in rows if "applied_fee" not in (row.metadata or {})]
+        if not batch:
+            continue
+        legs = _ledger_fees(session, [row.id for row in batch])
+        changes = []
+        for row in batch:
+            first_missing.setdefault(row.account_id, row.created_at)
+            if row.id not in legs:
+                unresolved += 1
+                continue
+            fee = -legs[row.id].get((row.account_id, FEE), Decimal("0"))
+            changes.append({"tx_id": row.id, "new_metadata": {**(row.metadata or {}), "applied_fee": str(fee)}})
+        if changes:
+            session.execute(
+                update(TRANSACTIONS).where(c.id == bindparam("tx_id")).values(metadata=bindparam("new_metadata"))
+                .execution_options(synchronize_session=False),
+                changes,
+            )
+            updated += len(changes)
+
+    deleted = 0
+    for account_id, created_at in first_missing.items():
+        deleted += session.execute(
+            delete(_STATEMENTS).where(_STATEMENTS.c.account_id == account_id,
+                                      _STATEMENTS.c.period >= period_of(created_at))
+        ).rowcount
+    session.commit()
+    return FeeBackfillReport(updated=updated, unresolved=unresolved, statements_deleted=deleted)
+
+
+def _ledger_fees(session: Session, transaction_ids: List[str]) -> Dict[str, Dict[Tuple[str, str], Decimal]]:
+    """transaction_id -> {(cuenta, tipo de pierna): monto} de las transacciones con piernas."""
+    legs: Dict[str, Dict[Tuple[str, str], Decimal]] = {}
+    for transaction_id, account_id, kind, amount in session.execute(
+        select(_LEDGER.c.transaction_id, _LEDGER.c.account_id, _LEDGER.c.kind, _LEDGER.c.amount)
+        .where(_LEDGER.c.transaction_id.in_(transaction_ids))
+    ):
+        sums = legs.setdefault(transaction_id, {})
+        sums[(account_id, kind)] = sums.get((account_id, kind), Decimal("0")) + Decimal(amount)
+    return legs
@@ -0,0 +1,171 @@
+"""Importación masiva de clientes (y sus cuentas) desde CSV o NDJSON.
+
+El archivo se lee de forma incremental y se procesa por bloques: por bloque se
+hace una consulta IN para detectar emails ya registrados, un INSERT en lote de
+clientes, otro de cuentas y un commit. Solo se retiene el bloque en curso y una
+muestra acotada de filas rechazadas, así la memoria no crece con el archivo.
+"""
+import csv
+import json
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from sqlalchemy.exc import IntegrityError
+
+from app.domain.entities import Account, Customer
+from app.domain.exceptions import BankingError, ValidationError
+from app.repositories.base import AccountRepository, CustomerRepository, UnitOfWork
+
+CSV = "csv"
+NDJSON = "ndjson"
+FORMATS = (CSV, NDJSON)
+
+DEFAULT_CHUNK_SIZE = 1000
+# Filas rechazadas que se detallan en el reporte; el resto solo se cuenta
+MAX_REPORTED_REJECTIONS = 100
+
+# (número de línea en el archivo, fila cruda)
+Row = Tuple[int, Dict[str, Any]]
+
+
+@dataclass(slots=True)
+class RejectedRow:
+    line: int
+    email: Optional[str]
+    reason: str
+
+
+@dataclass(slots=True)
+class ImportReport:
+    processed: int = 0
+    customers_created: int = 0
+    accounts_created: int = 0
+    rejected_count: int = 0
+    rejected: List[RejectedRow] = field(default_factory=list)
+
+    def reject(self, line: int, email: Optional[str], reason: str) -> None:
+        self.rejected_count += 1
+        if len(self.rejected) < MAX_REPORTED_REJECTIONS:
+            self.rejected.append(RejectedRow(line=line, email=email, reason=reason))
+
+
+def iter_csv_rows(stream: TextIO) -> Iterator[Row]:
+    """Filas de un CSV con encabezado (name,email[,currency])."""
+    reader = csv.DictReader(stream)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def iter_ndjson_rows(stream: TextIO) -> Iterator[Row]:
+    """Un objeto JSON por línea; las líneas vacías se ignoran."""
+    for line_no, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield line_no, row if isinstance(row, dict) else {"_error": "JSON inválido"}
+
+
+def iter_rows(stream: TextIO, fmt: str) -> Iterator[Row]:
+    if fmt == CSV:
+        return iter_csv_rows(stream)
+    if fmt == NDJSON:
+        return iter_ndjson_rows(stream)
+    raise ValidationError(f"Formato de importación no soportado: {fmt} (usar {', '.join(FORMATS)})")
+
+
+class ImportService:
+    """Crea clientes en bloque con las mismas validaciones que CustomerService.
+
+    Un email repetido (ya registrado o repetido dentro del archivo) rechaza la
+    fila, igual que DuplicateEmailError en la creación individual. Con
+    with_accounts cada cliente importado recibe una cuenta en la moneda de la
+    fila (USD por defecto).
+    """
+
+    def __init__(
+        self,
+        customer_repo: CustomerRepository,
+        account_repo: AccountRepository,
+        uow: UnitOfWork,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        if chunk_size <= 0:
+            raise ValidationError("El tamaño de bloque debe ser mayor a cero")
+        self.customer_repo = customer_repo
+        self.account_repo = account_repo
+        self.uow = uow
+        self.chunk_size = chunk_size
+
+    def import_stream(self, stream: TextIO, fmt: str, with_accounts: bool = True) -> ImportReport:
+        return self.import_rows(iter_rows(stream, fmt), with_accounts)
+
+    def import_rows(self, rows: Iterable[Row], with_accounts: bool = True) -> ImportReport:
+        report = ImportReport()
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, self.chunk_size))
+            if not chunk:
+                return report
+            report.processed += len(chunk)
+            self._import_chunk(chunk, with_accounts, report)
+
+    def _import_chunk(self, chunk: List[Row], with_accounts: bool, report: ImportReport) -> None:
+        candidates: Dict[str, Tuple[int, Customer, Optional[Account]]] = {}
+        for line, row in chunk:
+            email = _clean(row.get("email")).lower() or None
+            try:
+                if "_error" in row:
+                    raise ValidationError(row["_error"])
+                customer, account = _build(row, email, with_accounts)
+            except BankingError as e:
+                report.reject(line, email, e.message)
+                continue
+            if customer.email in candidates:
+                report.reject(line, email, "Email repetido en el archivo")
+                continue
+            candidates[customer.email] = (line, customer, account)
+
+        self._reject_existing(candidates, report)
+        try:
+            self._insert(candidates, report)
+        except IntegrityError:
+            # Otro proceso pudo registrar alguno de estos emails entre la consulta y
+            # el INSERT (índice único): el bloque ya se revirtió, se filtra y reintenta
+            self._reject_existing(candidates, report)
+            self._insert(candidates, report)
+
+    def _reject_existing(self, candidates: Dict[str, Tuple[int, Customer, Optional[Account]]],
+                         report: ImportReport) -> None:
+        for email in self.customer_repo.find_existing_emails(candidates):
+            line, _, _ = candidates.pop(email)
+            report.reject(line, email, f"Ya existe un cliente con el email '{email}'")
+
+    def _insert(self, candidates: Dict[str, Tuple[int, Customer, Optional[Account]]],
+                report: ImportReport) -> None:
+        customers = [customer for _, customer, _ in candidates.values()]
+        accounts = [account for _, _, account in candidates.values() if account is not None]
+        with self.uow:
+            self.customer_repo.add_many(customers)
+            self.account_repo.add_many(accounts)
+            self.uow.commit()
+        report.customers_created += len(customers)
+        report.accounts_created += len(accounts)
+
+
+def _clean(value: Any) -> str:
+    return value.strip() if isinstance(value, str) else ""
+
+
+def _build(row: Dict[str, Any], email: Optional[str], with_accounts: bool) -> Tuple[Customer, Optional[Account]]:
+    name = _clean(row.get("name"))
+    if not email or "." not in email.split("@")[-1]:
+        raise ValidationError("Formato de correo electrónico inválido")
+    customer = Customer(name=name, email=email, active=True)
+    if not with_accounts:
+        return customer, None
+    currency = _clean(row.get("currency")).upper() or "USD"
+    return customer, Account(customer_id=customer.id, currency=currency)
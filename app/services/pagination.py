@@ -0,0 +1,46 @@
+"""Cursores opacos para la paginación keyset del historial de transacciones.
+
+El cursor codifica (created_at, id) de la última fila entregada; la siguiente
+página empieza justo después de esa fila con una búsqueda sobre el índice
+(account_id, created_at DESC, id DESC), sin recorrer las filas anteriores.
+"""
+import base64
+import binascii
+from datetime import datetime
+from typing import Optional, Tuple
+
+from app.domain.entities import Transaction
+from app.domain.exceptions import ValidationError
+
+_SEPARATOR = "|"
+
+
+def encode_cursor(transaction: Transaction) -> str:
+    raw = f"{transaction.created_at.isoformat()}{_SEPARATOR}{transaction.id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        created_at, transaction_id = raw.split(_SEPARATOR, 1)
+        return datetime.fromisoformat(created_at), transaction_id
+    except (ValueError, UnicodeError, binascii.Error):
+        raise ValidationError("Cursor de paginación inválido")
+
+
+def normalize_page(limit: int, offset: int, cursor: Optional[str] = None
+                   ) -> Tuple[int, int, Optional[Tuple[datetime, str]]]:
+    """(limit, offset, after) listos para list_page: corrige valores fuera de rango
+    y decodifica el cursor, que no se puede combinar con offset."""
+    if limit < 1:
+        limit = 10
+    if offset < 0:
+        offset = 0
+    if cursor is None:
+        return limit, offset, None
+    if offset:
+        raise ValidationError("No se puede combinar cursor con offset")
+    return limit, 0, decode_cursor(cursor)
+
@@ -0,0 +1,259 @@
+"""Re-evaluación offline de las reglas de riesgo sobre todo el historial.
+
+Sirve para ver qué habrían rechazado MaxAmountRule, VelocityRule y
+DailyLimitRule con otros umbrales. Cada transacción se juzga como lo haría
+`rule.validate` en su momento: `now` es su created_at y la actividad reciente
+son las transacciones anteriores de la misma cuenta (orden created_at, id). Se
+juzga contra el historial real, sin encadenar: un rechazo nuevo no descuenta
+esa transacción de las ventanas siguientes.
+
+El historial se lee por bloques de cuentas completas ordenados por (cuenta,
+created_at, id) y se pasa a arreglos de NumPy. Con archivo en frío, cada cuenta
+empieza por sus filas archivadas y sigue con las de la tabla:
+
+- montos como enteros en diezmilésimas (Numeric(20, 4)): comparaciones y sumas exactas,
+- instantes en microsegundos: la ventana de cada fila empieza en el primer índice
+  de su cuenta con created_at >= inicio de ventana (searchsorted sobre una clave
+  compuesta cuenta/instante), así conteos y sumas salen de restas de índices y de
+  una suma acumulada, sin recorrer ventanas en Python.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import ROUND_FLOOR, Decimal
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.domain.entities import Transaction
+from app.domain.enums import TransactionStatus
+from app.domain.exceptions import ValidationError
+from app.infra.archive import TransactionArchive
+from app.repositories.models import TransactionModel
+from app.services.risk_strategies import DailyLimitRule, MaxAmountRule, RiskStrategy, VelocityRule
+
+DEFAULT_CHUNK_SIZE = 200_000
+# Transacciones rechazadas que se detallan en el reporte; el resto solo se cuenta
+MAX_REPORTED_REJECTIONS = 100
+
+# Montos en diezmilésimas: la escala de la columna amount
+AMOUNT_SCALE = 10_000
+_MICROS_PER_DAY = 86_400 * 1_000_000
+_EPOCH = datetime(1970, 1, 1)
+
+APPROVED_ONLY = (TransactionStatus.APPROVED,)
+
+RULE_NAMES = {MaxAmountRule: "max_amount", VelocityRule: "velocity", DailyLimitRule: "daily_limit"}
+
+# (account_id, id, created_at, amount)
+HistoryRow = Tuple[str, str, datetime, Decimal]
+
+
+def _to_units(value: Decimal) -> int:
+    """Umbral en diezmilésimas, redondeado hacia abajo: para un entero a, a > x <=> a > floor(x)."""
+    return int((Decimal(value) * AMOUNT_SCALE).to_integral_value(rounding=ROUND_FLOOR))
+
+
+def _amount_units(amount: Decimal) -> int:
+    units = Decimal(amount).scaleb(4)
+    if units != units.to_integral_value():
+        raise ValidationError(f"Monto con más de 4 decimales: {amount}")
+    return int(units)
+
+
+def _to_micros(at: datetime) -> int:
+    delta = at - _EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+@dataclass
+class HistoryChunk:
+    """Bloque de cuentas completas, ordenado por (cuenta, created_at, id)."""
+    account_ids: np.ndarray      # object
+    transaction_ids: np.ndarray  # object
+    micros: np.ndarray           # int64, microsegundos desde 1970-01-01
+    amounts: np.ndarray          # int64, diezmilésimas
+
+    def __len__(self) -> int:
+        return len(self.micros)
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[HistoryRow]) -> "HistoryChunk":
+        """Las filas deben venir ordenadas por (account_id, created_at, id)."""
+        return cls(
+            account_ids=np.array([r[0] for r in rows], dtype=object),
+            transaction_ids=np.array([r[1] for r in rows], dtype=object),
+            micros=np.fromiter((_to_micros(r[2]) for r in rows), dtype=np.int64, count=len(rows)),
+            amounts=np.fromiter((_amount_units(r[3]) for r in rows), dtype=np.int64, count=len(rows)),
+        )
+
+    @classmethod
+    def from_transactions(cls, transactions: Iterable[Transaction]) -> "HistoryChunk":
+        rows = sorted(((t.account_id, t.id, t.created_at, t.amount) for t in transactions),
+                      key=lambda r: (r[0], r[2], r[1]))
+        return cls.from_rows(rows)
+
+
+class _Windows:
+    """Índices para contar/sumar, por fila, las filas previas de su cuenta desde un instante."""
+
+    def __init__(self, chunk: HistoryChunk) -> None:
+        n = len(chunk)
+        # Código de cuenta creciente (las filas vienen agrupadas por cuenta)
+        changes = np.empty(n, dtype=bool)
+        changes[:1] = False
+        changes[1:] = chunk.account_ids[1:] != chunk.account_ids[:-1]
+        self.accounts = np.cumsum(changes, dtype=np.int64)
+        # Instantes comprimidos a su rango: cuenta * (rangos + 1) + rango cabe en int64
+        self.instants, ranks = np.unique(chunk.micros, return_inverse=True)
+        self.stride = len(self.instants) + 1
+        self.keys = self.accounts * self.stride + ranks
+        self.rows = np.arange(n, dtype=np.int64)
+        # cumsum[i] = suma de los montos de las filas [0, i)
+        self.cumsum = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(chunk.amounts, out=self.cumsum[1:])
+
+    def first_since(self, since: np.ndarray) -> np.ndarray:
+        """Primer índice de la cuenta de cada fila con created_at >= since (since <= su instante)."""
+        query = self.accounts * self.stride + np.searchsorted(self.instants, since, side="left")
+        return np.searchsorted(self.keys, query, side="left")
+
+    def count_since(self, since: np.ndarray) -> np.ndarray:
+        return self.rows - self.first_since(since)
+
+    def sum_since(self, since: np.ndarray) -> np.ndarray:
+        return self.cumsum[:-1] - self.cumsum[self.first_since(since)]
+
+
+def _check_bounds(chunk: HistoryChunk) -> None:
+    if len(chunk) and (chunk.amounts.min() < 0 or float(chunk.amounts.sum(dtype=np.float64)) >= 2 ** 62):
+        raise ValidationError("Montos fuera de rango para el cálculo exacto en enteros")
+
+
+def score_chunk(chunk: HistoryChunk, rules: Sequence[RiskStrategy]) -> Dict[str, np.ndarray]:
+    """Veredicto por regla y por fila: True = la regla la habría rechazado."""
+    _check_bounds(chunk)
+    windows = _Windows(chunk) if len(chunk) else None
+    verdicts: Dict[str, np.ndarray] = {}
+    for rule in rules:
+        name = _rule_name(rule)
+        if not len(chunk):
+            verdicts[name] = np.zeros(0, dtype=bool)
+        elif isinstance(rule, MaxAmountRule):
+            verdicts[name] = chunk.amounts > _to_units(rule.max_amount)
+        elif isinstance(rule, VelocityRule):
+            since = chunk.micros - rule.time_window_minutes * 60 * 1_000_000
+            verdicts[name] = windows.count_since(since) >= rule.max_transactions
+        else:
+            day_start = chunk.micros - chunk.micros % _MICROS_PER_DAY
+            total_today = windows.sum_since(day_start) + chunk.amounts
+            verdicts[name] = total_today > _to_units(rule.daily_limit)
+    return verdicts
+
+
+def _rule_name(rule: RiskStrategy) -> str:
+    name = RULE_NAMES.get(type(rule))
+    if name is None:
+        raise ValidationError(f"La regla {type(rule).__name__} no tiene evaluación vectorizada")
+    return name
+
+
+def iter_history_chunks(
+    session: Session,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    statuses: Optional[Sequence[TransactionStatus]] = APPROVED_ONLY,
+    archive: Optional[TransactionArchive] = None,
+) -> Iterator[HistoryChunk]:
+    """Historial por bloques de ~chunk_size filas que nunca parten una cuenta.
+
+    Por defecto solo APPROVED, lo mismo que cuentan los contadores de riesgo
+    (statuses=None: todas). Con `archive`, lo anterior al watermark sale de los
+    segmentos y se ignoran las filas de la tabla anteriores a él, como en el
+    resto de las lecturas.
+    """
+    if chunk_size <= 0:
+        raise ValidationError("El tamaño de bloque debe ser mayor a cero")
+    rows: List[HistoryRow] = []
+    for account_rows in _iter_accounts(session, chunk_size, statuses, archive):
+        if len(rows) >= chunk_size:
+            yield HistoryChunk.from_rows(rows)
+            rows = []
+        rows.extend(account_rows)
+    if rows:
+        yield HistoryChunk.from_rows(rows)
+
+
+def _iter_accounts(session: Session, chunk_size: int, statuses: Optional[Sequence[TransactionStatus]],
+                   archive: Optional[TransactionArchive]) -> Iterator[List[HistoryRow]]:
+    """Filas de cada cuenta en orden (created_at, id): primero las archivadas, después las de la tabla."""
+    watermark = archive.watermark if archive is not None else None
+    wanted = set(statuses) if statuses is not None else None
+
+    def archived(account_id: str) -> List[HistoryRow]:
+        if watermark is None:
+            return []
+        return [(t.account_id, t.id, t.created_at, t.amount) for t in archive.iter_account(account_id)
+                if wanted is None or t.status in wanted]
+
+    t = TransactionModel.__table__.c
+    stmt = select(t.account_id, t.id, t.created_at, t.amount).order_by(t.account_id, t.created_at, t.id)
+    if statuses is not None:
+        stmt = stmt.where(t.status.in_(list(statuses)))
+    if watermark is not None:
+        stmt = stmt.where(t.created_at >= watermark)
+    seen = set()
+    current: Optional[str] = None
+    rows: List[HistoryRow] = []
+    for row in session.execute(stmt.execution_options(yield_per=min(chunk_size, 10_000))):
+        if row[0] != current:
+            if rows:
+                yield rows
+            current = row[0]
+            seen.add(current)
+            rows = archived(current)
+        rows.append(tuple(row))
+    if rows:
+        yield rows
+    # Cuentas que solo tienen historial archivado
+    if watermark is not None:
+        for account_id in archive.account_ids():
+            if account_id not in seen:
+                rows = archived(account_id)
+                if rows:
+                    yield rows
+
+
+@dataclass(slots=True)
+class RejectedTransaction:
+    transaction_id: str
+    account_id: str
+    rules: List[str]
+
+
+@dataclass(slots=True)
+class BacktestReport:
+    scored: int = 0
+    rejected_count: int = 0
+    rejected_by_rule: Dict[str, int] = field(default_factory=dict)
+    rejected: List[RejectedTransaction] = field(default_factory=list)
+
+
+def backtest(chunks: Iterable[HistoryChunk], rules: Sequence[RiskStrategy]) -> BacktestReport:
+    report = BacktestReport(rejected_by_rule={_rule_name(rule): 0 for rule in rules})
+    for chunk in chunks:
+        verdicts = score_chunk(chunk, rules)
+        report.scored += len(chunk)
+        any_rejected = np.zeros(len(chunk), dtype=bool)
+        for name, rejected in verdicts.items():
+            report.rejected_by_rule[name] += int(rejected.sum())
+            any_rejected |= rejected
+        report.rejected_count += int(any_rejected.sum())
+        room = MAX_REPORTED_REJECTIONS - len(report.rejected)
+        for i in np.flatnonzero(any_rejected)[:max(room, 0)]:
+            report.rejected.append(RejectedTransaction(
+                transaction_id=chunk.transaction_ids[i],
+                account_id=chunk.account_ids[i],
+                rules=[name for name, rejected in verdicts.items() if rejected[i]],
+            ))
+    return report
@@ -0,0 +1,95 @@
+"""Evaluación de las reglas de riesgo activas en una sola pasada.
+
+RiskPlan se compila una vez a partir de la lista de reglas (ConfigurationService
+lo guarda por versión de configuración) y por transacción:
+
+1. toma un único `now` para todas las reglas,
+2. calcula las ventanas distintas que piden las reglas agregadas (velocidad,
+   límite diario) y sus conteos/sumas en una sola pasada sobre la actividad
+   (la suma solo para las ventanas de reglas que la usan),
+3. evalúa las reglas en el orden configurado y devuelve el primer rechazo,
+   con el mismo mensaje que daría `rule.validate`.
+
+`minute_horizon` indica cuántos minutos de buckets tiene que leer get_activity
+para cubrir la ventana más larga de las reglas.
+
+Las reglas que no son AggregateRule se evalúan con su propio `validate`.
+"""
+import math
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+from app.domain.activity import MINUTE_HORIZON, as_activity, day_bucket
+from app.domain.entities import Account, Transaction
+from app.services.risk_strategies import AggregateRule, RecentActivity, RiskStrategy
+
+_VALIDATE, _CHECK, _WINDOWED = range(3)
+
+# Instante de referencia para medir la ventana de cada regla
+_REFERENCE_NOW = datetime(2000, 1, 1, 12, 0)
+
+
+def _window_minutes(rule: AggregateRule) -> int:
+    """Minutos de buckets por minuto que necesita la ventana de la regla (0 si la
+    responde el bucket diario: ventanas que empiezan a medianoche)."""
+    since = rule.window_start(_REFERENCE_NOW)
+    if since is None or since == day_bucket(_REFERENCE_NOW):
+        return 0
+    return math.ceil((_REFERENCE_NOW - since) / timedelta(minutes=1))
+
+
+class RiskPlan:
+    def __init__(self, rules: Iterable[RiskStrategy]) -> None:
+        self.rules: List[RiskStrategy] = list(rules)
+        # Reglas con ventana de actividad, en orden; el resto no necesita agregados
+        self._windowed: List[AggregateRule] = [
+            rule for rule in self.rules
+            if isinstance(rule, AggregateRule) and type(rule).window_start is not AggregateRule.window_start
+        ]
+        self._needs_total = [rule.needs_total for rule in self._windowed]
+        self.minute_horizon = max([MINUTE_HORIZON, *map(_window_minutes, self._windowed)])
+        positions = iter(range(len(self._windowed)))
+        self._steps = []
+        for rule in self.rules:
+            if not isinstance(rule, AggregateRule):
+                self._steps.append((rule, _VALIDATE, None))
+            elif type(rule).window_start is AggregateRule.window_start:
+                self._steps.append((rule, _CHECK, None))
+            else:
+                self._steps.append((rule, _WINDOWED, next(positions)))
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def evaluate(
+        self,
+        transaction: Transaction,
+        account: Account,
+        recent: RecentActivity,
+        now: Optional[datetime] = None,
+    ) -> Tuple[bool, str]:
+        totals: List[Tuple[int, Optional[Decimal]]] = []
+        if self._windowed:
+            now = now or datetime.utcnow()
+            starts = [rule.window_start(now) for rule in self._windowed]
+            sums_for = [since for since, needs_total in zip(starts, self._needs_total) if needs_total]
+            totals = as_activity(recent).totals_since(starts, sums_for)
+
+        for rule, kind, position in self._steps:
+            if kind == _WINDOWED:
+                is_valid, message = rule.check(transaction, *totals[position])
+            elif kind == _CHECK:
+                is_valid, message = rule.check(transaction, 0, None)
+            else:
+                is_valid, message = rule.validate(transaction, account, recent)
+            if not is_valid:
+                return False, message
+        return True, ""
+
+
+def as_risk_plan(rules: Union[RiskPlan, Sequence[RiskStrategy]]) -> RiskPlan:
+    """Acepta un plan ya compilado o la lista de reglas de antes."""
+    if isinstance(rules, RiskPlan):
+        return rules
+    return RiskPlan(rules)
@@ -1,10 +1,14 @@
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import List, Tuple
+from typing import Iterable, Optional, Tuple, Union
 
+from app.domain.activity import AccountActivity, as_activity
 from app.domain.entities import Account, Transaction
 
+# Las reglas aceptan contadores agregados o la lista de transacciones recientes
+RecentActivity = Union[AccountActivity, Iterable[Transaction]]
+
 
 class RiskStrategy(ABC):
     """Interfaz para estrategias de prevención de fraude.
@@ -17,12 +21,44 @@ class RiskStrategy(ABC):
         self, 
         transaction: Transaction, 
         account: Account, 
-        recent_transactions: List[Transaction]
+        recent_transactions: RecentActivity
     ) -> Tuple[bool, str]:
         pass
 
 
-class MaxAmountRule(RiskStrategy):
+class AggregateRule(RiskStrategy):
+    """Regla que decide con el conteo y la suma de la actividad desde un instante.
+
+    Separar la ventana (`window_start`) de la decisión (`check`) permite a
+    RiskPlan calcular los agregados de todas las reglas en una sola pasada.
+    """
+
+    # False si check() solo usa el conteo: la suma de la ventana no se calcula
+    needs_total = True
+
+    def window_start(self, now: datetime) -> Optional[datetime]:
+        """Inicio de la ventana de actividad que necesita la regla (None: ninguna)."""
+        return None
+
+    @abstractmethod
+    def check(self, transaction: Transaction, count: int, total: Optional[Decimal]) -> Tuple[bool, str]:
+        pass
+
+    def validate(
+        self, 
+        transaction: Transaction, 
+        account: Account, 
+        recent_transactions: RecentActivity
+    ) -> Tuple[bool, str]:
+        since = self.window_start(datetime.utcnow())
+        if since is None:
+            return self.check(transaction, 0, None)
+        sums_for = (since,) if self.needs_total else ()
+        count, total = as_activity(recent_transactions).totals_since([since], sums_for)[0]
+        return self.check(transaction, count, total)
+
+
+class MaxAmountRule(AggregateRule):
     """Regla de monto máximo.
     
     Rechaza transacciones con monto mayor a $1000.
@@ -31,18 +67,13 @@ class MaxAmountRule(RiskStrategy):
     def __init__(self, max_amount: Decimal = Decimal("1000")):
         self.max_amount = max_amount
     
-    def validate(
-        self, 
-        transaction: Transaction, 
-        account: Account, 
-        recent_transactions: List[Transaction]
-    ) -> Tuple[bool, str]:
+    def check(self, transaction: Transaction, count: int, total: Optional[Decimal]) -> Tuple[bool, str]:
         if transaction.amount > self.max_amount:
             return False, f"Monto excede el límite de ${self.max_amount}"
         return True, ""
 
 
-class VelocityRule(RiskStrategy):
+class VelocityRule(AggregateRule):
     """Regla de velocidad.
     
     Rechaza si hay más de 5 transacciones en los últimos 10 minutos.
@@ -52,30 +83,19 @@ class VelocityRule(RiskStrategy):
         self.max_transactions = max_transactions
         self.time_window_minutes = time_window_minutes
     
-    def validate(
-        self, 
-        transaction: Transaction, 
-        account: Account, 
-        recent_transactions: List[Transaction]
-    ) -> Tuple[bool, str]:
-        # Calcular el límite de tiempo
-        now = datetime.utcnow()
-        time_limit = now - timedelta(minutes=self.time_window_minutes)
-        
-        # Filtrar transacciones en la ventana de tiempo
-        transactions_in_window = [
-            t for t in recent_transactions 
-            if t.created_at >= time_limit
-        ]
-        
-        # Verificar si excede el límite
-        if len(transactions_in_window) >= self.max_transactions:
-            return False, f"Demasiadas transacciones ({len(transactions_in_window)}) en los últimos {self.time_window_minutes} minutos"
-        
+    needs_total = False
+
+    def window_start(self, now: datetime) -> Optional[datetime]:
+        return now - timedelta(minutes=self.time_window_minutes)
+
+    def check(self, transaction: Transaction, count: int, total: Optional[Decimal]) -> Tuple[bool, str]:
+        # count: transacciones en la ventana de tiempo
+        if count >= self.max_transactions:
+            return False, f"Demasiadas transacciones ({count}) en los últimos {self.time_window_minutes} minutos"
         return True, ""
 
 
-class DailyLimitRule(RiskStrategy):
+class DailyLimitRule(AggregateRule):
     """Regla de límite diario.
     
     Rechaza si la suma del día supera $2000.
@@ -84,27 +104,13 @@ class DailyLimitRule(RiskStrategy):
     def __init__(self, daily_limit: Decimal = Decimal("2000")):
         self.daily_limit = daily_limit
     
-    def validate(
-        self, 
-        transaction: Transaction, 
-        account: Account, 
-        recent_transactions: List[Transaction]
-    ) -> Tuple[bool, str]:
-        # Calcular el inicio del día actual
-        now = datetime.utcnow()
-        start_of_day = datetime(now.year, now.month, now.day)
-        
-        # Filtrar transacciones de hoy
-        today_transactions = [
-            t for t in recent_transactions 
-            if t.created_at >= start_of_day
-        ]
-        
-        # Sumar montos de transacciones de hoy (incluyendo la actual)
-        total_today = sum(t.amount for t in today_transactions) + transaction.amount
-        
-        # Verificar si excede el límite diario
+    def window_start(self, now: datetime) -> Optional[datetime]:
+        # Inicio del día actual
+        return datetime(now.year, now.month, now.day)
+
+    def check(self, transaction: Transaction, count: int, total: Optional[Decimal]) -> Tuple[bool, str]:
+        # Suma de transacciones de hoy (incluyendo la actual)
+        total_today = total + transaction.amount
         if total_today > self.daily_limit:
             return False, f"Límite diario de ${self.daily_limit} excedido (total: ${total_today})"
-        
-        return True, ""
\ No newline at end of file
+        return True, ""
@@ -0,0 +1,125 @@
+"""Estados de cuenta mensuales materializados en account_statements.
+
+- Un mes cerrado se calcula una sola vez y después se sirve desde la tabla.
+- El mes en curso se guarda con un corte `computed_through`: cada consulta suma
+  solo las transacciones posteriores al corte y lo avanza hasta ahora menos
+  SETTLE_DELAY (una operación que todavía no hizo commit no puede quedar antes
+  del corte). Lo que queda entre el corte y ahora se suma al vuelo sin guardarse.
+- El saldo inicial es el saldo final del mes anterior. Si faltan meses previos
+  se materializan en orden desde el primer movimiento de la cuenta (saldo 0).
+- Si esa cadena pasa por depósitos o retiros sin `applied_fee` (anteriores a los
+  estados de cuenta y sin libro mayor para completarlos), el saldo inicial se
+  ancla en el saldo actual de la cuenta menos el efecto de todo lo aprobado desde
+  el inicio del mes. Solo se rechazan los meses que contienen esos movimientos.
+"""
+from copy import copy
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Optional
+
+from app.domain.exceptions import InfrastructureError, MissingFeeError, NotFoundError, ValidationError
+from app.domain.statement import ZERO, MonthlyStatement, month_start, next_month, period_of, previous_month
+from app.repositories.base import AccountRepository, StatementRepository, TransactionRepository
+
+SETTLE_DELAY = timedelta(seconds=60)
+# Lecturas del ancla: si el saldo cambia mientras se suman los movimientos, se repite
+ANCHOR_ATTEMPTS = 3
+
+
+class StatementService:
+    def __init__(self, statements: StatementRepository, transactions: TransactionRepository,
+                 accounts: AccountRepository, settle_delay: timedelta = SETTLE_DELAY) -> None:
+        self.statements = statements
+        self.transactions = transactions
+        self.accounts = accounts
+        self.settle_delay = settle_delay
+
+    def monthly(self, account_id: str, year: int, month: int, now: Optional[datetime] = None) -> MonthlyStatement:
+        if not 1 <= month <= 12:
+            raise ValidationError("El mes debe estar entre 1 y 12")
+        now = now or datetime.utcnow()
+        period = date(year, month, 1)
+        if month_start(period) > now:
+            raise ValidationError(f"El período {year}-{month:02d} todavía no empezó")
+        if self.accounts.get_by_id(account_id) is None:
+            raise NotFoundError("Cuenta no encontrada")
+        return self._statement(account_id, period, now)
+
+    def _statement(self, account_id: str, period: date, now: datetime) -> MonthlyStatement:
+        settled = now - self.settle_delay
+        if settled < month_start(period):
+            # Primeros segundos del mes: el anterior aún no cierra, todo se calcula al vuelo
+            try:
+                opening = self._statement(account_id, previous_month(period), now).closing_balance
+            except MissingFeeError:
+                opening = self._anchored_opening_balance(account_id, period)
+            statement = MonthlyStatement(account_id, period, opening, month_start(period))
+        else:
+            statement = self._materialize(account_id, period, settled)
+            if statement.closed:
+                return statement
+            statement = copy(statement)
+        self._fold(statement, min(now, statement.period_end))
+        return statement
+
+    def _materialize(self, account_id: str, period: date, settled: datetime) -> MonthlyStatement:
+        """Estado guardado de `period`, al día hasta `settled` (crea los meses previos que falten)."""
+        statement = self.statements.get(account_id, period)
+        if statement is None:
+            statement = MonthlyStatement(account_id, period, self._opening_balance(account_id, period, settled),
+                                         month_start(period))
+        elif statement.closed:
+            return statement
+        self._fold(statement, min(settled, statement.period_end))
+        statement.closed = statement.computed_through >= statement.period_end
+        self.statements.save(statement)
+        return statement
+
+    def _opening_balance(self, account_id: str, period: date, settled: datetime) -> Decimal:
+        try:
+            return self._chained_opening_balance(account_id, period, settled)
+        except MissingFeeError:
+            # Algún mes anterior tiene movimientos sin comisión registrada: no sirve de cadena
+            return self._anchored_opening_balance(account_id, period)
+
+    def _chained_opening_balance(self, account_id: str, period: date, settled: datetime) -> Decimal:
+        previous = self.statements.latest_before(account_id, period)
+        if previous is not None:
+            start = previous.period if not previous.closed else next_month(previous.period)
+            closing = previous.closing_balance
+        else:
+            first = self.transactions.first_activity(account_id)
+            if first is None or period_of(first) >= period:
+                return ZERO
+            start, closing = period_of(first), ZERO
+        while start < period:
+            closing = self._materialize(account_id, start, settled).closing_balance
+            start = next_month(start)
+        return closing
+
+    def _anchored_opening_balance(self, account_id: str, period: date) -> Decimal:
+        """Saldo actual menos el efecto de lo aprobado desde el inicio de `period`.
+
+        Es exacto porque todo ese tramo registra su comisión; si no, MissingFeeError.
+        """
+        for _ in range(ANCHOR_ATTEMPTS):
+            balance = self._balance(account_id)
+            tail = MonthlyStatement(account_id, period, ZERO, month_start(period))
+            for transaction in self.transactions.iter_movements(account_id, tail.computed_through, datetime.max):
+                tail.add(transaction)
+            if self._balance(account_id) == balance:
+                return balance - tail.closing_balance
+        raise InfrastructureError("El saldo de la cuenta cambió durante el cálculo del estado de cuenta")
+
+    def _balance(self, account_id: str) -> Decimal:
+        account = self.accounts.get_by_id(account_id)
+        if account is None:
+            raise NotFoundError("Cuenta no encontrada")
+        return account.balance
+
+    def _fold(self, statement: MonthlyStatement, until: datetime) -> None:
+        if until <= statement.computed_through:
+            return
+        for transaction in self.transactions.iter_movements(statement.account_id, statement.computed_through, until):
+            statement.add(transaction)
+        statement.computed_through = until
@@ -1,16 +1,20 @@
 from decimal import Decimal
+from typing import Optional, Union
 from uuid import UUID
 
 from app.domain.entities import Account, Transaction
 from app.domain.enums import TransactionStatus, TransactionType
 from app.domain.exceptions import (
+    AccountNotOperableError,
     InsufficientFundsError,
     TransactionRejectedError,
     ValidationError,
 )
 from app.domain.builders import TransferBuilder  # Reemplazamos la Factory por el Builder
-from app.repositories.base import AccountRepository, TransactionRepository
+from app.domain.ledger import entries_for
+from app.repositories.base import AccountRepository, LedgerRepository, TransactionRepository
 from app.services.fee_strategies import FeeStrategy
+from app.services.risk_engine import RiskPlan, as_risk_plan
 from app.services.risk_strategies import RiskStrategy
 
 class TransferService:
@@ -24,12 +28,16 @@ class TransferService:
         account_repo: AccountRepository,
         transaction_repo: TransactionRepository,
         fee_strategy: FeeStrategy,
-        risk_strategies: list[RiskStrategy],
+        risk_strategies: Union[RiskPlan, list[RiskStrategy]],
+        ledger_repo: Optional[LedgerRepository] = None,
     ):
         self.account_repo = account_repo
         self.transaction_repo = transaction_repo
         self.fee_strategy = fee_strategy
-        self.risk_strategies = risk_strategies
+        # Las reglas se evalúan compiladas en un RiskPlan (una pasada por transacción)
+        self.risk_plan = as_risk_plan(risk_strategies)
+        self.risk_strategies = self.risk_plan.rules
+        self.ledger_repo = ledger_repo
     
     def execute(
         self, 
@@ -45,12 +53,15 @@ class TransferService:
         if from_account_id == to_account_id:
             raise ValidationError("La cuenta origen y destino no pueden ser la misma")
         
-        # 2. Obtener ambas cuentas y verificar operabilidad
-        from_account = self.account_repo.get_by_id(str(from_account_id))
+        # 2. Obtener y bloquear ambas cuentas (siempre en orden de id, así dos
+        # transferencias cruzadas A->B y B->A no se bloquean mutuamente) y
+        # verificar operabilidad
+        accounts = self.account_repo.lock_many([str(from_account_id), str(to_account_id)])
+        from_account = accounts.get(str(from_account_id))
         if not from_account:
             raise ValidationError(f"Cuenta origen {from_account_id} no encontrada")
         
-        to_account = self.account_repo.get_by_id(str(to_account_id))
+        to_account = accounts.get(str(to_account_id))
         if not to_account:
             raise ValidationError(f"Cuenta destino {to_account_id} no encontrada")
         
@@ -67,8 +78,8 @@ class TransferService:
                 f"Requerido: {total_to_debit} (monto: {amount} + comisión: {fee})"
             )
         
-        # 4. Obtener transacciones recientes para riesgo
-        recent = self.transaction_repo.list_recent(str(from_account_id), minutes=60)
+        # 4. Obtener la actividad reciente (contadores agregados) para riesgo
+        recent = self.transaction_repo.get_activity(str(from_account_id), horizon_minutes=self.risk_plan.minute_horizon)
         
         # 5. Evaluar Riesgo ANTES de construir (usamos un objeto temporal ligero)
         temp_tx = Transaction(
@@ -79,15 +90,7 @@ class TransferService:
             currency="USD"
         )
         
-        all_valid = True
-        rejection_message = ""
-        
-        for rule in self.risk_strategies:
-            is_valid, message = rule.validate(temp_tx, from_account, recent)
-            if not is_valid:
-                all_valid = False
-                rejection_message = message
-                break
+        all_valid, rejection_message = self.risk_plan.evaluate(temp_tx, from_account, recent)
         
         # 6. Crear la transacción REAL usando ÚNICAMENTE el Builder
         builder = TransferBuilder() \
@@ -112,12 +115,26 @@ class TransferService:
             raise TransactionRejectedError(rejection_message)
             
         try:
-            # 8. Aplicar débitos y créditos (atómico)
+            # 8. Aplicar débitos y créditos con UPDATE condicionales (sin read-modify-write)
             from_account.apply_debit(total_to_debit)
-            self.account_repo.update(from_account)
+            if not self.account_repo.debit(from_account.id, total_to_debit):
+                raise InsufficientFundsError(
+                    f"Fondos insuficientes en cuenta origen: el saldo cambió durante la operación "
+                    f"(requerido: {total_to_debit})"
+                )
             
             to_account.apply_credit(amount)
-            self.account_repo.update(to_account)
+            if not self.account_repo.credit(to_account.id, amount):
+                # Revertir el débito antes de rechazar: la fila origen sigue bloqueada
+                # por nuestro propio UPDATE, así que este crédito no puede fallar
+                self.account_repo.credit(from_account.id, total_to_debit)
+                raise AccountNotOperableError(
+                    f"No se puede operar: la cuenta destino {to_account.id} dejó de estar ACTIVE"
+                )
+            
+            # Piernas del libro mayor (incluida la comisión) en la misma unidad de trabajo
+            if self.ledger_repo is not None:
+                self.ledger_repo.add_entries(entries_for(transaction, fee))
             
             # 9. Aprobar transacción final si no hubo errores matemáticos
             transaction.transition_to(TransactionStatus.APPROVED)
@@ -127,6 +144,8 @@ class TransferService:
             
         except Exception as e:
             # Si SQLAlchemy o la lógica fallan, la transacción queda rechazada
-            transaction.transition_to(TransactionStatus.REJECTED)
-            self.transaction_repo.update_status(transaction.id, transaction.status)
+            # (solo si sigue PENDING, para no ocultar el error original)
+            if transaction.status == TransactionStatus.PENDING:
+                transaction.transition_to(TransactionStatus.REJECTED)
+                self.transaction_repo.update_status(transaction.id, transaction.status)
             raise e
\ No newline at end of file
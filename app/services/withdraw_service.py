@@ -1,4 +1,5 @@
 from decimal import Decimal
+from typing import Optional, Union
 from uuid import UUID
 
 from app.domain.entities import Account, Transaction
@@ -9,8 +10,10 @@ from app.domain.exceptions import (
     ValidationError,
 )
 from app.domain.factories import TransactionFactory
-from app.repositories.base import AccountRepository, TransactionRepository
+from app.domain.ledger import entries_for
+from app.repositories.base import AccountRepository, LedgerRepository, TransactionRepository
 from app.services.fee_strategies import FeeStrategy
+from app.services.risk_engine import RiskPlan, as_risk_plan
 from app.services.risk_strategies import RiskStrategy
 
 
@@ -25,12 +28,16 @@ class WithdrawService:
         account_repo: AccountRepository,
         transaction_repo: TransactionRepository,
         fee_strategy: FeeStrategy,
-        risk_strategies: list[RiskStrategy],
+        risk_strategies: Union[RiskPlan, list[RiskStrategy]],
+        ledger_repo: Optional[LedgerRepository] = None,
     ):
         self.account_repo = account_repo
         self.transaction_repo = transaction_repo
         self.fee_strategy = fee_strategy
-        self.risk_strategies = risk_strategies
+        # Las reglas se evalúan compiladas en un RiskPlan (una pasada por transacción)
+        self.risk_plan = as_risk_plan(risk_strategies)
+        self.risk_strategies = self.risk_plan.rules
+        self.ledger_repo = ledger_repo
     
     def execute(self, account_id: UUID, amount: Decimal) -> Transaction:
       
@@ -46,13 +53,15 @@ class WithdrawService:
         # 2. Verificar que la cuenta pueda operar
         account.check_can_operate()
         
-        # 3. Crear transacción (PENDING)
+        # 3. Calcular comisión PRIMERO (para saber el total a debitar) y crear la
+        #    transacción (PENDING) con ella en metadata applied_fee, como las transferencias
+        fee = self.fee_strategy.calculate_fee(amount)
         transaction = TransactionFactory.get_creator(TransactionType.WITHDRAWAL).create(amount, account_id)
+        transaction.metadata = {"applied_fee": str(fee)}
         self.transaction_repo.add(transaction)
         
         try:
-            # 4. Calcular comisión PRIMERO (para saber el total a debitar)
-            fee = self.fee_strategy.calculate_fee(amount)
+            # 4. Total a debitar (monto + comisión)
             total_to_debit = amount + fee
             
             # 5. Verificar fondos suficientes (incluyendo comisión)
@@ -62,21 +71,29 @@ class WithdrawService:
                     f"Requerido: {total_to_debit} (monto: {amount} + comisión: {fee})"
                 )
             
-            # 6. Obtener transacciones recientes para reglas de riesgo
-            recent = self.transaction_repo.find_recent(str(account_id), minutes=60)
+            # 6. Obtener la actividad reciente (contadores agregados) para reglas de riesgo
+            recent = self.transaction_repo.get_activity(str(account_id), horizon_minutes=self.risk_plan.minute_horizon)
             
             # 7. Aplicar TODAS las reglas de riesgo
-            for rule in self.risk_strategies:
-                is_valid, message = rule.validate(transaction, account, recent)
-                if not is_valid:
-                    # Rechazar transacción
-                    transaction.transition_to(TransactionStatus.REJECTED)
-                    self.transaction_repo.update_status(transaction.id, transaction.status)
-                    raise TransactionRejectedError(message)
+            is_valid, message = self.risk_plan.evaluate(transaction, account, recent)
+            if not is_valid:
+                # Rechazar transacción
+                transaction.transition_to(TransactionStatus.REJECTED)
+                self.transaction_repo.update_status(transaction.id, transaction.status)
+                raise TransactionRejectedError(message)
             
-            # 8. Aplicar el retiro (monto + comisión)
+            # 8. Aplicar el retiro (monto + comisión). La BD decide con el saldo real:
+            #    si otro retiro concurrente ganó, el UPDATE condicional no afecta filas
             account.apply_debit(total_to_debit)
-            self.account_repo.update(account)
+            if not self.account_repo.debit(account.id, total_to_debit):
+                raise InsufficientFundsError(
+                    f"Fondos insuficientes: el saldo cambió durante la operación "
+                    f"(requerido: {total_to_debit})"
+                )
+            
+            # Piernas del libro mayor (incluida la comisión) en la misma unidad de trabajo
+            if self.ledger_repo is not None:
+                self.ledger_repo.add_entries(entries_for(transaction, fee))
             
             # 9. Aprobar transacción
             transaction.transition_to(TransactionStatus.APPROVED)
@@ -86,7 +103,8 @@ class WithdrawService:
             
         except Exception as e:
             # Si algo falla, aseguramos que la transacción quede REJECTED
-            if transaction.status != TransactionStatus.REJECTED:
+            # (solo si sigue PENDING, para no ocultar el error original)
+            if transaction.status == TransactionStatus.PENDING:
                 transaction.transition_to(TransactionStatus.REJECTED)
                 self.transaction_repo.update_status(transaction.id, transaction.status)
             raise e
\ No newline at end of file
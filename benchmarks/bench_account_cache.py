@@ -0,0 +1,60 @@
+"""Benchmark: lecturas de cuentas (polling de "Ver Cuenta") con y sin caché de cuentas.
+
+Simula N lecturas de get_account repartidas entre pocas cuentas, con un depósito
+cada `WRITE_EVERY` lecturas (cada commit invalida la cuenta depositada).
+
+Uso: python benchmarks/bench_account_cache.py [lecturas]
+"""
+import sys
+from decimal import Decimal
+
+from sqlalchemy import event
+
+from common import build_facade, report, seed_accounts, session_factory, temp_sqlite_engine, timed
+
+from app.api import deps
+from app.repositories.account_cache import AccountCache
+
+ACCOUNTS = 50
+WRITE_EVERY = 20
+
+
+def run(label: str, cache: AccountCache, n: int) -> tuple:
+    deps.account_cache = cache
+    with temp_sqlite_engine() as engine:
+        session = session_factory(engine)()
+        facade = build_facade(session)
+        accounts = seed_accounts(facade, ACCOUNTS)
+        queries = {"n": 0}
+
+        def _count(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                queries["n"] += 1
+
+        event.listen(engine, "before_cursor_execute", _count)
+        step = iter(range(n))
+
+        def poll():
+            i = next(step)
+            facade.get_account(accounts[i % ACCOUNTS])
+            if i % WRITE_EVERY == WRITE_EVERY - 1:
+                facade.deposit(accounts[i % ACCOUNTS], Decimal("1"))
+
+        seconds = timed(poll, n)
+        session.close()
+    stats = cache.stats()
+    return (label, f"{n / seconds:,.0f} lecturas/s", f"{queries['n'] / n:.2f} SELECT por lectura",
+            f"hit ratio {stats['hit_ratio']:.2f}")
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    rows = [
+        run("sin caché", AccountCache(max_size=0), n),
+        run("con caché (TTL 1 s)", AccountCache(ttl_seconds=1.0), n),
+    ]
+    report(f"Lecturas de cuentas ({n}, {ACCOUNTS} cuentas, 1 depósito cada {WRITE_EVERY})", rows)
+
+
+if __name__ == "__main__":
+    main()
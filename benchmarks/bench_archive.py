@@ -0,0 +1,121 @@
+"""Benchmark: archivo en frío de transacciones viejas en segmentos comprimidos.
+
+N transacciones repartidas en 24 meses entre varias cuentas. Se archiva todo lo
+anterior a los últimos 2 meses y se compara, antes y después:
+
+- tamaño de la base (después de VACUUM) vs bytes por fila del segmento;
+- filas/s del job de archivo;
+- latencia de la primera página del historial (en la tabla) y de una página
+  profunda (en el archivo), del export completo de una cuenta y de un estado de
+  cuenta de un mes archivado. Verifica que los resultados coincidan.
+
+Uso: python benchmarks/bench_archive.py [N]
+"""
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import insert, text
+
+from common import report, session_factory, temp_sqlite_engine, timed
+
+from app.domain.entities import Account
+from app.domain.enums import TransactionStatus, TransactionType
+from app.infra.archive import TransactionArchive
+from app.repositories.memory import InMemoryAccountRepo, InMemoryStatementRepo
+from app.repositories.models import TransactionModel
+from app.repositories.sqlalchemy_repo import SQLTransactionRepository
+from app.services.archive_service import archive_transactions
+from app.services.statement_service import StatementService
+
+ACCOUNTS = 200
+START = datetime(2024, 1, 1)
+DAYS = 730
+REPEAT = 20
+
+
+def seed(session, n: int) -> list[str]:
+    accounts = [str(uuid.uuid4()) for _ in range(ACCOUNTS)]
+    step = timedelta(days=DAYS) / n
+    types = (TransactionType.DEPOSIT, TransactionType.WITHDRAWAL, TransactionType.TRANSFER)
+    for offset in range(0, n, 50_000):
+        session.execute(insert(TransactionModel.__table__), [
+            {"id": str(uuid.uuid4()), "account_id": accounts[i % ACCOUNTS], "type": types[i % 3],
+             "target_account_id": accounts[(i + 1) % ACCOUNTS] if i % 3 == 2 else None,
+             "amount": Decimal(i % 500 + 1) / 4, "currency": "USD",
+             "status": TransactionStatus.REJECTED if i % 17 == 0 else TransactionStatus.APPROVED,
+             "created_at": START + step * i, "metadata": {"applied_fee": "0.50"}}
+            for i in range(offset, min(offset + 50_000, n))
+        ])
+    session.commit()
+    return accounts
+
+
+def database_bytes(session, path: str) -> int:
+    session.commit()
+    session.execute(text("VACUUM"))
+    return os.path.getsize(path)
+
+
+def main(n: int) -> None:
+    with temp_sqlite_engine() as engine, tempfile.TemporaryDirectory() as tmp:
+        db_path = engine.url.database
+        session = session_factory(engine)()
+        account_id = seed(session, n)[0]
+        archive = TransactionArchive(os.path.join(tmp, "archive"))
+        transactions = SQLTransactionRepository(session, archive)
+        accounts = InMemoryAccountRepo()
+        accounts.add(Account(id=account_id, customer_id="c", currency="USD", _balance=Decimal("0")))
+        now = START + timedelta(days=DAYS)
+        cutoff = now - timedelta(days=60)
+        history = n // ACCOUNTS
+
+        def measure() -> dict:
+            def statement():
+                service = StatementService(InMemoryStatementRepo(), transactions, accounts)
+                return service.monthly(account_id, 2024, 6, now=now)
+            results = {
+                "first": [t.id for t in transactions.list_page(account_id, 20)],
+                "deep": [t.id for t in transactions.list_page(account_id, 20, offset=history - 40)],
+                "export": sum(1 for _ in transactions.iter_by_account(account_id)),
+                "statement": statement().closing_balance,
+            }
+            results["timings"] = (
+                timed(lambda: transactions.list_page(account_id, 20), REPEAT) / REPEAT,
+                timed(lambda: transactions.list_page(account_id, 20, offset=history - 40), REPEAT) / REPEAT,
+                timed(lambda: sum(1 for _ in transactions.iter_by_account(account_id)), 3) / 3,
+                timed(statement, 3) / 3,
+            )
+            session.rollback()
+            return results
+
+        size_before = database_bytes(session, db_path)
+        before = measure()
+        start = time.perf_counter()
+        result = archive_transactions(session, archive, cutoff, now=now)
+        seconds = time.perf_counter() - start
+        size_after = database_bytes(session, db_path)
+        after = measure()
+        for key in ("first", "deep", "export", "statement"):
+            assert before[key] == after[key], key
+        session.close()
+
+    rows = [
+        ("job de archivo", f"{result.archived:,} filas", f"{result.archived / seconds:,.0f} filas/s"),
+        ("base SQLite (VACUUM)", f"{size_before / 1e6:,.1f} MB -> {size_after / 1e6:,.1f} MB",
+         f"{(size_before - size_after) / result.archived:,.0f} B/fila liberados"),
+        ("segmento", f"{result.segment_bytes / 1e6:,.1f} MB", f"{result.segment_bytes / result.archived:,.0f} B/fila"),
+    ]
+    labels = ("primera página (tabla)", "página profunda (archivo)", f"export de {history:,} filas",
+              "estado de cuenta de un mes archivado")
+    for label, hot, cold in zip(labels, before["timings"], after["timings"]):
+        rows.append((label, f"{hot * 1000:,.2f} ms -> {cold * 1000:,.2f} ms"))
+    report(f"Archivo en frío ({n:,} transacciones, {ACCOUNTS} cuentas, 24 meses; se archivan 22)", rows)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
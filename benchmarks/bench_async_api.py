@@ -0,0 +1,120 @@
+"""Benchmark: API síncrona (threadpool) vs API_MODE=async bajo concurrencia.
+
+Lanza N requests en proceso (httpx + ASGITransport, sin red) con distintos
+niveles de concurrencia: lecturas GET /accounts/{id} e historial, y depósitos.
+Ambos modos usan la misma base SQLite en archivo y pools del mismo tamaño
+(POOL_SIZE conexiones); el modo síncrono además está acotado por el threadpool
+de Starlette (40 hilos por defecto). Se reportan req/s y respuestas con error.
+
+Uso: python benchmarks/bench_async_api.py [N]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+import httpx
+from common import report
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.api.deps import get_config_service
+from app.application.main import create_app
+from app.infra.async_database import get_async_db, to_async_url
+from app.infra.database import get_db
+from app.repositories.models import Base
+
+CONCURRENCY = (1, 16, 64, 256)
+POOL_SIZE = 20
+# Igual para ambos motores: tamaño de pool y espera por el lock de escritura de SQLite
+ENGINE_OPTIONS = dict(pool_size=POOL_SIZE, max_overflow=0, pool_timeout=10,
+                      connect_args={"check_same_thread": False, "timeout": 60})
+
+
+def build_app(mode: str, url: str):
+    sync_engine = create_engine(url, poolclass=QueuePool, **ENGINE_OPTIONS)
+    SyncSession = sessionmaker(autocommit=False, autoflush=False, bind=sync_engine)
+    AsyncSession = async_sessionmaker(create_async_engine(to_async_url(url), poolclass=AsyncAdaptedQueuePool,
+                                                          **ENGINE_OPTIONS),
+                                      autoflush=False, expire_on_commit=False)
+
+    def override_get_db():
+        db = SyncSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db():
+        async with AsyncSession() as session:
+            yield session
+
+    app = create_app(mode)
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    return app
+
+
+async def drive(app, n: int, concurrency: int, make_request) -> tuple[float, int]:
+    """Retorna (segundos, respuestas con status >= 400)."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        semaphore = asyncio.Semaphore(concurrency)
+        errors = 0
+
+        async def one(i: int) -> None:
+            nonlocal errors
+            async with semaphore:
+                resp = await make_request(client, i)
+                errors += resp.status_code >= 400
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(n)))
+        return time.perf_counter() - start, errors
+
+
+async def seed(app, n_accounts: int) -> list[str]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        customer = (await client.post("/customers", json={"name": "Cliente Bench", "email": "b@example.com"})).json()
+        ids = []
+        for _ in range(n_accounts):
+            ids.append((await client.post("/accounts", json={"customer_id": customer["id"]})).json()["id"])
+        return ids
+
+
+async def main(n: int) -> None:
+    # Sin reglas de riesgo: la velocidad por cuenta rechazaría los depósitos repetidos
+    config = get_config_service()
+    for rule in ("max_amount", "velocity", "daily_limit"):
+        config.set_risk_rule(rule, False)
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        Base.metadata.create_all(bind=create_engine(url))
+        accounts = await seed(build_app("sync", url), 64)
+        workloads = {
+            "GET cuenta": lambda c, i: c.get(f"/accounts/{accounts[i % len(accounts)]}"),
+            "GET historial": lambda c, i: c.get(f"/accounts/{accounts[i % len(accounts)]}/transactions"),
+            "POST depósito": lambda c, i: c.post(
+                "/transactions/deposit", json={"account_id": accounts[i % len(accounts)], "amount": "1"}
+            ),
+        }
+        for name, make_request in workloads.items():
+            for concurrency in CONCURRENCY:
+                row = [name, f"c={concurrency}"]
+                for mode in ("sync", "async"):
+                    seconds, errors = await drive(build_app(mode, url), n, concurrency, make_request)
+                    row.append(f"{mode}: {n / seconds:,.0f} req/s ({errors} errores)")
+                print("  " + " | ".join(row), flush=True)
+                rows.append(tuple(row))
+    report(f"{n} requests por combinación (SQLite en archivo)", rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 500))
@@ -0,0 +1,41 @@
+"""Benchmark: lote de depósitos vía execute_batch vs una llamada a la fachada por operación.
+
+Uso: python benchmarks/bench_batch.py [N]
+"""
+import sys
+import time
+from decimal import Decimal
+
+from common import CommitCounter, build_facade, report, seed_accounts, session_factory, temp_sqlite_engine
+
+from app.domain.enums import TransactionType
+from app.services.batch_service import BatchOperation
+
+
+def main(n: int, n_accounts: int = 200) -> None:
+    rows = []
+    for mode in ("individual", "batch"):
+        with temp_sqlite_engine() as engine:
+            session = session_factory(engine)()
+            facade = build_facade(session)
+            accounts = seed_accounts(facade, n_accounts, balance=Decimal("0"))
+            operations = [
+                BatchOperation(TransactionType.DEPOSIT, accounts[i % n_accounts], Decimal("1"))
+                for i in range(n)
+            ]
+            commits = CommitCounter(engine)
+
+            start = time.perf_counter()
+            if mode == "individual":
+                for op in operations:
+                    facade.deposit(op.account_id, op.amount)
+            else:
+                facade.execute_batch(operations)
+            seconds = time.perf_counter() - start
+            session.close()
+        rows.append((mode, f"{seconds:.2f} s", f"{n / seconds:,.0f} ops/s", f"{commits.count} commits"))
+    report(f"{n} depósitos sobre {n_accounts} cuentas", rows)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
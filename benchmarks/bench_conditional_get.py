@@ -0,0 +1,68 @@
+"""Benchmark: polling de la cuenta y del historial con y sin If-None-Match.
+
+Simula a los clientes que consultan GET /accounts/{id} y
+GET /accounts/{id}/transactions?limit=100 una y otra vez sin que los datos
+cambien: sin ETag cada poll lee y serializa la respuesta completa; con ETag el
+cliente reenvía el de la respuesta anterior y recibe 304 sin cuerpo.
+
+Uso: python benchmarks/bench_conditional_get.py [polls]
+"""
+import sys
+from decimal import Decimal
+
+from fastapi.testclient import TestClient
+from common import build_facade, report, seed_accounts, session_factory, temp_sqlite_engine, timed
+
+from app.application.main import create_app
+from app.infra.database import get_db
+
+HISTORY = 500
+PAGE = 100
+
+
+def poll(client: TestClient, url: str, n: int, conditional: bool) -> tuple:
+    first = client.get(url)
+    headers = {"If-None-Match": first.headers["ETag"]} if conditional else {}
+    sent = {"bytes": 0}
+
+    def once():
+        response = client.get(url, headers=headers)
+        assert response.status_code == (304 if conditional else 200), response.text
+        sent["bytes"] += len(response.content)
+
+    seconds = timed(once, n)
+    return f"{n / seconds:,.0f} req/s", f"{sent['bytes'] / n:,.0f} bytes/resp"
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    with temp_sqlite_engine() as engine:
+        Session = session_factory(engine)
+        with Session() as session:
+            facade = build_facade(session)
+            account_id = seed_accounts(facade, 1)[0]
+            for _ in range(HISTORY):
+                facade.deposit(account_id, Decimal("1"))
+
+        def override_get_db():
+            db = Session()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app = create_app("sync")
+        app.dependency_overrides[get_db] = override_get_db
+        rows = []
+        with TestClient(app) as client:
+            for label, url in (
+                ("cuenta", f"/accounts/{account_id}"),
+                (f"historial (limit={PAGE})", f"/accounts/{account_id}/transactions?limit={PAGE}"),
+            ):
+                rows.append((label, "200 completo", *poll(client, url, n, conditional=False)))
+                rows.append((label, "304 con If-None-Match", *poll(client, url, n, conditional=True)))
+    report(f"GET condicional ({n} polls sin cambios, historial de {HISTORY} transacciones)", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Benchmark: memoria de las entidades y costo de materializar el historial.
+
+1. Memoria retenida por N transacciones: dataclass con slots vs dataclass con __dict__.
+2. Transacciones materializadas por segundo al leer un historial desde SQLite:
+   query del ORM + conversión a entidad vs select Core + mapeo directo de filas.
+
+Uso: python benchmarks/bench_entities.py [N]
+"""
+import sys
+import tracemalloc
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+from common import report, session_factory, temp_sqlite_engine, timed
+
+from sqlalchemy import insert
+
+from app.domain.entities import Transaction
+from app.domain.enums import TransactionStatus, TransactionType
+from app.repositories.models import TransactionModel
+from app.repositories.row_mapper import select_transactions, transaction_from_row
+
+
+@dataclass
+class LegacyTransaction:
+    """Transacción tal como estaba antes: dataclass con __dict__ por instancia."""
+    account_id: str
+    amount: Decimal
+    type: TransactionType
+    currency: str
+    target_account_id: Optional[str] = None
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    _status: TransactionStatus = TransactionStatus.PENDING
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    metadata: Optional[Dict[str, Any]] = None
+
+
+def retained_bytes(cls, n: int) -> int:
+    amount = Decimal("10.50")
+    created = datetime(2025, 1, 1)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    items = [
+        cls(account_id="a1", amount=amount, type=TransactionType.DEPOSIT, currency="USD",
+            id=str(i), created_at=created)
+        for i in range(n)
+    ]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del items
+    return after - before
+
+
+def orm_history(session, account_id: str) -> list[Transaction]:
+    """Lectura previa: objetos Model del ORM (identity map) convertidos a entidades."""
+    session.expunge_all()
+    models = session.query(TransactionModel).filter_by(account_id=account_id).all()
+    return [
+        Transaction(id=m.id, account_id=m.account_id, target_account_id=m.target_account_id,
+                    type=m.type, amount=m.amount, currency=m.currency, _status=m.status,
+                    created_at=m.created_at, metadata=m.extra_data)
+        for m in models
+    ]
+
+
+def core_history(session, account_id: str) -> list[Transaction]:
+    rows = session.execute(
+        select_transactions().where(TransactionModel.__table__.c.account_id == account_id)
+    )
+    return [transaction_from_row(r) for r in rows]
+
+
+def main(n: int) -> None:
+    slotted = retained_bytes(Transaction, n)
+    legacy = retained_bytes(LegacyTransaction, n)
+    report(f"Memoria retenida por {n} transacciones", [
+        ("dataclass con __dict__", f"{legacy / 1e6:.1f} MB", f"{legacy / n:.0f} B/tx"),
+        ("dataclass(slots=True)", f"{slotted / 1e6:.1f} MB", f"{slotted / n:.0f} B/tx"),
+        ("ahorro", f"{(1 - slotted / legacy) * 100:.0f}%", ""),
+    ])
+
+    with temp_sqlite_engine() as engine:
+        session = session_factory(engine)()
+        start = datetime(2025, 1, 1)
+        session.execute(insert(TransactionModel.__table__), [
+            {"id": str(uuid.uuid4()), "account_id": "a1", "type": TransactionType.DEPOSIT,
+             "amount": Decimal("1"), "currency": "USD", "status": TransactionStatus.APPROVED,
+             "created_at": start + timedelta(seconds=i)}
+            for i in range(n)
+        ])
+        session.commit()
+
+        rows = []
+        for name, fn in (("ORM + conversión", orm_history), ("Core + row mapper", core_history)):
+            seconds = timed(lambda: fn(session, "a1"), repeat=3) / 3
+            rows.append((name, f"{seconds * 1000:.0f} ms", f"{n / seconds:,.0f} tx/s"))
+        session.close()
+    report(f"Materialización de un historial de {n} transacciones", rows)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,104 @@
+"""Benchmark: exportación del historial completo de una cuenta.
+
+Para historiales de N transacciones compara filas/s y pico de memoria (tracemalloc):
+
+- cargar todo con list_by_account y serializarlo (lo que haría un export sin streaming);
+- export_transactions en NDJSON y CSV (cursor del servidor + bloques de texto);
+- recorrer el historial con list_transactions (limit=100 con cursor, sin HTTP), contando las llamadas.
+
+El pico del export debe mantenerse plano al crecer N.
+
+Uso: python benchmarks/bench_export.py [N ...]
+"""
+import json
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import insert
+
+from common import build_facade, report, seed_accounts, session_factory, temp_sqlite_engine
+
+from app.domain.enums import TransactionStatus, TransactionType
+from app.repositories.models import TransactionModel
+from app.services.export_service import export_record
+from app.services.import_service import CSV, NDJSON
+from app.services.pagination import encode_cursor
+
+PAGE = 100
+
+
+def seed_history(session, account_id: str, n: int) -> None:
+    start = datetime(2024, 1, 1)
+    for offset in range(0, n, 50_000):
+        session.execute(insert(TransactionModel.__table__), [
+            {"id": str(uuid.uuid4()), "account_id": account_id, "type": TransactionType.DEPOSIT,
+             "amount": Decimal("1.25"), "currency": "USD", "status": TransactionStatus.APPROVED,
+             "created_at": start + timedelta(seconds=i)}
+            for i in range(offset, min(offset + 50_000, n))
+        ])
+    session.commit()
+
+
+def measure(fn) -> tuple:
+    """Una pasada cronometrada y otra con tracemalloc (que por sí mismo la hace varias veces más lenta)."""
+    start = time.perf_counter()
+    rows = fn()
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return rows, seconds, peak
+
+
+def main(sizes: list[int]) -> None:
+    for n in sizes:
+        with temp_sqlite_engine() as engine:
+            session = session_factory(engine)()
+            facade = build_facade(session)
+            account_id = seed_accounts(facade, 1, balance=Decimal("0"))[0]
+            seed_history(session, account_id, n)
+
+            def load_all() -> int:
+                history = facade.transaction_repo.list_by_account(account_id)
+                body = "".join(json.dumps(export_record(t)) + "\n" for t in history)
+                return len(history) if body else 0
+
+            def export(fmt: str):
+                def run() -> int:
+                    lines = 0
+                    for chunk in facade.export_transactions(account_id, fmt):
+                        lines += chunk.count("\n")
+                    return lines - (1 if fmt == CSV else 0)
+                return run
+
+            def paginate() -> int:
+                rows, calls, cursor = 0, 0, None
+                while True:
+                    page = facade.list_transactions(account_id, limit=PAGE, cursor=cursor)
+                    calls += 1
+                    rows += len(page)
+                    if len(page) < PAGE:
+                        return calls
+                    cursor = encode_cursor(page[-1])
+
+            results = []
+            for label, fn in (("list_by_account + json", load_all), ("export ndjson", export(NDJSON)),
+                              ("export csv", export(CSV))):
+                rows, seconds, peak = measure(fn)
+                assert rows == n, (label, rows)
+                results.append((label, f"{n / seconds:,.0f} filas/s", f"pico {peak / 1e6:.1f} MB"))
+            start = time.perf_counter()
+            calls = paginate()
+            seconds = time.perf_counter() - start
+            results.append((f"list_transactions paginado (limit={PAGE}, sin HTTP)", f"{n / seconds:,.0f} filas/s", f"{calls:,} llamadas"))
+            session.close()
+        report(f"Exportación de un historial de {n:,} transacciones", results)
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [20_000, 100_000])
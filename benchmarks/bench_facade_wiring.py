@@ -0,0 +1,73 @@
+"""Benchmark: costo por request del cableado de la fachada.
+
+Mide get_facade() aislado (repositorios + servicios sobre una sesión) con las
+estrategias reutilizadas por versión de configuración frente a reconstruirlas
+en cada llamada, como se hacía antes. Luego mide la latencia de punta a punta
+del camino trivial GET /accounts/{id} con TestClient, sin red.
+
+Uso: python benchmarks/bench_facade_wiring.py [N]
+"""
+import sys
+import time
+
+from fastapi.testclient import TestClient
+from common import build_facade, report, seed_accounts, session_factory, temp_sqlite_engine
+
+from app.api.deps import get_config_service, get_facade
+from app.application.main import create_app
+from app.infra.database import get_db
+from app.services.configuration_service import ConfigurationService
+
+
+def wiring_per_call(session, config: ConfigurationService, n: int, rebuild: bool) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        if rebuild:
+            # Simula el cableado anterior: estrategias nuevas en cada request
+            config._compiled = None
+        get_facade(session, config)
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def get_account_latency(engine, account_id: str, n: int) -> list:
+    Session = session_factory(engine)
+
+    def override_get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = create_app("sync")
+    app.dependency_overrides[get_db] = override_get_db
+    samples = []
+    with TestClient(app) as client:
+        for _ in range(50):
+            client.get(f"/accounts/{account_id}")
+        for _ in range(n):
+            start = time.perf_counter()
+            response = client.get(f"/accounts/{account_id}")
+            samples.append(time.perf_counter() - start)
+            assert response.status_code == 200, response.text
+    samples.sort()
+    return [round(samples[len(samples) // 2] * 1e6, 1), round(samples[int(len(samples) * 0.99)] * 1e6, 1)]
+
+
+def main(n: int) -> None:
+    config = get_config_service()
+    with temp_sqlite_engine() as engine:
+        Session = session_factory(engine)
+        with Session() as session:
+            account_id = seed_accounts(build_facade(session), 1)[0]
+            rows = [("cableado", "µs/llamada")]
+            for label, rebuild in (("reconstruir estrategias", True), ("estrategias por versión", False)):
+                rows.append((label, round(wiring_per_call(session, config, n, rebuild), 2)))
+        report(f"get_facade() x {n}", rows)
+
+        median, p99 = get_account_latency(engine, account_id, min(n, 2000))
+        report("GET /accounts/{id} (TestClient)", [("p50 µs", "p99 µs"), (median, p99)])
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
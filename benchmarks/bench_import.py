@@ -0,0 +1,70 @@
+"""Benchmark: importación masiva de clientes vs create_customer fila por fila.
+
+Genera archivos NDJSON de N filas y mide filas/s y el pico de memoria de la
+importación (tracemalloc), que debe mantenerse plano al crecer el archivo.
+
+Uso: python benchmarks/bench_import.py [N ...]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from common import build_facade, report, session_factory, temp_sqlite_engine
+
+from app.services.import_service import NDJSON
+
+
+def write_file(path: str, n: int) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(n):
+            f.write(json.dumps({"name": f"Cliente {i}", "email": f"cliente{i}@example.com"}) + "\n")
+
+
+def run_import(path: str) -> tuple:
+    with temp_sqlite_engine() as engine:
+        session = session_factory(engine)()
+        facade = build_facade(session)
+        tracemalloc.start()
+        start = time.perf_counter()
+        with open(path, encoding="utf-8") as stream:
+            result = facade.import_customers(stream, NDJSON)
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        session.close()
+    return result.customers_created, seconds, peak
+
+
+def run_row_by_row(n: int) -> float:
+    with temp_sqlite_engine() as engine:
+        session = session_factory(engine)()
+        facade = build_facade(session)
+        start = time.perf_counter()
+        for i in range(n):
+            customer = facade.create_customer(f"Cliente {i}", f"cliente{i}@example.com")
+            facade.create_account(customer.id)
+        seconds = time.perf_counter() - start
+        session.close()
+    return seconds
+
+
+def main(sizes: list[int]) -> None:
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            path = os.path.join(tmp, f"clientes_{n}.ndjson")
+            write_file(path, n)
+            created, seconds, peak = run_import(path)
+            rows.append((f"import {n}", f"{seconds:.2f} s", f"{created / seconds:,.0f} filas/s",
+                         f"pico {peak / 1e6:.1f} MB"))
+    n = min(sizes[0], 2000)
+    seconds = run_row_by_row(n)
+    rows.append((f"fila por fila {n}", f"{seconds:.2f} s", f"{n / seconds:,.0f} filas/s", ""))
+    report("Importación de clientes + cuenta", rows)
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10_000, 100_000])
@@ -0,0 +1,65 @@
+"""Benchmark: servicios reales sobre el backend en memoria con historiales grandes.
+
+Precarga N transacciones en una cuenta y mide depósitos, ventanas recientes y
+paginación. Compara find_recent indexado contra el recorrido lineal anterior.
+
+Uso: python benchmarks/bench_in_memory_services.py [N ...]
+"""
+import sys
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from common import report, timed
+
+from app.application.in_memory import build_in_memory_facade
+from app.domain.entities import Transaction
+from app.domain.enums import TransactionStatus, TransactionType
+from app.services.configuration_service import ConfigurationService
+
+
+def linear_find_recent(repo, account_id: str, minutes: int) -> list:
+    """Implementación previa: recorre todas las transacciones del repositorio."""
+    limit = datetime.utcnow() - timedelta(minutes=minutes)
+    return [t for t in repo._data.values() if t.account_id == account_id and t.created_at >= limit]
+
+
+def run(n: int) -> list[tuple]:
+    config = ConfigurationService()
+    for rule in ("max_amount", "velocity", "daily_limit"):
+        config.set_risk_rule(rule, False)
+    facade = build_in_memory_facade(config)
+    customer = facade.create_customer("Cliente Benchmark", "bench@example.com")
+    account = facade.create_account(customer.id)
+    repo = facade.transaction_repo
+
+    # Historial sintético: una transacción por segundo hacia atrás desde ahora
+    start = datetime.utcnow() - timedelta(seconds=n)
+    for i in range(n):
+        tx = Transaction(account_id=account.id, amount=Decimal("1"), type=TransactionType.DEPOSIT,
+                         currency="USD", created_at=start + timedelta(seconds=i),
+                         _status=TransactionStatus.APPROVED)
+        repo.add(tx)
+
+    reps = 200
+    deposit = timed(lambda: facade.deposit(account.id, Decimal("1")), reps)
+    recent = timed(lambda: repo.find_recent(account.id, minutes=10), reps)
+    linear = timed(lambda: linear_find_recent(repo, account.id, minutes=10), 5)
+    page = timed(lambda: facade.list_transactions(account.id, limit=50, offset=1000), reps)
+    return [
+        (f"N={n:,}", "deposit (servicio completo)", f"{deposit / reps * 1e6:.1f} µs/op"),
+        (f"N={n:,}", "find_recent 10 min (indexado)", f"{recent / reps * 1e6:.1f} µs/op"),
+        (f"N={n:,}", "find_recent 10 min (lineal)", f"{linear / 5 * 1e6:.1f} µs/op"),
+        (f"N={n:,}", "list_page limit=50 offset=1000", f"{page / reps * 1e6:.1f} µs/op"),
+    ]
+
+
+def main() -> None:
+    sizes = [int(a) for a in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    rows = []
+    for n in sizes:
+        rows.extend(run(n))
+    report("Servicios sobre repositorios en memoria", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Benchmark: saldo histórico desde el último snapshot vs sumando todo el libro mayor,
+y costo de escribir las piernas en cada transferencia.
+
+Uso: python benchmarks/bench_ledger.py [piernas_por_cuenta]
+"""
+import sys
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from common import build_facade, report, seed_accounts, session_factory, temp_sqlite_engine, timed
+
+from app.domain.ledger import LedgerEntry
+from app.repositories.sqlalchemy_repo import SQLLedgerRepository
+
+ACCOUNTS = 20
+SNAPSHOT_EVERY = timedelta(days=1)
+LOOKUPS = 200
+TRANSFERS = 300
+
+
+def history(n: int) -> list[LedgerEntry]:
+    base = datetime(2024, 1, 1)
+    return [
+        LedgerEntry(f"tx-{i}", f"acc-{i % ACCOUNTS}", Decimal((i % 11) - 5), created_at=base + timedelta(minutes=i))
+        for i in range(n * ACCOUNTS)
+    ]
+
+
+def balance_lookups(n: int) -> list[tuple]:
+    entries = history(n)
+    end = entries[-1].created_at
+    rows = []
+    with temp_sqlite_engine() as engine:
+        session = session_factory(engine)()
+        repo = SQLLedgerRepository(session)
+        for start in range(0, len(entries), 50_000):
+            repo.add_entries(entries[start:start + 50_000])
+        session.commit()
+
+        at = end - timedelta(hours=1)
+        replay = timed(lambda: repo.balance_at("acc-0", at), LOOKUPS)
+        expected = repo.balance_at("acc-0", at)
+
+        as_of, snapshots = entries[0].created_at + SNAPSHOT_EVERY, 0
+        while as_of <= end:
+            snapshots += repo.take_snapshots(as_of)
+            as_of += SNAPSHOT_EVERY
+        session.commit()
+        assert repo.balance_at("acc-0", at) == expected
+        with_snapshots = timed(lambda: repo.balance_at("acc-0", at), LOOKUPS)
+        session.close()
+
+    rows.append(("saldo histórico", "suma de todas las piernas", f"{replay / LOOKUPS * 1000:.3f} ms"))
+    rows.append(("saldo histórico", f"último snapshot ({snapshots} snapshots)",
+                 f"{with_snapshots / LOOKUPS * 1000:.3f} ms", f"x{replay / with_snapshots:.1f}"))
+    return rows
+
+
+def transfer_cost() -> list[tuple]:
+    rows = []
+    for label, with_ledger in (("sin libro mayor", False), ("con libro mayor", True)):
+        with temp_sqlite_engine() as engine:
+            session = session_factory(engine)()
+            facade = build_facade(session, fee_type="flat")
+            source, target = seed_accounts(facade, 2)
+            if not with_ledger:
+                facade.transfer_service.ledger_repo = None
+            seconds = timed(lambda: facade.transfer(source, target, Decimal("1")), TRANSFERS)
+            session.close()
+        rows.append(("transferencia", label, f"{seconds / TRANSFERS * 1000:.3f} ms/op"))
+    return rows
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    report(f"Libro mayor ({ACCOUNTS} cuentas x {n} piernas, SQLite en archivo)", balance_lookups(n) + transfer_cost())
+
+
+if __name__ == "__main__":
+    main()
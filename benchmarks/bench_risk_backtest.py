@@ -0,0 +1,85 @@
+"""Benchmark: re-evaluación del historial con NumPy vs una validación por transacción.
+
+Genera N transacciones sintéticas repartidas en cuentas (timestamps crecientes
+por cuenta, varias por minuto), arma los arreglos del bloque y mide las filas
+evaluadas por segundo con las tres reglas. La validación por transacción
+(RiskPlan con `now` = created_at sobre las transacciones previas de la cuenta)
+se mide sobre una muestra y se verifica que los veredictos coincidan.
+
+Uso: python benchmarks/bench_risk_backtest.py [N ...]
+"""
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from common import report
+
+from app.domain.entities import Account, Transaction
+from app.domain.enums import TransactionType
+from app.services.risk_backtest import HistoryChunk, score_chunk
+from app.services.risk_engine import RiskPlan
+from app.services.risk_strategies import DailyLimitRule, MaxAmountRule, VelocityRule
+
+TX_PER_ACCOUNT = 500
+SAMPLE = 5000
+RULES = [MaxAmountRule(), VelocityRule(), DailyLimitRule()]
+NAMES = ("max_amount", "velocity", "daily_limit")
+
+
+def synthetic_history(n: int) -> list:
+    rng = random.Random(42)
+    history = []
+    for a in range(max(1, n // TX_PER_ACCOUNT)):
+        at = datetime(2024, 1, 1) + timedelta(minutes=rng.randint(0, 1440))
+        for _ in range(min(TX_PER_ACCOUNT, n - len(history))):
+            at += timedelta(seconds=rng.randint(0, 900))
+            history.append(Transaction(account_id=f"acc-{a:07d}", amount=Decimal(rng.randint(100, 150000)) / 100,
+                                       type=TransactionType.DEPOSIT, currency="USD", created_at=at))
+    return history
+
+
+def per_transaction(ordered: list, limit: int) -> tuple:
+    """Validación como en los servicios: las transacciones previas de la cuenta como actividad."""
+    account = Account(customer_id="bench", currency="USD")
+    previous = defaultdict(list)
+    verdicts = []
+    start = time.perf_counter()
+    for tx in ordered[:limit]:
+        recent = previous[tx.account_id]
+        verdicts.append([not RiskPlan([rule]).evaluate(tx, account, recent, now=tx.created_at)[0]
+                         for rule in RULES])
+        recent.append(tx)
+    return verdicts, time.perf_counter() - start
+
+
+def run(n: int) -> tuple:
+    history = synthetic_history(n)
+    start = time.perf_counter()
+    chunk = HistoryChunk.from_transactions(history)
+    load = time.perf_counter() - start
+
+    start = time.perf_counter()
+    verdicts = score_chunk(chunk, RULES)
+    score = time.perf_counter() - start
+
+    ordered = sorted(history, key=lambda t: (t.account_id, t.created_at, t.id))
+    sample = min(SAMPLE, n)
+    expected, elapsed = per_transaction(ordered, sample)
+    for i, row in enumerate(expected):
+        assert row == [bool(verdicts[name][i]) for name in NAMES], i
+    return (n, f"{n / load:,.0f}", f"{n / score:,.0f}", f"{sample / elapsed:,.0f}",
+            f"{n * elapsed / sample:,.1f}s vs {score:,.2f}s")
+
+
+def main(sizes) -> None:
+    rows = [("transacciones", "armado (filas/s)", "NumPy (filas/s)", "por transacción (filas/s)",
+             "historial completo")]
+    rows += [run(n) for n in sizes]
+    report("Re-evaluación del historial con 3 reglas", rows)
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [100_000, 1_000_000])
@@ -0,0 +1,99 @@
+"""Benchmark: evaluación de riesgo regla por regla vs RiskPlan (una pasada).
+
+Con las tres reglas activas y una transacción que las aprueba (peor caso: se
+evalúan todas), mide evaluaciones por segundo sobre:
+
+1. una lista de N transacciones recientes (cálculos offline, tests),
+2. contadores agregados con 60 buckets por minuto (camino de producción).
+
+Uso: python benchmarks/bench_risk_engine.py [N ...]
+"""
+import sys
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from common import report, timed
+
+from app.domain.activity import BucketedActivity, as_activity, day_bucket, minute_bucket
+from app.domain.entities import Account, Transaction
+from app.domain.enums import TransactionType
+from app.services.risk_engine import RiskPlan
+from app.services.risk_strategies import DailyLimitRule, MaxAmountRule, VelocityRule
+
+REPEAT = 2000
+# Límites altos para que ninguna regla rechace y se evalúen las tres
+RULES = [MaxAmountRule(), VelocityRule(max_transactions=10**9), DailyLimitRule(Decimal("1e12"))]
+
+
+class LegacyVelocityRule(VelocityRule):
+    """validate() tal como estaba antes: su propio now y su propia pasada."""
+
+    def validate(self, transaction, account, recent_transactions):
+        time_limit = datetime.utcnow() - timedelta(minutes=self.time_window_minutes)
+        transactions_in_window = as_activity(recent_transactions).count_since(time_limit)
+        if transactions_in_window >= self.max_transactions:
+            return False, f"Demasiadas transacciones ({transactions_in_window}) en los últimos {self.time_window_minutes} minutos"
+        return True, ""
+
+
+class LegacyDailyLimitRule(DailyLimitRule):
+    def validate(self, transaction, account, recent_transactions):
+        now = datetime.utcnow()
+        start_of_day = datetime(now.year, now.month, now.day)
+        total_today = as_activity(recent_transactions).sum_since(start_of_day) + transaction.amount
+        if total_today > self.daily_limit:
+            return False, f"Límite diario de ${self.daily_limit} excedido (total: ${total_today})"
+        return True, ""
+
+
+class LegacyMaxAmountRule(MaxAmountRule):
+    def validate(self, transaction, account, recent_transactions):
+        if transaction.amount > self.max_amount:
+            return False, f"Monto excede el límite de ${self.max_amount}"
+        return True, ""
+
+
+LEGACY_RULES = [LegacyMaxAmountRule(), LegacyVelocityRule(max_transactions=10**9),
+                LegacyDailyLimitRule(Decimal("1e12"))]
+
+
+def per_rule(tx, account, recent):
+    """Bucle de los servicios antes de RiskPlan."""
+    for rule in LEGACY_RULES:
+        is_valid, message = rule.validate(tx, account, recent)
+        if not is_valid:
+            return False, message
+    return True, ""
+
+
+def compare(label, tx, account, recent, repeat):
+    plan = RiskPlan(RULES)
+    assert plan.evaluate(tx, account, recent) == per_rule(tx, account, recent)
+    legacy = timed(lambda: per_rule(tx, account, recent), repeat)
+    fused = timed(lambda: plan.evaluate(tx, account, recent), repeat)
+    return (label, f"{repeat / legacy:,.0f}", f"{repeat / fused:,.0f}", f"{legacy / fused:.2f}x")
+
+
+def main(sizes):
+    now = datetime.utcnow()
+    account = Account(customer_id="bench", currency="USD", _balance=Decimal("1000000"))
+    tx = Transaction(account_id=account.id, amount=Decimal("10"), type=TransactionType.DEPOSIT, currency="USD")
+    rows = [("actividad", "regla por regla (eval/s)", "RiskPlan (eval/s)", "speedup")]
+    for n in sizes:
+        history = [
+            Transaction(account_id=account.id, amount=Decimal("1"), type=TransactionType.DEPOSIT,
+                        currency="USD", created_at=now - timedelta(seconds=i * 5))
+            for i in range(n)
+        ]
+        rows.append(compare(f"lista de {n}", tx, account, history, max(20, REPEAT * 100 // max(n, 100))))
+    buckets = BucketedActivity(
+        minute_buckets={minute_bucket(now - timedelta(minutes=m)): (2, Decimal("20")) for m in range(60)},
+        day_start=day_bucket(now),
+        day_totals=(120, Decimal("1200")),
+    )
+    rows.append(compare("60 buckets por minuto", tx, account, buckets, REPEAT * 10))
+    report("Evaluación de 3 reglas de riesgo", rows)
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [100, 1000, 10000])
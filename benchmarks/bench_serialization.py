@@ -0,0 +1,110 @@
+"""Benchmark: serialización de páginas del historial.
+
+Compara, para páginas de 10 a 1000 transacciones ya leídas:
+
+- modelos + response_model: un TransactionResponse por fila, luego FastAPI valida
+  y serializa la lista (serialize_response) y JSONResponse hace json.dumps;
+- TypeAdapter directo: transactions_json (dicts -> bytes con pydantic-core).
+
+También mide la latencia de punta a punta de GET /accounts/{id}/transactions?limit=100.
+
+Uso: python benchmarks/bench_serialization.py [repeticiones]
+"""
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.testclient import TestClient
+from fastapi.utils import create_response_field
+from common import build_facade, report, seed_accounts, session_factory, temp_sqlite_engine, timed
+
+from app.api.serializers import transactions_json
+from app.application.main import create_app
+from app.domain.entities import Transaction
+from app.domain.enums import TransactionStatus, TransactionType
+from app.infra.database import get_db
+from app.schemas.dto import TransactionResponse
+
+PAGE_SIZES = (10, 100, 1000)
+HTTP_PAGE = 100
+
+_field = create_response_field(name="Response_list", type_=list[TransactionResponse], mode="serialization")
+_loop = asyncio.new_event_loop()
+
+
+def sample(n: int) -> list[Transaction]:
+    base = datetime(2024, 1, 1)
+    rows = []
+    for i in range(n):
+        t = Transaction(account_id="acc", amount=Decimal(i + 1) / 4, type=TransactionType.DEPOSIT,
+                        currency="USD", created_at=base + timedelta(seconds=i))
+        t.transition_to(TransactionStatus.APPROVED)
+        rows.append(t)
+    return rows
+
+
+def via_response_model(transactions: list[Transaction]) -> bytes:
+    models = [
+        TransactionResponse(id=t.id, type=t.type, amount=t.amount, currency=t.currency,
+                            status=t.status, created_at=t.created_at)
+        for t in transactions
+    ]
+    content = _loop.run_until_complete(serialize_response(field=_field, response_content=models))
+    return JSONResponse(content).body
+
+
+def serializer_rows(repeat: int) -> list[tuple]:
+    rows = []
+    for size in PAGE_SIZES:
+        page = sample(size)
+        assert via_response_model(page) == transactions_json(page)
+        n = max(repeat // size, 20)
+        slow = timed(lambda: via_response_model(page), n)
+        fast = timed(lambda: transactions_json(page), n)
+        rows.append((f"{size} filas", f"response_model {slow / n * 1e6:,.0f} µs",
+                     f"TypeAdapter {fast / n * 1e6:,.0f} µs", f"x{slow / fast:.1f}"))
+    return rows
+
+
+def http_latency(n: int) -> tuple:
+    with temp_sqlite_engine() as engine:
+        Session = session_factory(engine)
+        with Session() as session:
+            facade = build_facade(session)
+            account_id = seed_accounts(facade, 1)[0]
+            for _ in range(HTTP_PAGE):
+                facade.deposit(account_id, Decimal("1.25"))
+
+        def override_get_db():
+            db = Session()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app = create_app("sync")
+        app.dependency_overrides[get_db] = override_get_db
+        samples = []
+        with TestClient(app) as client:
+            for _ in range(n):
+                start = time.perf_counter()
+                response = client.get(f"/accounts/{account_id}/transactions", params={"limit": HTTP_PAGE})
+                samples.append(time.perf_counter() - start)
+                assert response.status_code == 200 and len(response.json()) == HTTP_PAGE
+    samples.sort()
+    return (f"GET historial limit={HTTP_PAGE}", f"p50 {samples[len(samples) // 2] * 1e3:.2f} ms",
+            f"p99 {samples[int(len(samples) * 0.99)] * 1e3:.2f} ms")
+
+
+def main() -> None:
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    report("Serialización de listas de transacciones (µs por página)", serializer_rows(repeat))
+    report("Punta a punta (TestClient, camino rápido)", [http_latency(500)])
+
+
+if __name__ == "__main__":
+    main()
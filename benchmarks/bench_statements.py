@@ -0,0 +1,97 @@
+"""Benchmark: estado de cuenta mensual recalculado desde el historial vs materializado.
+
+Una cuenta con N transacciones repartidas en 12 meses. Compara:
+
+- recalcular: list_by_account y sumar las transacciones del mes (lo que se hacía antes);
+- primera consulta: materializa los meses anteriores y el pedido;
+- mes cerrado ya materializado: lectura de una fila;
+- mes en curso: solo suma lo posterior al corte guardado.
+
+Uso: python benchmarks/bench_statements.py [N]
+"""
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import insert
+
+from common import report, session_factory, temp_sqlite_engine, timed
+
+from app.domain.entities import Account
+from app.domain.enums import TransactionStatus, TransactionType
+from app.domain.statement import MonthlyStatement, month_start, next_month
+from app.repositories.memory import InMemoryAccountRepo
+from app.repositories.models import TransactionModel
+from app.repositories.sqlalchemy_repo import SQLStatementRepository, SQLTransactionRepository
+from app.services.statement_service import StatementService
+
+START = datetime(2025, 1, 1)
+MONTHS = 12
+REPEAT = 20
+
+
+def seed(session, n: int) -> datetime:
+    step = timedelta(days=MONTHS * 30) / n
+    types = (TransactionType.DEPOSIT, TransactionType.WITHDRAWAL, TransactionType.TRANSFER)
+    for offset in range(0, n, 50_000):
+        session.execute(insert(TransactionModel.__table__), [
+            {"id": str(uuid.uuid4()), "account_id": "acc", "type": types[i % 3],
+             "target_account_id": "other" if i % 3 == 2 else None,
+             "amount": Decimal("1.25") if i % 3 == 0 else Decimal("0.5"), "currency": "USD",
+             "status": TransactionStatus.APPROVED, "created_at": START + step * i,
+             "metadata": {"applied_fee": "0.01"}}
+            for i in range(offset, min(offset + 50_000, n))
+        ])
+    session.commit()
+    return START + step * n
+
+
+def recompute(transactions: SQLTransactionRepository, period) -> MonthlyStatement:
+    start, end = month_start(period), month_start(next_month(period))
+    before = MonthlyStatement("acc", period, Decimal("0"), start)
+    statement = MonthlyStatement("acc", period, Decimal("0"), start)
+    for t in transactions.list_by_account("acc"):
+        if t.created_at < start:
+            before.add(t)
+        elif t.created_at < end:
+            statement.add(t)
+    statement.opening_balance = before.closing_balance
+    return statement
+
+
+def main(n: int) -> None:
+    with temp_sqlite_engine() as engine:
+        session = session_factory(engine)()
+        last = seed(session, n)
+        now = last + timedelta(minutes=5)
+        accounts = InMemoryAccountRepo()
+        accounts.add(Account(id="acc", customer_id="c", currency="USD", _balance=Decimal("0")))
+        transactions = SQLTransactionRepository(session)
+        service = StatementService(SQLStatementRepository(session), transactions, accounts)
+        closed, current = (now - timedelta(days=40)).date().replace(day=1), now.date().replace(day=1)
+
+        slow = timed(lambda: recompute(transactions, closed), 3) / 3
+        start = time.perf_counter()
+        first = service.monthly("acc", closed.year, closed.month, now=now)
+        materialize = time.perf_counter() - start
+        session.commit()
+        assert first.closing_balance == recompute(transactions, closed).closing_balance
+        cached = timed(lambda: service.monthly("acc", closed.year, closed.month, now=now), REPEAT) / REPEAT
+        service.monthly("acc", current.year, current.month, now=now)
+        session.commit()
+        later = now + timedelta(minutes=2)
+        open_month = timed(lambda: service.monthly("acc", current.year, current.month, now=later), REPEAT) / REPEAT
+        session.close()
+
+    report(f"Estado de cuenta mensual ({n:,} transacciones en {MONTHS} meses)", [
+        ("recalcular con list_by_account", f"{slow * 1000:,.1f} ms"),
+        ("primera consulta (materializa meses previos)", f"{materialize * 1000:,.1f} ms"),
+        ("mes cerrado materializado", f"{cached * 1000:,.3f} ms", f"x{slow / cached:,.0f}"),
+        ("mes en curso (incremental)", f"{open_month * 1000:,.3f} ms", f"x{slow / open_month:,.0f}"),
+    ])
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,125 @@
+"""Transferencias cruzadas concurrentes: throughput y conservación del dinero.
+
+Varios hilos (cada uno con su sesión, como los workers de la API) transfieren
+entre pocas cuentas en ambos sentidos (A->B y B->A a la vez), con las cuentas
+bloqueadas en orden de id (`lock_many`) vs leídas sin bloqueo. Al final la
+suma de los saldos debe ser la misma que al inicio.
+
+Usa SQLite en un archivo temporal; con DATABASE_URL=postgresql://... corre
+contra esa base (SELECT ... FOR UPDATE real, crea las tablas si no existen).
+"""
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from decimal import Decimal
+from typing import Iterator
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.engine import Engine
+
+from common import build_facade, report, seed_accounts, session_factory
+
+from app.domain.exceptions import InsufficientFundsError
+from app.repositories.models import AccountModel, Base
+
+ACCOUNTS = 4
+TRANSFERS_PER_THREAD = 250
+THREADS = (1, 4, 16)
+AMOUNT = Decimal("3")
+BALANCE = Decimal("500")
+
+
+@contextmanager
+def bench_engine() -> Iterator[Engine]:
+    url = os.getenv("DATABASE_URL", "")
+    if url.startswith("postgresql"):
+        engine = create_engine(url, pool_size=max(THREADS), max_overflow=0)
+    else:
+        tmp = tempfile.TemporaryDirectory()
+        # timeout: esperar el lock de escritura en vez de fallar con "database is locked"
+        engine = create_engine(
+            f"sqlite:///{os.path.join(tmp.name, 'bench.db')}",
+            connect_args={"check_same_thread": False, "timeout": 60},
+            pool_size=max(THREADS), max_overflow=0,
+        )
+    Base.metadata.create_all(bind=engine)
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+        if not url.startswith("postgresql"):
+            tmp.cleanup()
+
+
+def run(engine: Engine, threads: int, locking: bool) -> tuple:
+    Session = session_factory(engine)
+    with Session() as session:
+        accounts = seed_accounts(build_facade(session), ACCOUNTS, BALANCE)
+    total_before = Decimal(ACCOUNTS) * BALANCE
+
+    approved = insufficient = 0
+    errors: list[Exception] = []
+    lock = threading.Lock()
+
+    def worker(n: int) -> None:
+        nonlocal approved, insufficient
+        ok = short = 0
+        with Session() as session:
+            facade = build_facade(session)
+            if not locking:
+                repo = facade.transfer_service.account_repo
+                repo.lock_many = repo.get_many
+            for i in range(TRANSFERS_PER_THREAD):
+                # Cada par de cuentas se recorre en ambos sentidos, en hilos distintos a la vez
+                k = n + i // 2
+                a, b = accounts[k % ACCOUNTS], accounts[(k + 1) % ACCOUNTS]
+                src, dst = (a, b) if (n + i) % 2 else (b, a)
+                try:
+                    facade.transfer(src, dst, AMOUNT)
+                    ok += 1
+                except InsufficientFundsError:
+                    short += 1
+                except Exception as e:
+                    with lock:
+                        errors.append(e)
+        with lock:
+            approved += ok
+            insufficient += short
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    with Session() as session:
+        total_after = session.execute(
+            select(func.sum(AccountModel.balance)).where(AccountModel.id.in_(accounts))
+        ).scalar()
+    transfers = threads * TRANSFERS_PER_THREAD
+    return (
+        "lock_many" if locking else "sin bloqueo",
+        threads,
+        f"{transfers / elapsed:,.0f} transf/s",
+        f"{approved} aprobadas",
+        f"{insufficient} sin fondos",
+        f"{len(errors)} errores" + (f" ({type(errors[0]).__name__}: {errors[0]})" if errors else ""),
+        "conserva" if total_after == total_before else f"DESCUADRE {total_after - total_before}",
+    )
+
+
+def main() -> None:
+    rows = []
+    with bench_engine() as engine:
+        for threads in THREADS:
+            for locking in (False, True):
+                rows.append(run(engine, threads, locking))
+    report(f"Transferencias cruzadas concurrentes ({TRANSFERS_PER_THREAD} por hilo, {ACCOUNTS} cuentas)", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Benchmark: commits y latencia por operación, commit-por-método (antes) vs unidad de trabajo (ahora).
+
+Uso: python benchmarks/bench_unit_of_work.py [operaciones_por_tipo]
+"""
+import sys
+from decimal import Decimal
+
+from common import (
+    CommitCounter,
+    build_facade,
+    report,
+    seed_accounts,
+    session_factory,
+    temp_sqlite_engine,
+    timed,
+)
+
+
+class LegacyCommitSession:
+    """Reproduce el comportamiento anterior: cada método del repositorio hacía commit."""
+
+    def __init__(self, session) -> None:
+        self._session = session
+
+    def flush(self) -> None:
+        self._session.commit()
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+
+def run(mode: str, n: int) -> list[tuple]:
+    rows = []
+    with temp_sqlite_engine() as engine:
+        session = session_factory(engine)()
+        if mode == "antes":
+            session = LegacyCommitSession(session)
+        facade = build_facade(session)
+        source, target = seed_accounts(facade, 2)
+        counter = CommitCounter(engine)
+
+        operations = {
+            "deposit": lambda: facade.deposit(source, Decimal("1")),
+            "withdraw": lambda: facade.withdraw(source, Decimal("1")),
+            "transfer": lambda: facade.transfer(source, target, Decimal("1")),
+        }
+        for name, op in operations.items():
+            counter.reset()
+            seconds = timed(op, n)
+            rows.append((mode, name, f"{counter.count / n:.1f} commits/op", f"{seconds / n * 1000:.3f} ms/op"))
+        session.close()
+    return rows
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    report(f"Unidad de trabajo ({n} operaciones por tipo, SQLite en archivo)", run("antes", n) + run("ahora", n))
+
+
+if __name__ == "__main__":
+    main()
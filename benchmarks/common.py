@@ -0,0 +1,92 @@
+"""Utilidades compartidas por los benchmarks (motor SQLite temporal, fachada y cronómetro)."""
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable, Iterator
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+
+if str(ROOT_DIR) not in sys.path:
+    # Permite ejecutar los benchmarks como scripts (python benchmarks/bench_x.py)
+    sys.path.insert(0, str(ROOT_DIR))
+
+from sqlalchemy import create_engine, event  # noqa: E402
+from sqlalchemy.engine import Engine  # noqa: E402
+from sqlalchemy.orm import Session, sessionmaker  # noqa: E402
+
+from app.api.deps import get_facade  # noqa: E402
+from app.application.facade import BankingFacade  # noqa: E402
+from app.repositories.models import Base  # noqa: E402
+from app.services.configuration_service import ConfigurationService  # noqa: E402
+
+
+@contextmanager
+def temp_sqlite_engine() -> Iterator[Engine]:
+    """Motor SQLite sobre un archivo temporal (los commits pagan fsync como en producción)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(
+            f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+            connect_args={"check_same_thread": False},
+        )
+        Base.metadata.create_all(bind=engine)
+        try:
+            yield engine
+        finally:
+            engine.dispose()
+
+
+def session_factory(engine: Engine) -> sessionmaker:
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def build_facade(session: Session, fee_type: str = "no", risk: bool = False) -> BankingFacade:
+    """Fachada cableada igual que en la API, con reglas de riesgo opcionales."""
+    config = ConfigurationService()
+    config.set_fee_strategy(fee_type)
+    for rule in ("max_amount", "velocity", "daily_limit"):
+        config.set_risk_rule(rule, risk)
+    return get_facade(session, config)
+
+
+def seed_accounts(facade: BankingFacade, n: int, balance: Decimal = Decimal("1000000")) -> list[str]:
+    customer = facade.create_customer("Cliente Benchmark", f"bench-{time.time_ns()}@example.com")
+    ids = []
+    for _ in range(n):
+        account = facade.create_account(customer.id)
+        if balance > 0:
+            facade.deposit(account.id, balance)
+        ids.append(account.id)
+    return ids
+
+
+class CommitCounter:
+    """Cuenta los COMMIT emitidos por un Engine."""
+
+    def __init__(self, engine: Engine) -> None:
+        self.count = 0
+        event.listen(engine, "commit", self._on_commit)
+
+    def _on_commit(self, conn) -> None:
+        self.count += 1
+
+    def reset(self) -> None:
+        self.count = 0
+
+
+def timed(fn: Callable[[], object], repeat: int) -> float:
+    """Ejecuta fn `repeat` veces y retorna los segundos totales."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return time.perf_counter() - start
+
+
+def report(title: str, rows: list[tuple]) -> None:
+    """Imprime una tabla simple de resultados."""
+    print(f"\n== {title} ==")
+    for row in rows:
+        print("  " + " | ".join(str(c) for c in row))
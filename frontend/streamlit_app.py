@@ -17,13 +17,25 @@ page = st.sidebar.radio("Seleccione una pagina:", ["Crear Cliente", "Crear Cuent
 
 # --- FUNCIONES DE APOYO (Manejo de errores solicitado) ---
 
+def cached_get(url):
+    """GET con revalidacion: reenvia el ETag guardado y si la API responde 304 reutiliza la respuesta anterior."""
+    cache = st.session_state.setdefault("etag_cache", {})
+    headers = {"If-None-Match": cache[url][0]} if url in cache else {}
+    resp = requests.get(url, headers=headers, timeout=TIMEOUT)
+    if resp.status_code == 304 and url in cache:
+        return cache[url][1]
+    etag = resp.headers.get("ETag")
+    if resp.status_code == 200 and etag:
+        cache[url] = (etag, resp)
+    return resp
+
 def call_api(method, endpoint, json=None):
     """Manejo basico de errores: timeout y conexion."""
     url = f"{API_URL}/{endpoint.lstrip('/')}"
     try:
         if method == "POST":
             return requests.post(url, json=json, timeout=TIMEOUT)
-        return requests.get(url, timeout=TIMEOUT)
+        return cached_get(url)
     except requests.exceptions.ConnectionError:
         st.error("Error: No se pudo conectar con la API. Verifique que el servicio api este corriendo.")
     except requests.exceptions.Timeout:
@@ -0,0 +1,93 @@
+"""El modo API_MODE=async debe comportarse igual que el síncrono (SQLite vía aiosqlite)."""
+import pytest
+from decimal import Decimal
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.application.main import create_app
+from app.infra.async_database import get_async_db, to_async_url
+from app.infra.database import get_db
+from app.repositories.models import Base
+
+
+def test_async_url_swaps_driver():
+    assert to_async_url("sqlite:///./fintech.db") == "sqlite+aiosqlite:///./fintech.db"
+    assert to_async_url("postgresql://u:p@db:5432/x") == "postgresql+asyncpg://u:p@db:5432/x"
+
+
+def test_invalid_api_mode_is_rejected():
+    with pytest.raises(ValueError):
+        create_app("threads")
+
+
+def _client(mode: str, db_path) -> TestClient:
+    url = f"sqlite:///{db_path}"
+    sync_engine = create_engine(url, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=sync_engine)
+    SyncSession = sessionmaker(autocommit=False, autoflush=False, bind=sync_engine)
+    AsyncSession = async_sessionmaker(
+        create_async_engine(to_async_url(url), poolclass=NullPool),
+        autoflush=False, expire_on_commit=False,
+    )
+
+    def override_get_db():
+        db = SyncSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db():
+        async with AsyncSession() as session:
+            yield session
+
+    app = create_app(mode)
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    return TestClient(app)
+
+
+def _scenario(client: TestClient) -> list:
+    """Mismo recorrido en ambos modos; retorna lo observable (códigos, saldos, estados)."""
+    observed = []
+    customer = client.post("/customers", json={"name": "Juan Pérez", "email": "juan@example.com"})
+    observed.append(customer.status_code)
+    duplicate = client.post("/customers", json={"name": "Juan Pérez", "email": "juan@example.com"})
+    observed.append(duplicate.status_code)
+    customer_id = customer.json()["id"]
+    source = client.post("/accounts", json={"customer_id": customer_id}).json()["id"]
+    target = client.post("/accounts", json={"customer_id": customer_id}).json()["id"]
+
+    for path, body in [
+        ("/transactions/deposit", {"account_id": source, "amount": "100"}),
+        ("/transactions/withdraw", {"account_id": source, "amount": "500"}),
+        ("/transactions/transfer", {"from_account_id": source, "to_account_id": target, "amount": "30"}),
+        ("/transactions/deposit", {"account_id": source, "amount": "999999"}),
+        ("/transactions/deposit", {"account_id": "no-existe", "amount": "1"}),
+    ]:
+        resp = client.post(path, json=body)
+        observed.append((resp.status_code, resp.json().get("status")))
+
+    for account_id in (source, target):
+        observed.append(Decimal(client.get(f"/accounts/{account_id}").json()["balance"]))
+    observed.append(client.get("/accounts/no-existe").status_code)
+
+    history = client.get(f"/accounts/{source}/transactions", params={"limit": 2})
+    observed.append([(t["type"], t["status"]) for t in history.json()])
+    cursor = history.headers.get("X-Next-Cursor")
+    rest = client.get(f"/accounts/{source}/transactions", params={"limit": 10, "cursor": cursor})
+    observed.append([(t["type"], t["status"]) for t in rest.json()])
+    return observed
+
+
+def test_async_mode_matches_sync_mode(tmp_path):
+    results = {}
+    for mode in ("sync", "async"):
+        with _client(mode, tmp_path / f"{mode}.db") as client:
+            assert client.get("/health").json()["mode"] == mode
+            results[mode] = _scenario(client)
+    assert results["async"] == results["sync"]
@@ -1,15 +1,24 @@
+import csv
+import io
+import json
 import pytest
 from decimal import Decimal
 
 from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
+from app.api.idempotency import REPLAYED_HEADER, get_idempotency_store
+from app.api.serializers import transactions_json
 from app.application.main import app
 from app.infra.database import get_db
+from app.infra.idempotency import IdempotencyStore
 from app.repositories.models import Base, AccountModel
-from app.domain.enums import AccountStatus
+from app.domain.entities import Transaction
+from app.domain.enums import AccountStatus, TransactionStatus, TransactionType
+from app.schemas.dto import TransactionResponse
 
 
 # Configuración de base de datos de prueba (SQLite in-memory)
@@ -40,6 +49,8 @@ def reset_database():
     """
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
+    store = IdempotencyStore(engine)
+    app.dependency_overrides[get_idempotency_store] = lambda: store
     yield
 
 @pytest.fixture
@@ -176,6 +187,153 @@ def test_list_transactions_paginated(client: TestClient):
         assert tx["id"]
         assert tx["type"] == "DEPOSIT"
 
+def test_list_transactions_cursor_walks_all_pages(client: TestClient):
+    customer_id = _create_customer(client)
+    account_id = _create_account(client, customer_id)
+    for amt in ["10", "20", "30", "40"]:
+        resp = client.post(
+            "/transactions/deposit",
+            json={"account_id": account_id, "amount": amt},
+        )
+        assert resp.status_code == 201
+
+    seen = []
+    params = {"limit": 2}
+    while True:
+        resp = client.get(f"/accounts/{account_id}/transactions", params=params)
+        assert resp.status_code == 200
+        seen.extend(tx["id"] for tx in resp.json())
+        next_cursor = resp.headers.get("X-Next-Cursor")
+        if not next_cursor:
+            break
+        params = {"limit": 2, "cursor": next_cursor}
+
+    # Mismo orden que la paginación por offset, sin repetir filas
+    by_offset = client.get(f"/accounts/{account_id}/transactions", params={"limit": 100}).json()
+    assert seen == [tx["id"] for tx in by_offset]
+    assert len(seen) == 4
+
+def test_export_streams_full_history_as_ndjson_and_csv(client: TestClient):
+    customer_id = _create_customer(client)
+    account_id = _create_account(client, customer_id)
+    for amt in ["10", "20", "30"]:
+        client.post("/transactions/deposit", json={"account_id": account_id, "amount": amt})
+    client.post("/transactions/withdraw", json={"account_id": account_id, "amount": "1000"})
+
+    resp = client.get(f"/accounts/{account_id}/transactions/export", params={"format": "ndjson"})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    # Más antiguas primero, incluida la transacción rechazada
+    assert [(r["type"], r["status"]) for r in rows] == [
+        ("DEPOSIT", "APPROVED"), ("DEPOSIT", "APPROVED"), ("DEPOSIT", "APPROVED"), ("WITHDRAWAL", "REJECTED"),
+    ]
+    assert [Decimal(r["amount"]) for r in rows] == [Decimal("10"), Decimal("20"), Decimal("30"), Decimal("1000")]
+
+    resp = client.get(f"/accounts/{account_id}/transactions/export", params={"format": "csv"})
+    assert resp.status_code == 200
+    records = list(csv.DictReader(io.StringIO(resp.text)))
+    assert [r["id"] for r in records] == [r["id"] for r in rows]
+
+    assert client.get(f"/accounts/{account_id}/transactions/export", params={"format": "xml"}).status_code == 400
+    assert client.get("/accounts/no-existe/transactions/export").status_code == 404
+
+def test_list_transactions_invalid_cursor_returns_400(client: TestClient):
+    customer_id = _create_customer(client)
+    account_id = _create_account(client, customer_id)
+    resp = client.get(f"/accounts/{account_id}/transactions", params={"cursor": "no-es-un-cursor"})
+    assert resp.status_code == 400
+
+def test_conditional_get_returns_304_until_account_or_history_changes(client: TestClient):
+    customer_id = _create_customer(client)
+    account_id = _create_account(client, customer_id)
+    client.post("/transactions/deposit", json={"account_id": account_id, "amount": "10"})
+
+    account = client.get(f"/accounts/{account_id}")
+    history = client.get(f"/accounts/{account_id}/transactions")
+    account_etag, history_etag = account.headers["ETag"], history.headers["ETag"]
+
+    resp = client.get(f"/accounts/{account_id}", headers={"If-None-Match": account_etag})
+    assert resp.status_code == 304
+    assert resp.content == b""
+    assert resp.headers["ETag"] == account_etag
+    resp = client.get(f"/accounts/{account_id}/transactions", headers={"If-None-Match": f"W/{history_etag}"})
+    assert resp.status_code == 304
+    # Otra página del mismo historial tiene otro ETag
+    resp = client.get(f"/accounts/{account_id}/transactions", params={"limit": 5},
+                      headers={"If-None-Match": history_etag})
+    assert resp.status_code == 200
+
+    # Un retiro rechazado no mueve el saldo pero sí agrega una transacción al historial
+    resp = client.post("/transactions/withdraw", json={"account_id": account_id, "amount": "1000"})
+    assert resp.status_code == 400
+    assert client.get(f"/accounts/{account_id}", headers={"If-None-Match": account_etag}).status_code == 304
+    resp = client.get(f"/accounts/{account_id}/transactions", headers={"If-None-Match": history_etag})
+    assert resp.status_code == 200
+    assert resp.headers["ETag"] != history_etag
+
+    client.post("/transactions/deposit", json={"account_id": account_id, "amount": "5"})
+    resp = client.get(f"/accounts/{account_id}", headers={"If-None-Match": account_etag})
+    assert resp.status_code == 200
+    assert resp.headers["ETag"] != account_etag
+
+def test_transactions_fast_serializer_matches_response_model():
+    deposit = Transaction(account_id="a", amount=Decimal("10.50"), type=TransactionType.DEPOSIT, currency="USD")
+    deposit.transition_to(TransactionStatus.APPROVED)
+    transfer = Transaction(account_id="a", amount=Decimal("3"), type=TransactionType.TRANSFER,
+                           currency="USD", target_account_id="b", metadata={"applied_fee": "0.50"})
+    transfer.transition_to(TransactionStatus.REJECTED)
+    transactions = [deposit, transfer]
+
+    models = [
+        TransactionResponse(id=t.id, type=t.type, amount=t.amount, currency=t.currency,
+                            status=t.status, created_at=t.created_at)
+        for t in transactions
+    ]
+    assert transactions_json(transactions) == TypeAdapter(list[TransactionResponse]).dump_json(models)
+    assert transactions_json([]) == b"[]"
+
+def test_retry_with_idempotency_key_replays_original_response(client: TestClient):
+    customer_id = _create_customer(client)
+    account_id = _create_account(client, customer_id)
+    headers = {"Idempotency-Key": "retry-1"}
+    body = {"account_id": account_id, "amount": "100"}
+
+    first = client.post("/transactions/deposit", json=body, headers=headers)
+    retry = client.post("/transactions/deposit", json=body, headers=headers)
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json()
+    assert retry.headers[REPLAYED_HEADER] == "true"
+    assert len(client.get(f"/accounts/{account_id}/transactions").json()) == 1
+
+    # Los errores de dominio también se repiten tal cual
+    over = {"account_id": account_id, "amount": "5000"}
+    headers = {"Idempotency-Key": "retry-2"}
+    assert client.post("/transactions/withdraw", json=over, headers=headers).status_code == 400
+    assert client.post("/transactions/withdraw", json=over, headers=headers).status_code == 400
+
+    # Misma key con otro cuerpo: conflicto
+    other = client.post("/transactions/deposit", json={**body, "amount": "7"}, headers={"Idempotency-Key": "retry-1"})
+    assert other.status_code == 409
+
+class _CompleteFailsStore(IdempotencyStore):
+    """La respuesta queda en el LRU pero la tabla no se actualiza (p. ej. conexión perdida)."""
+
+    def complete(self, key: str, fingerprint: str, status_code: int, body: str) -> None:
+        super().complete(key, fingerprint, status_code, body)
+        raise RuntimeError("conexión perdida")
+
+def test_failed_response_store_still_returns_committed_movement(client: TestClient):
+    customer_id = _create_customer(client)
+    account_id = _create_account(client, customer_id)
+    app.dependency_overrides[get_idempotency_store] = lambda: _CompleteFailsStore(engine)
+    headers = {"Idempotency-Key": "store-fails"}
+    body = {"account_id": account_id, "amount": "100"}
+
+    resp = client.post("/transactions/deposit", json=body, headers=headers)
+    assert resp.status_code == 201
+    assert len(client.get(f"/accounts/{account_id}/transactions").json()) == 1
+
 def test_deposit_on_frozen_account_returns_403(client: TestClient):
     customer_id = _create_customer(client)
     account_id = _create_account(client, customer_id)
@@ -197,4 +355,50 @@ def test_deposit_on_frozen_account_returns_403(client: TestClient):
     )
     assert resp.status_code == 403
     body = resp.json()
-    assert "No se puede operar" in body["detail"]
\ No newline at end of file
+    assert "No se puede operar" in body["detail"]
+
+
+def test_batch_reports_each_operation(client: TestClient):
+    customer_id = _create_customer(client)
+    source = _create_account(client, customer_id)
+    target = _create_account(client, customer_id)
+
+    resp = client.post("/transactions/batch", json={"operations": [
+        {"type": "DEPOSIT", "account_id": source, "amount": "100"},
+        {"type": "WITHDRAWAL", "account_id": target, "amount": "10"},
+        {"type": "TRANSFER", "account_id": source, "to_account_id": target, "amount": "30"},
+    ]})
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert (body["approved"], body["failed"], body["not_executed"]) == (2, 1, 0)
+    deposit, withdrawal, transfer = body["results"]
+    assert deposit["transaction"]["status"] == "APPROVED"
+    assert withdrawal["transaction"] is None
+    assert withdrawal["error_status"] == 400
+    assert transfer["transaction"]["type"] == "TRANSFER"
+    assert Decimal(client.get(f"/accounts/{target}").json()["balance"]) == Decimal("30")
+
+def test_batch_transfer_requires_target(client: TestClient):
+    customer_id = _create_customer(client)
+    account_id = _create_account(client, customer_id)
+    resp = client.post("/transactions/batch", json={"operations": [
+        {"type": "TRANSFER", "account_id": account_id, "amount": "5"},
+    ]})
+    assert resp.status_code == 422
+
+def test_import_customers_from_csv(client: TestClient):
+    _create_customer(client, email="juan@example.com")
+    body = "name,email\nAna Gómez,ana@example.com\nJuan Pérez,juan@example.com\nLuis Díaz,luis@example.com\n"
+    resp = client.post(
+        "/imports/customers",
+        params={"format": "csv"},
+        content=body.encode("utf-8"),
+        headers={"Content-Type": "text/csv"},
+    )
+    assert resp.status_code == 200
+    report = resp.json()
+    assert report["customers_created"] == 2
+    assert report["accounts_created"] == 2
+    assert report["rejected_count"] == 1
+    assert report["rejected"][0]["line"] == 3
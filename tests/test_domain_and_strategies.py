@@ -1,3 +1,4 @@
+import random
 from datetime import datetime, timedelta
 from decimal import Decimal
 from unittest.mock import MagicMock
@@ -18,7 +19,11 @@ from app.services.fee_strategies import (
     FlatFeeStrategy,
     PercentFeeStrategy,
 )
-from app.services.risk_strategies import MaxAmountRule, VelocityRule
+from app.domain.activity import BucketedActivity, day_bucket, minute_bucket
+from app.services.risk_strategies import MaxAmountRule, VelocityRule, DailyLimitRule
+from app.services.configuration_service import ConfigurationService
+from app.services.risk_backtest import HistoryChunk, score_chunk
+from app.services.risk_engine import RiskPlan
 
 
 # Dominio: Account / Customer / Transaction
@@ -184,4 +189,115 @@ def test_velocity_rule_rejects_too_many_transactions_in_window():
     )
     ok, msg = rule.validate(new_tx, account, recent)
     assert ok is False
-    assert "Demasiadas transacciones" in msg
\ No newline at end of file
+    assert "Demasiadas transacciones" in msg
+
+
+def test_risk_rules_read_bucketed_counters():
+    """VelocityRule y DailyLimitRule funcionan igual sobre contadores agregados."""
+    account = Account(
+        customer_id="cust-1",
+        currency="USD",
+        _balance=Decimal("5000"),
+        _status=AccountStatus.ACTIVE,
+    )
+    now = datetime.utcnow()
+    activity = BucketedActivity(
+        minute_buckets={minute_bucket(now - timedelta(minutes=1)): (3, Decimal("60"))},
+        day_start=day_bucket(now),
+        day_totals=(3, Decimal("1990")),
+    )
+    new_tx = Transaction(
+        account_id=account.id,
+        amount=Decimal("20"),
+        type=TransactionType.DEPOSIT,
+        currency="USD",
+    )
+
+    ok, msg = VelocityRule(max_transactions=3, time_window_minutes=10).validate(new_tx, account, activity)
+    assert ok is False
+    assert "Demasiadas transacciones (3)" in msg
+
+    ok, msg = DailyLimitRule(daily_limit=Decimal("2000")).validate(new_tx, account, activity)
+    assert ok is False
+    assert "2010" in msg
+
+
+def test_configuration_reuses_strategies_until_config_changes():
+    config = ConfigurationService()
+    fee, rules = config.get_current_fee_strategy(), config.get_current_risk_strategies()
+    assert config.get_current_fee_strategy() is fee
+    assert config.get_current_risk_strategies() is rules
+
+    version = config.version
+    config.set_fee_strategy("flat")  # sin cambio efectivo
+    assert config.version == version
+    assert config.get_current_fee_strategy() is fee
+
+    config.set_fee_strategy("percent")
+    config.set_risk_rule("velocity", False)
+    assert config.version == version + 2
+    assert isinstance(config.get_current_fee_strategy(), PercentFeeStrategy)
+    assert not any(isinstance(rule, VelocityRule) for rule in config.get_current_risk_strategies())
+
+
+def test_risk_plan_returns_same_first_failure_as_rules():
+    """Una pasada sobre la actividad, mismo primer rechazo que validar regla por regla."""
+    account = Account(customer_id="cust-1", currency="USD", _balance=Decimal("5000"))
+    now = datetime.utcnow()
+    history = [
+        Transaction(account_id=account.id, amount=Decimal("400"), type=TransactionType.DEPOSIT,
+                    currency="USD", created_at=now - timedelta(minutes=minutes))
+        for minutes in (1, 2, 3, 4, 30)
+    ]
+
+    class BlockAll:
+        def validate(self, transaction, account, recent):
+            return False, "Bloqueada"
+
+    rule_sets = [
+        [MaxAmountRule(), VelocityRule(), DailyLimitRule()],
+        [DailyLimitRule(), VelocityRule()],
+        [VelocityRule(max_transactions=9), VelocityRule(max_transactions=9), DailyLimitRule(Decimal("5000"))],
+        [MaxAmountRule(), BlockAll(), VelocityRule()],
+        [],
+    ]
+    for rules in rule_sets:
+        plan = RiskPlan(rules)
+        for amount in (Decimal("20"), Decimal("1500")):
+            tx = Transaction(account_id=account.id, amount=amount, type=TransactionType.DEPOSIT, currency="USD")
+            expected = next(
+                ((False, msg) for ok, msg in (r.validate(tx, account, history) for r in rules) if not ok),
+                (True, ""),
+            )
+            assert plan.evaluate(tx, account, history, now=now) == expected
+
+
+def test_vectorized_backtest_matches_rules_per_transaction():
+    """Cada veredicto coincide con validar la transacción en su momento contra las anteriores."""
+    rng = random.Random(7)
+    start = datetime(2024, 3, 1, 23, 0)
+    history = []
+    for account_id in ("acc-a", "acc-b", "acc-c"):
+        at = start
+        for _ in range(120):
+            # Varias transacciones en el mismo instante y cruces de medianoche
+            at += timedelta(seconds=rng.choice([0, 1, 30, 90, 400, 3600]))
+            history.append(Transaction(
+                account_id=account_id, amount=Decimal(rng.randint(1, 90000)) / 100,
+                type=TransactionType.DEPOSIT, currency="USD", created_at=at,
+            ))
+    rules = [MaxAmountRule(Decimal("600.5")), VelocityRule(max_transactions=4, time_window_minutes=10),
+             DailyLimitRule(Decimal("3000.01"))]
+
+    chunk = HistoryChunk.from_transactions(history)
+    verdicts = score_chunk(chunk, rules)
+
+    ordered = sorted(history, key=lambda t: (t.account_id, t.created_at, t.id))
+    account = Account(customer_id="cust-1", currency="USD", _balance=Decimal("0"))
+    for i, tx in enumerate(ordered):
+        previous = [t for t in ordered[:i] if t.account_id == tx.account_id]
+        for rule, name in zip(rules, ("max_amount", "velocity", "daily_limit")):
+            ok, _ = RiskPlan([rule]).evaluate(tx, account, previous, now=tx.created_at)
+            assert verdicts[name][i] == (not ok), (name, i)
+    assert all(v.any() and not v.all() for v in verdicts.values())
+
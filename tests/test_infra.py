@@ -0,0 +1,133 @@
+"""Tests de perfiles de conexión, instrumentación del pool e idempotencia"""
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, exc, text
+
+from app.application.main import create_app
+from app.domain.exceptions import IdempotencyConflictError
+from app.infra.db_config import apply_sqlite_pragmas, engine_kwargs, load_profile
+from app.infra.idempotency import IdempotencyStore
+from app.infra.pool_stats import InstrumentedQueuePool, pool_status
+from app.repositories.models import Base
+
+
+def test_profile_from_env_with_overrides():
+    profile = load_profile(env={
+        "DB_PROFILE": "sqlite-fast",
+        "DB_POOL_SIZE": "7",
+        "DB_SQLITE_PRAGMAS": "synchronous=FULL",
+    })
+    assert profile.pool_size == 7
+    assert profile.max_overflow == 20
+    assert profile.sqlite_pragmas["synchronous"] == "FULL"
+    assert profile.sqlite_pragmas["journal_mode"] == "WAL"
+
+    with pytest.raises(ValueError):
+        load_profile(env={"DB_PROFILE": "oracle-turbo"})
+    with pytest.raises(ValueError):
+        load_profile(env={"DB_SQLITE_PRAGMAS": "journal_mode=WAL; DROP TABLE x"})
+
+
+def test_sqlite_fast_profile_applies_pragmas_and_pool(tmp_path):
+    url = f"sqlite:///{tmp_path / 'fast.db'}"
+    profile = load_profile("sqlite-fast", env={})
+    engine = create_engine(url, **engine_kwargs(url, profile))
+    apply_sqlite_pragmas(engine, profile.sqlite_pragmas)
+    try:
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert isinstance(engine.pool, InstrumentedQueuePool)
+        assert engine.pool.size() == 20
+    finally:
+        engine.dispose()
+
+
+def test_pool_stats_track_checkouts_waits_and_timeouts(tmp_path):
+    url = f"sqlite:///{tmp_path / 'pool.db'}"
+    profile = load_profile(env={"DB_POOL_SIZE": "1", "DB_MAX_OVERFLOW": "0", "DB_POOL_TIMEOUT": "0.2"})
+    engine = create_engine(url, **engine_kwargs(url, profile))
+    try:
+        held = engine.connect()
+        assert pool_status(engine)["checked_out"] == 1
+
+        errors = []
+
+        def _wait():
+            try:
+                engine.connect()
+            except exc.TimeoutError as e:
+                errors.append(e)
+
+        waiter = threading.Thread(target=_wait)
+        waiter.start()
+        waiter.join()
+        held.close()
+        assert len(errors) == 1
+
+        status = pool_status(engine)
+        assert status["checked_out"] == 0
+        assert status["checkouts"] == 1
+        assert status["timeouts"] == 1
+        assert status["wait_max_ms"] >= 200
+        assert sum(status["wait_histogram"].values()) == 2
+    finally:
+        engine.dispose()
+
+
+def test_pool_endpoint_reports_profile():
+    with TestClient(create_app("sync")) as client:
+        body = client.get("/infra/pool").json()
+    assert body["profile"] == "default"
+    assert "pool_class" in body["sync"]
+
+
+def test_concurrent_duplicates_wait_for_first_request(tmp_path):
+    """Dos workers (dos almacenes sobre la misma base) y varios hilos con la misma key."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'idem.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    workers = [IdempotencyStore(engine), IdempotencyStore(engine)]
+    executions, responses = [], []
+
+    def request(store: IdempotencyStore) -> None:
+        stored = store.begin("k-1", "fp")
+        if stored is None:
+            executions.append(1)
+            time.sleep(0.2)
+            store.complete("k-1", "fp", 201, '{"id": "tx-1"}')
+            responses.append('{"id": "tx-1"}')
+        else:
+            responses.append(stored.body)
+
+    threads = [threading.Thread(target=request, args=(workers[i % 2],)) for i in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    engine.dispose()
+
+    assert len(executions) == 1
+    assert responses == ['{"id": "tx-1"}'] * 6
+
+
+def test_in_flight_key_is_leased_and_stored_response_uses_ttl(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'idem.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    dead, retry = (IdempotencyStore(engine, wait_seconds=0.05, lease_seconds=0.2) for _ in range(2))
+    try:
+        # El primer worker reserva la key y muere sin guardar la respuesta
+        assert dead.begin("k-1", "fp") is None
+        with pytest.raises(IdempotencyConflictError):
+            retry.begin("k-1", "fp")
+        time.sleep(0.25)
+        assert retry.begin("k-1", "fp") is None
+        retry.complete("k-1", "fp", 201, '{"id": "tx-1"}')
+
+        # Con respuesta guardada la key dura el TTL, no la reserva
+        time.sleep(0.25)
+        assert IdempotencyStore(engine, lease_seconds=0.2).begin("k-1", "fp").body == '{"id": "tx-1"}'
+    finally:
+        engine.dispose()
@@ -0,0 +1,78 @@
+"""Tests de los repositorios en memoria y sus índices secundarios"""
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from app.application.in_memory import build_in_memory_facade
+from app.domain.entities import Customer, Account, Transaction
+from app.domain.enums import TransactionStatus, TransactionType
+from app.repositories.memory import (
+    InMemoryCustomerRepo,
+    InMemoryAccountRepo,
+    InMemoryTransactionRepo,
+)
+
+
+def test_customer_email_index_follows_updates():
+    repo = InMemoryCustomerRepo()
+    customer = Customer(name="Ana Gómez", email="ana@example.com")
+    repo.add(customer)
+    assert repo.get_by_email("ana@example.com") is customer
+
+    customer.email = "ana.gomez@example.com"
+    repo.update(customer)
+    assert repo.get_by_email("ana@example.com") is None
+    assert repo.get_by_email("ana.gomez@example.com") is customer
+
+
+def test_account_indexes_by_customer_and_currency():
+    repo = InMemoryAccountRepo()
+    usd = Account(customer_id="c1", currency="USD")
+    eur = Account(customer_id="c1", currency="EUR")
+    other = Account(customer_id="c2", currency="USD")
+    for account in (usd, eur, other):
+        repo.add(account)
+
+    assert [a.id for a in repo.list_by_customer("c1")] == [usd.id, eur.id]
+    assert [a.id for a in repo.find_by_currency("USD")] == [usd.id, other.id]
+    assert repo.list_by_customer("c3") == []
+
+    eur.currency = "USD"
+    repo.update(eur)
+    assert [a.id for a in repo.find_by_currency("EUR")] == []
+    assert {a.id for a in repo.find_by_currency("USD")} == {usd.id, eur.id, other.id}
+
+
+def test_transaction_time_index_answers_windows():
+    repo = InMemoryTransactionRepo()
+    now = datetime.utcnow()
+    old = Transaction(account_id="a1", amount=Decimal("1"), type=TransactionType.DEPOSIT,
+                      currency="USD", created_at=now - timedelta(hours=2))
+    recent = Transaction(account_id="a1", amount=Decimal("2"), type=TransactionType.DEPOSIT,
+                         currency="USD", created_at=now - timedelta(minutes=5))
+    foreign = Transaction(account_id="a2", amount=Decimal("3"), type=TransactionType.DEPOSIT,
+                          currency="USD", created_at=now - timedelta(minutes=1))
+    # Se insertan desordenados: el índice mantiene el orden por created_at
+    for tx in (recent, foreign, old):
+        repo.add(tx)
+
+    assert repo.list_by_account("a1") == [old, recent]
+    assert repo.list_recent("a1", minutes=60) == [recent]
+    assert repo.list_page("a1", limit=10) == [recent, old]
+
+
+def test_real_services_run_on_in_memory_backend():
+    facade = build_in_memory_facade()
+    customer = facade.create_customer("Ana Gómez", "ana@example.com")
+    source = facade.create_account(customer.id)
+    target = facade.create_account(customer.id)
+
+    facade.deposit(source.id, Decimal("100"))
+    facade.withdraw(source.id, Decimal("10"))
+    transfer = facade.transfer(source.id, target.id, Decimal("20"))
+
+    assert transfer.status == TransactionStatus.APPROVED
+    # Comisión fija por defecto: 0.50 por operación
+    assert facade.get_account(source.id).balance == Decimal("68.50")
+    assert facade.get_account(target.id).balance == Decimal("20")
+    assert len(facade.list_transactions(source.id, limit=10)) == 3
+    assert len(facade.transaction_repo.find_recent(source.id, minutes=60)) == 3
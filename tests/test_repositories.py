@@ -0,0 +1,812 @@
+"""Tests de los repositorios SQL y la unidad de trabajo (SQLite en memoria)"""
+import io
+import threading
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, delete, event, select, update
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.api import deps
+from app.api.deps import get_facade
+from app.domain.entities import Account, Transaction
+from app.domain.enums import AccountStatus, TransactionStatus, TransactionType
+from app.domain.exceptions import (
+    InfrastructureError,
+    InsufficientFundsError,
+    MissingFeeError,
+    TransactionRejectedError,
+    ValidationError,
+)
+from app.domain.ledger import SYSTEM_CASH_ACCOUNT, SYSTEM_FEES_ACCOUNT, LedgerEntry
+from app.domain.statement import MonthlyStatement
+from app.infra.archive import TransactionArchive
+from app.repositories.account_cache import AccountCache
+from app.repositories.config_store import FileConfigStore, SQLConfigStore
+from app.repositories.models import Base, AccountModel, LedgerEntryModel, TransactionModel
+from app.repositories.memory import InMemoryAccountRepo, InMemoryLedgerRepo, InMemoryStatementRepo, InMemoryTransactionRepo
+from app.repositories.row_mapper import select_transactions, transaction_from_row
+from app.repositories.sqlalchemy_repo import (
+    SQLAccountRepository,
+    SQLLedgerRepository,
+    SQLStatementRepository,
+    SQLTransactionRepository,
+)
+from app.services.archive_service import archive_transactions
+from app.services.batch_service import BatchOperation, BatchService
+from app.services.risk_backtest import backtest, iter_history_chunks
+from app.services.risk_engine import RiskPlan
+from app.services.risk_strategies import MaxAmountRule, VelocityRule
+from app.services.import_service import ImportService, iter_ndjson_rows
+from app.services.configuration_service import ConfigurationService
+from app.services.fee_backfill import backfill_applied_fees
+from app.services.statement_service import StatementService
+
+
+@pytest.fixture
+def engine():
+    eng = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=eng)
+    yield eng
+    eng.dispose()
+
+
+@pytest.fixture
+def session(engine):
+    s = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    yield s
+    s.close()
+
+
+@pytest.fixture
+def commits(engine):
+    """Cuenta los COMMIT que llegan a la base de datos."""
+    counter = {"n": 0}
+
+    def _on_commit(conn):
+        counter["n"] += 1
+
+    event.listen(engine, "commit", _on_commit)
+    return counter
+
+
+def _facade(session, fee_type: str = "no"):
+    config = ConfigurationService()
+    config.set_fee_strategy(fee_type)
+    return get_facade(session, config)
+
+
+def _funded_account(facade, amount: str = "500"):
+    customer = facade.create_customer("Juan Pérez", "juan@example.com")
+    account = facade.create_account(customer.id)
+    facade.deposit(account.id, Decimal(amount))
+    return account
+
+
+# Unidad de trabajo
+
+def test_each_money_movement_commits_once(session, commits):
+    facade = _facade(session)
+    source = _funded_account(facade)
+    target = facade.create_account(source.customer_id)
+
+    commits["n"] = 0
+    facade.deposit(source.id, Decimal("10"))
+    assert commits["n"] == 1
+
+    commits["n"] = 0
+    facade.withdraw(source.id, Decimal("10"))
+    assert commits["n"] == 1
+
+    commits["n"] = 0
+    facade.transfer(source.id, target.id, Decimal("10"))
+    assert commits["n"] == 1
+
+
+def test_infrastructure_failure_rolls_back_whole_transfer(session, monkeypatch):
+    facade = _facade(session)
+    source = _funded_account(facade, "200")
+    target = facade.create_account(source.customer_id)
+
+    update_status = facade.transaction_repo.update_status
+
+    def _fail_on_approve(transaction_id, status):
+        if status == TransactionStatus.APPROVED:
+            raise RuntimeError("conexión perdida")
+        update_status(transaction_id, status)
+
+    monkeypatch.setattr(facade.transaction_repo, "update_status", _fail_on_approve)
+    with pytest.raises(ValidationError):
+        facade.transfer(source.id, target.id, Decimal("50"))
+
+    balances = {m.id: m.balance for m in session.query(AccountModel).all()}
+    assert balances[source.id] == Decimal("200")
+    assert balances[target.id] == Decimal("0")
+    assert session.query(TransactionModel).filter_by(account_id=source.id).count() == 1
+
+
+def test_rejected_transaction_is_still_committed(session, engine):
+    facade = _facade(session)
+    account = _funded_account(facade, "100")
+
+    with pytest.raises(TransactionRejectedError):
+        facade.deposit(account.id, Decimal("5000"))
+
+    other = sessionmaker(bind=engine)()
+    try:
+        statuses = [m.status for m in other.query(TransactionModel).filter_by(account_id=account.id)]
+    finally:
+        other.close()
+    assert TransactionStatus.REJECTED in statuses
+
+
+# Débitos y créditos atómicos (UPDATE condicional)
+
+def test_conditional_debit_only_applies_with_funds_and_active_status(session):
+    facade = _facade(session)
+    account = _funded_account(facade, "100")
+    repo = SQLAccountRepository(session)
+
+    assert repo.debit(account.id, Decimal("150")) is False
+    assert repo.debit(account.id, Decimal("60")) is True
+    assert repo.get_by_id(account.id).balance == Decimal("40")
+
+    frozen = repo.get_by_id(account.id)
+    frozen.transition_to(AccountStatus.FROZEN)
+    repo.update(frozen)
+    assert repo.debit(account.id, Decimal("10")) is False
+    assert repo.credit(account.id, Decimal("10")) is False
+    assert repo.get_by_id(account.id).balance == Decimal("40")
+
+
+def test_stale_read_cannot_overdraw_account(session, monkeypatch):
+    """Dos retiros que leyeron el mismo saldo: el segundo no puede pisar al primero."""
+    facade = _facade(session)
+    account = _funded_account(facade, "100")
+    stale = facade.account_repo.get_by_id(account.id)
+
+    facade.withdraw(account.id, Decimal("80"))
+
+    monkeypatch.setattr(facade.account_repo, "get_by_id", lambda account_id: stale)
+    with pytest.raises(InsufficientFundsError):
+        facade.withdraw(account.id, Decimal("50"))
+
+    session.expire_all()
+    assert session.get(AccountModel, account.id).balance == Decimal("20")
+
+
+def test_concurrent_cross_transfers_conserve_money(tmp_path):
+    """Transferencias cruzadas A<->B desde varios hilos: sin deadlocks ni dinero perdido."""
+    eng = create_engine(
+        f"sqlite:///{tmp_path / 'stress.db'}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+    Base.metadata.create_all(bind=eng)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=eng)
+
+    def facade_for(s):
+        config = ConfigurationService()
+        config.set_fee_strategy("no")
+        for rule in ("max_amount", "velocity", "daily_limit"):
+            config.set_risk_rule(rule, False)
+        return get_facade(s, config)
+
+    with Session() as s:
+        facade = facade_for(s)
+        customer = facade.create_customer("Juan Pérez", "juan@example.com")
+        accounts = [facade.create_account(customer.id).id for _ in range(3)]
+        for account_id in accounts:
+            facade.deposit(account_id, Decimal("100"))
+
+    errors = []
+
+    def worker(n: int) -> None:
+        with Session() as s:
+            facade = facade_for(s)
+            for i in range(40):
+                a, b = accounts[(n + i // 2) % 3], accounts[(n + i // 2 + 1) % 3]
+                src, dst = (a, b) if (n + i) % 2 else (b, a)
+                try:
+                    facade.transfer(src, dst, Decimal("7"))
+                except InsufficientFundsError:
+                    pass
+                except Exception as e:  # pragma: no cover - se reporta en el assert
+                    errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    with Session() as s:
+        balances = [s.get(AccountModel, a).balance for a in accounts]
+    assert sum(balances) == Decimal("300")
+    assert all(b >= 0 for b in balances)
+    eng.dispose()
+
+
+def test_ledger_records_balanced_legs_in_the_operation_commit(session, commits):
+    facade = _facade(session, fee_type="flat")
+    customer = facade.create_customer("Juan Pérez", "juan@example.com")
+    a, b = (facade.create_account(customer.id).id for _ in range(2))
+    commits["n"] = 0
+    facade.deposit(a, Decimal("100"))
+    facade.transfer(a, b, Decimal("30"))
+    facade.withdraw(b, Decimal("10"))
+    with pytest.raises(InsufficientFundsError):
+        facade.withdraw(b, Decimal("1000"))
+    assert commits["n"] == 4
+
+    entries = session.query(LedgerEntryModel).all()
+    by_transaction = {}
+    for entry in entries:
+        by_transaction.setdefault(entry.transaction_id, []).append(entry.amount)
+    assert len(by_transaction) == 3
+    assert all(sum(amounts) == 0 for amounts in by_transaction.values())
+    assert {e.kind for e in entries} == {"PRINCIPAL", "FEE"}
+
+    for account_id in (a, b):
+        assert facade.get_ledger_balance(account_id) == session.get(AccountModel, account_id).balance
+    fees = facade.get_ledger_balance(SYSTEM_FEES_ACCOUNT)
+    assert fees > 0
+    assert -facade.get_ledger_balance(SYSTEM_CASH_ACCOUNT) == Decimal("90") == (
+        facade.get_ledger_balance(a) + facade.get_ledger_balance(b) + fees
+    )
+
+
+@pytest.mark.parametrize("backend", ["sql", "memory"])
+def test_ledger_balance_from_snapshots_matches_full_replay(session, backend):
+    repo = SQLLedgerRepository(session) if backend == "sql" else InMemoryLedgerRepo()
+    base = datetime(2025, 1, 1)
+    entries = [
+        LedgerEntry(f"tx-{i}", f"acc-{i % 3}", Decimal(i % 7) - Decimal("2.5"), created_at=base + timedelta(hours=i))
+        for i in range(60)
+    ]
+    repo.add_entries(entries[:40])
+    assert repo.take_snapshots(base + timedelta(hours=10)) == 3
+    assert repo.take_snapshots(base + timedelta(hours=10)) == 0  # nada nuevo
+    assert repo.take_snapshots(base + timedelta(hours=25, minutes=30)) == 3
+    repo.add_entries(entries[40:])
+    assert repo.take_snapshots(base + timedelta(hours=50)) == 3
+
+    for hours in (0, 9, 10, 11, 25, 26, 49, 50, 51, 59, 80):
+        at = base + timedelta(hours=hours)
+        for account in ("acc-0", "acc-1", "acc-2"):
+            replay = sum((e.amount for e in entries if e.account_id == account and e.created_at <= at), Decimal("0"))
+            assert repo.balance_at(account, at) == replay
+
+
+# Estados de cuenta mensuales
+
+def test_statement_for_current_month_matches_account_balance(session):
+    facade = _facade(session, fee_type="flat")
+    customer = facade.create_customer("Juan Pérez", "juan@example.com")
+    a, b = (facade.create_account(customer.id).id for _ in range(2))
+    facade.deposit(a, Decimal("100"))
+    facade.transfer(a, b, Decimal("30"))
+    facade.withdraw(b, Decimal("10"))
+    with pytest.raises(InsufficientFundsError):
+        facade.withdraw(b, Decimal("1000"))
+
+    today = datetime.utcnow()
+    first = facade.get_statement(a, today.year, today.month)
+    second = facade.get_statement(b, today.year, today.month)
+    assert (first.deposits_count, first.transfers_out_count, first.withdrawals_count) == (1, 1, 0)
+    assert (second.transfers_in_count, second.withdrawals_count) == (1, 1)
+    for statement in (first, second):
+        assert statement.opening_balance == 0
+        assert statement.fees_total > 0
+        assert statement.closing_balance == session.get(AccountModel, statement.account_id).balance
+
+
+@pytest.mark.parametrize("backend", ["sql", "memory"])
+def test_closed_months_are_materialized_once_and_open_month_is_incremental(session, backend):
+    statements = SQLStatementRepository(session) if backend == "sql" else InMemoryStatementRepo()
+    transactions = SQLTransactionRepository(session) if backend == "sql" else InMemoryTransactionRepo()
+    accounts = InMemoryAccountRepo()
+    accounts.add(Account(id="a", customer_id="c", currency="USD", _balance=Decimal("0")))
+    service = StatementService(statements, transactions, accounts)
+
+    def record(day: datetime, type_: TransactionType, amount: str, fee: str = "0", target=None,
+               account: str = "a", status=TransactionStatus.APPROVED) -> None:
+        t = Transaction(account_id=account, amount=Decimal(amount), type=type_, currency="USD",
+                        target_account_id=target, created_at=day, metadata={"applied_fee": fee})
+        t.transition_to(status)
+        transactions.add(t)
+
+    record(datetime(2025, 1, 5), TransactionType.DEPOSIT, "100", fee="1")
+    record(datetime(2025, 1, 20), TransactionType.TRANSFER, "30", fee="0.5", target="b")
+    record(datetime(2025, 1, 21), TransactionType.WITHDRAWAL, "500", status=TransactionStatus.REJECTED)
+    record(datetime(2025, 2, 10), TransactionType.TRANSFER, "20", target="a", account="b")
+    record(datetime(2025, 3, 2), TransactionType.WITHDRAWAL, "10", fee="0.25")
+    now = datetime(2025, 3, 15)
+
+    march = service.monthly("a", 2025, 3, now=now)
+    january, february = statements.get("a", date(2025, 1, 1)), statements.get("a", date(2025, 2, 1))
+    assert january.closed and february.closed and not march.closed
+    assert (january.opening_balance, january.closing_balance, january.fees_total) == (0, Decimal("68.5"), Decimal("1.5"))
+    assert (february.opening_balance, february.transfers_in_total) == (Decimal("68.5"), Decimal("20"))
+    assert (march.opening_balance, march.closing_balance) == (Decimal("88.5"), Decimal("78.25"))
+
+    # Un mes cerrado se sirve desde la tabla: no vuelve a leer transacciones
+    record(datetime(2025, 1, 25), TransactionType.DEPOSIT, "999")
+    assert service.monthly("a", 2025, 1, now=now).closing_balance == Decimal("68.5")
+
+    # El mes abierto suma solo lo nuevo desde su corte
+    record(now + timedelta(minutes=5), TransactionType.DEPOSIT, "50")
+    later = service.monthly("a", 2025, 3, now=now + timedelta(minutes=10))
+    assert later.deposits_count == 1 and later.closing_balance == Decimal("128.25")
+    assert statements.get("a", date(2025, 3, 1)).computed_through == now + timedelta(minutes=9)
+
+
+
+@pytest.mark.parametrize("backend", ["sql", "memory"])
+def test_months_after_legacy_rows_anchor_on_the_account_balance(session, backend):
+    statements = SQLStatementRepository(session) if backend == "sql" else InMemoryStatementRepo()
+    transactions = SQLTransactionRepository(session) if backend == "sql" else InMemoryTransactionRepo()
+    accounts = InMemoryAccountRepo()
+    # Saldo real: depósito viejo de 100 con comisión 1 que no quedó registrada, y lo de febrero y marzo
+    accounts.add(Account(id="a", customer_id="c", currency="USD", _balance=Decimal("138.25")))
+    service = StatementService(statements, transactions, accounts)
+    for day, type_, amount, metadata in [
+        (datetime(2025, 1, 5), TransactionType.DEPOSIT, "100", None),
+        (datetime(2025, 2, 10), TransactionType.DEPOSIT, "50", {"applied_fee": "0.5"}),
+        (datetime(2025, 3, 2), TransactionType.WITHDRAWAL, "10", {"applied_fee": "0.25"}),
+    ]:
+        t = Transaction(account_id="a", amount=Decimal(amount), type=type_, currency="USD",
+                        created_at=day, metadata=metadata)
+        t.transition_to(TransactionStatus.APPROVED)
+        transactions.add(t)
+    now = datetime(2025, 3, 15)
+
+    march = service.monthly("a", 2025, 3, now=now)
+    february = service.monthly("a", 2025, 2, now=now)
+    assert (march.opening_balance, march.closing_balance) == (Decimal("148.5"), Decimal("138.25"))
+    assert (february.opening_balance, february.closing_balance) == (Decimal("99"), Decimal("148.5"))
+    with pytest.raises(MissingFeeError):
+        service.monthly("a", 2025, 1, now=now)
+
+@pytest.mark.parametrize("backend", ["sql", "memory"])
+def test_statement_save_is_an_upsert_that_never_moves_back(session, backend):
+    statements = SQLStatementRepository(session) if backend == "sql" else InMemoryStatementRepo()
+    period = date(2025, 1, 1)
+    older = MonthlyStatement("a", period, Decimal("10"), datetime(2025, 1, 10))
+    newer = MonthlyStatement("a", period, Decimal("10"), datetime(2025, 1, 20), deposits_count=1,
+                             deposits_total=Decimal("5"))
+
+    statements.save(older)
+    assert statements.get("a", period).computed_through == older.computed_through
+    statements.save(newer)
+    # Otro pedido que materializó el mismo mes con un corte anterior llega tarde
+    statements.save(older)
+
+    saved = statements.get("a", period)
+    assert (saved.computed_through, saved.closing_balance) == (newer.computed_through, Decimal("15"))
+
+
+def test_legacy_deposits_without_fee_are_refused_until_backfilled(session):
+    facade = _facade(session, fee_type="flat")
+    customer = facade.create_customer("Juan Pérez", "juan@example.com")
+    a, b = (facade.create_account(customer.id).id for _ in range(2))
+    facade.deposit(a, Decimal("100"))
+    facade.withdraw(a, Decimal("10"))
+    facade.deposit(b, Decimal("50"))
+    today = datetime.utcnow()
+    facade.get_statement(a, today.year, today.month)
+
+    # Operaciones de antes de los estados de cuenta: sin applied_fee; la de b, además, sin libro mayor
+    c = TransactionModel.__table__.c
+    session.execute(update(TransactionModel.__table__).values(metadata=None)
+                    .where(c.type.in_([TransactionType.DEPOSIT, TransactionType.WITHDRAWAL])))
+    legacy = select(c.id).where(c.account_id == b)
+    session.execute(delete(LedgerEntryModel.__table__).where(LedgerEntryModel.transaction_id.in_(legacy)))
+    session.commit()
+    with pytest.raises(ValidationError):
+        facade.get_statement(b, today.year, today.month)
+
+    report = backfill_applied_fees(session, batch_size=1)
+
+    assert (report.updated, report.unresolved, report.statements_deleted) == (2, 1, 2)
+    statement = facade.get_statement(a, today.year, today.month)
+    assert statement.fees_total == Decimal("1.00")
+    assert statement.closing_balance == session.get(AccountModel, a).balance
+    with pytest.raises(ValidationError):
+        facade.get_statement(b, today.year, today.month)
+
+
+# Caché de lecturas de cuentas
+
+def test_account_cache_serves_reads_and_never_authorizes_debits(session, monkeypatch):
+    cache = AccountCache(ttl_seconds=60)
+    monkeypatch.setattr(deps, "account_cache", cache)
+    facade = _facade(session)
+    account = _funded_account(facade, "100")
+
+    assert facade.get_account(account.id).balance == Decimal("100")
+    assert facade.get_account(account.id).balance == Decimal("100")
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Cambio hecho por otro worker: la lectura cacheada queda vieja hasta el TTL,
+    # pero el retiro lee la fila vigente
+    session.execute(update(AccountModel).where(AccountModel.id == account.id).values(balance=Decimal("20")))
+    session.commit()
+    assert facade.get_account(account.id).balance == Decimal("100")
+    with pytest.raises(InsufficientFundsError):
+        facade.withdraw(account.id, Decimal("50"))
+
+    # Un movimiento confirmado en este worker invalida la entrada
+    facade.deposit(account.id, Decimal("10"))
+    assert facade.get_account(account.id).balance == Decimal("30")
+    assert cache.misses == 2
+
+
+# Historial paginado en SQL
+
+def _history(account_id: str, n: int) -> list[Transaction]:
+    base = datetime(2025, 1, 1)
+    return [
+        Transaction(
+            account_id=account_id,
+            amount=Decimal(i + 1),
+            type=TransactionType.DEPOSIT,
+            currency="USD",
+            created_at=base + timedelta(minutes=i),
+        )
+        for i in range(n)
+    ]
+
+
+def test_transactions_table_has_account_history_index(engine):
+    indexes = {ix.name: [c.name for c in ix.columns] for ix in TransactionModel.__table__.indexes}
+    assert indexes["ix_transactions_account_id_created_at"] == ["account_id", "created_at", "id"]
+
+
+@pytest.mark.parametrize("backend", ["sql", "memory"])
+def test_list_page_orders_newest_first_and_pages(session, backend):
+    facade = _facade(session)
+    account = _funded_account(facade, "1")
+    repo = SQLTransactionRepository(session) if backend == "sql" else InMemoryTransactionRepo()
+    if backend == "sql":
+        session.query(TransactionModel).delete()
+    for tx in _history(account.id, 7):
+        repo.add(tx)
+
+    first = repo.list_page(account.id, limit=3, offset=0)
+    second = repo.list_page(account.id, limit=3, offset=3)
+    last = repo.list_page(account.id, limit=3, offset=6)
+
+    assert [t.amount for t in first] == [Decimal(7), Decimal(6), Decimal(5)]
+    assert [t.amount for t in second] == [Decimal(4), Decimal(3), Decimal(2)]
+    assert [t.amount for t in last] == [Decimal(1)]
+
+
+@pytest.mark.parametrize("backend", ["sql", "memory"])
+def test_list_page_after_cursor_seeks_past_last_row(session, backend):
+    facade = _facade(session)
+    account = _funded_account(facade, "1")
+    repo = SQLTransactionRepository(session) if backend == "sql" else InMemoryTransactionRepo()
+    if backend == "sql":
+        session.query(TransactionModel).delete()
+    for tx in _history(account.id, 5):
+        repo.add(tx)
+
+    first = repo.list_page(account.id, limit=2)
+    last_seen = first[-1]
+    rest = repo.list_page(account.id, limit=10, after=(last_seen.created_at, last_seen.id))
+
+    assert [t.amount for t in rest] == [Decimal(3), Decimal(2), Decimal(1)]
+
+
+def test_rows_map_to_slotted_entities(session):
+    facade = _facade(session)
+    account = _funded_account(facade, "1")
+    repo = SQLTransactionRepository(session)
+    original = Transaction(account_id=account.id, amount=Decimal("12.5"), type=TransactionType.DEPOSIT,
+                           currency="USD", metadata={"canal": "api"})
+    repo.add(original)
+
+    row = session.execute(select_transactions().where(TransactionModel.id == original.id)).one()
+    mapped = transaction_from_row(row)
+
+    assert not hasattr(mapped, "__dict__")
+    assert mapped == original
+    assert repo.get_by_id(original.id) == original
+
+
+# Contadores de riesgo incrementales
+
+@pytest.mark.parametrize("backend", ["sql", "memory"])
+def test_risk_counters_only_count_approved_transactions(session, backend):
+    facade = _facade(session)
+    account = _funded_account(facade, "1")
+    repo = SQLTransactionRepository(session) if backend == "sql" else InMemoryTransactionRepo()
+    now = datetime(2025, 1, 1, 15, 0)
+
+    def _tx(amount: str, at: datetime, status: TransactionStatus) -> None:
+        tx = Transaction(account_id=account.id, amount=Decimal(amount), type=TransactionType.DEPOSIT,
+                         currency="USD", created_at=at)
+        repo.add(tx)
+        tx.transition_to(status)
+        repo.update_status(tx.id, status)
+
+    _tx("100", datetime(2025, 1, 1, 9, 0), TransactionStatus.APPROVED)   # hoy, fuera de la hora
+    _tx("20", now - timedelta(minutes=5), TransactionStatus.APPROVED)
+    _tx("30", now - timedelta(minutes=3), TransactionStatus.APPROVED)
+    _tx("999", now - timedelta(minutes=2), TransactionStatus.REJECTED)
+    _tx("7", datetime(2024, 12, 31, 23, 59), TransactionStatus.APPROVED)  # ayer
+
+    activity = repo.get_activity(account.id, now=now)
+
+    assert activity.count_since(now - timedelta(minutes=10)) == 2
+    assert activity.sum_since(now - timedelta(minutes=10)) == Decimal("50")
+    # El límite diario ve todo el día, no solo la última hora
+    assert activity.sum_since(datetime(2025, 1, 1)) == Decimal("150")
+    assert activity.count_since(datetime(2025, 1, 1)) == 3
+
+
+@pytest.mark.parametrize("backend", ["sql", "memory"])
+def test_risk_windows_longer_than_an_hour_read_enough_minute_buckets(session, backend):
+    facade = _facade(session)
+    account = _funded_account(facade, "1")
+    repo = SQLTransactionRepository(session) if backend == "sql" else InMemoryTransactionRepo()
+    now = datetime(2025, 1, 1, 15, 0)
+    for minutes_ago in (110, 95, 70):
+        tx = Transaction(account_id=account.id, amount=Decimal("10"), type=TransactionType.DEPOSIT,
+                         currency="USD", created_at=now - timedelta(minutes=minutes_ago))
+        repo.add(tx)
+        tx.transition_to(TransactionStatus.APPROVED)
+        repo.update_status(tx.id, tx.status)
+    plan = RiskPlan([VelocityRule(max_transactions=3, time_window_minutes=120)])
+    assert plan.minute_horizon == 120
+
+    activity = repo.get_activity(account.id, now=now, horizon_minutes=plan.minute_horizon)
+    probe = Transaction(account_id=account.id, amount=Decimal("10"), type=TransactionType.DEPOSIT, currency="USD")
+    is_valid, message = plan.evaluate(probe, None, activity, now=now)
+    assert not is_valid and "(3)" in message
+
+    # Con el horizonte por defecto la ventana no se puede responder: error en vez de contar de menos
+    with pytest.raises(ValueError):
+        repo.get_activity(account.id, now=now).count_since(now - timedelta(minutes=120))
+
+
+
+@pytest.mark.parametrize("backend", ["sql", "memory"])
+def test_prune_drops_counters_no_window_reads(session, backend):
+    facade = _facade(session)
+    account = _funded_account(facade, "1")
+    repo = SQLTransactionRepository(session) if backend == "sql" else InMemoryTransactionRepo()
+    now = datetime(2025, 1, 1, 15, 0)
+    for minutes_ago in (24 * 60, 130, 100, 5):
+        tx = Transaction(account_id=account.id, amount=Decimal("10"), type=TransactionType.DEPOSIT,
+                         currency="USD", created_at=now - timedelta(minutes=minutes_ago))
+        repo.add(tx)
+        tx.transition_to(TransactionStatus.APPROVED)
+        repo.update_status(tx.id, tx.status)
+
+    # Minutos de ayer y de hace 130 min, más el día de ayer
+    assert repo.prune_counters(now, horizon_minutes=120) == 3
+    assert repo.prune_counters(now, horizon_minutes=120) == 0
+    activity = repo.get_activity(account.id, now=now, horizon_minutes=120)
+    assert activity.count_since(now - timedelta(minutes=120)) == 2
+    assert activity.sum_since(datetime(2025, 1, 1)) == Decimal("30")
+
+
+# Lotes de transacciones
+
+def _batch_service(facade, chunk_size: int) -> BatchService:
+    return BatchService(
+        account_repo=facade.account_repo,
+        deposit_service=facade.deposit_service,
+        withdraw_service=facade.withdraw_service,
+        transfer_service=facade.transfer_service,
+        uow=facade.uow,
+        chunk_size=chunk_size,
+    )
+
+
+def test_batch_commits_once_per_chunk_and_keeps_going_on_domain_errors(session, commits):
+    facade = _facade(session)
+    customer = facade.create_customer("Juan Pérez", "juan@example.com")
+    accounts = [facade.create_account(customer.id).id for _ in range(3)]
+    operations = [BatchOperation(TransactionType.DEPOSIT, accounts[i % 3], Decimal("10")) for i in range(9)]
+    operations.insert(4, BatchOperation(TransactionType.WITHDRAWAL, accounts[0], Decimal("1000")))
+    operations.append(BatchOperation(TransactionType.TRANSFER, accounts[0], Decimal("25"), accounts[1]))
+
+    commits["n"] = 0
+    results = _batch_service(facade, chunk_size=4).execute(operations)
+
+    assert commits["n"] == 3
+    assert [r.index for r in results] == list(range(11))
+    assert isinstance(results[4].error, InsufficientFundsError)
+    assert all(r.transaction is not None for i, r in enumerate(results) if i != 4)
+    balances = {m.id: m.balance for m in session.query(AccountModel).all()}
+    assert [balances[a] for a in accounts] == [Decimal("5"), Decimal("55"), Decimal("30")]
+
+
+def test_batch_infrastructure_failure_rolls_back_chunk_and_stops(session, monkeypatch):
+    facade = _facade(session)
+    account = facade.create_account(facade.create_customer("Juan Pérez", "juan@example.com").id)
+    credit = facade.account_repo.credit
+    calls = {"n": 0}
+
+    def _flaky_credit(account_id, amount):
+        calls["n"] += 1
+        if calls["n"] == 4:
+            raise RuntimeError("conexión perdida")
+        return credit(account_id, amount)
+
+    monkeypatch.setattr(facade.account_repo, "credit", _flaky_credit)
+    operations = [BatchOperation(TransactionType.DEPOSIT, account.id, Decimal("1")) for _ in range(6)]
+    results = _batch_service(facade, chunk_size=2).execute(operations)
+
+    assert [r.executed for r in results] == [True, True, False, False, False, False]
+    assert all(isinstance(r.error, InfrastructureError) for r in results[2:])
+    session.expire_all()
+    assert session.get(AccountModel, account.id).balance == Decimal("2")
+
+
+# Importación masiva
+
+def test_import_dedupes_emails_and_commits_per_chunk(session, commits):
+    facade = _facade(session)
+    facade.create_customer("Juan Pérez", "juan@example.com")
+    lines = [
+        '{"name": "Juan Pérez", "email": "JUAN@example.com"}',   # ya registrado
+        '{"name": "Ana Gómez", "email": "ana@example.com", "currency": "eur"}',
+        '{"name": "Ana Repetida", "email": "ana@example.com"}',  # repetido en el archivo
+        'no es json',
+        '{"name": "X", "email": "x@example.com"}',               # nombre muy corto
+        '',
+        '{"name": "Luis Díaz", "email": "luis@example.com"}',
+    ]
+    service = ImportService(facade.customer_repo, facade.account_repo, facade.uow, chunk_size=3)
+
+    commits["n"] = 0
+    report = service.import_rows(iter_ndjson_rows(io.StringIO("\n".join(lines))))
+
+    assert commits["n"] == 2
+    assert (report.processed, report.customers_created, report.accounts_created) == (6, 2, 2)
+    assert report.rejected_count == 4
+    assert sorted(r.line for r in report.rejected) == [1, 3, 4, 5]
+    assert facade.customer_repo.get_by_email("ana@example.com") is not None
+    assert {a.currency for a in SQLAccountRepository(session).find_by_currency("EUR")} == {"EUR"}
+
+
+def test_import_retries_chunk_only_on_integrity_error(session, monkeypatch):
+    facade = _facade(session)
+    service = ImportService(facade.customer_repo, facade.account_repo, facade.uow)
+    calls = []
+
+    def _lost_connection(customers):
+        calls.append(len(customers))
+        raise RuntimeError("conexión perdida")
+
+    monkeypatch.setattr(facade.customer_repo, "add_many", _lost_connection)
+    with pytest.raises(RuntimeError):
+        service.import_rows(iter_ndjson_rows(io.StringIO('{"name": "Ana Gómez", "email": "ana@example.com"}')))
+
+    assert calls == [1]
+
+
+def test_backtest_reads_history_in_chunks_of_whole_accounts(session):
+    config = ConfigurationService()
+    for rule in ("max_amount", "velocity", "daily_limit"):
+        config.set_risk_rule(rule, False)
+    facade = get_facade(session, config)
+    customer = facade.create_customer("Juan Pérez", "juan@example.com")
+    accounts = [facade.create_account(customer.id).id for _ in range(3)]
+    for account_id in accounts:
+        for amount in ("10", "20", "1500"):
+            facade.deposit(account_id, Decimal(amount))
+
+    chunks = list(iter_history_chunks(session, chunk_size=2))
+    assert [len(chunk) for chunk in chunks] == [3, 3, 3]
+    assert all(len(set(chunk.account_ids)) == 1 for chunk in chunks)
+
+    report = backtest(chunks, [MaxAmountRule(), VelocityRule(max_transactions=2)])
+    assert report.scored == 9
+    assert report.rejected_by_rule == {"max_amount": 3, "velocity": 3}
+    assert report.rejected_count == 3
+    assert sorted(r.rules for r in report.rejected) == [["max_amount", "velocity"]] * 3
+
+
+@pytest.mark.parametrize("backend", ["file", "db"])
+def test_config_store_is_shared_between_workers(backend, engine, tmp_path):
+    """Dos ConfigurationService sobre el mismo almacén simulan dos workers."""
+    def store():
+        if backend == "file":
+            return FileConfigStore(str(tmp_path / "config.json"))
+        return SQLConfigStore(engine, refresh_seconds=0)
+
+    worker_a, worker_b = ConfigurationService(store()), ConfigurationService(store())
+    assert worker_b.get_current_fee_type() == "flat"
+    fee = worker_b.get_current_fee_strategy()
+    assert worker_b.get_current_fee_strategy() is fee  # sin cambios no se recompila
+
+    worker_a.set_fee_strategy("percent")
+    worker_a.set_risk_rule("velocity", False)
+    assert worker_b.version == 2
+    assert worker_b.get_full_config() == {
+        "fee": "percent", "risk": {"max_amount": True, "velocity": False, "daily_limit": True},
+    }
+
+    worker_b.set_fee_strategy("percent")  # sin cambio efectivo: no sube la versión
+    assert worker_a.version == 2
+
+
+
+# Archivo en frío
+
+def _cold_history(transactions: SQLTransactionRepository) -> None:
+    """Cuenta "a" con movimientos de enero a abril de 2025 y transferencias de "b" hacia "a"."""
+    base = datetime(2025, 1, 1)
+    for i in range(40):
+        incoming = i % 5 == 4
+        t = Transaction(account_id="b" if incoming else "a", amount=Decimal(i + 1),
+                        type=TransactionType.TRANSFER if incoming else TransactionType.DEPOSIT, currency="USD",
+                        target_account_id="a" if incoming else None, created_at=base + timedelta(days=3 * i),
+                        metadata={"applied_fee": "0.5"})
+        t.transition_to(TransactionStatus.REJECTED if i % 7 == 6 else TransactionStatus.APPROVED)
+        transactions.add(t)
+
+
+def test_archived_transactions_read_through_history_export_and_statements(session, tmp_path):
+    archive = TransactionArchive(tmp_path / "archive")
+    transactions = SQLTransactionRepository(session, archive)
+    accounts = InMemoryAccountRepo()
+    accounts.add(Account(id="a", customer_id="c", currency="USD", _balance=Decimal("0")))
+    _cold_history(transactions)
+    session.commit()
+    now = datetime(2025, 6, 1)
+
+    def snapshot():
+        pages = [[t.id for t in transactions.list_page("a", limit=4, offset=o)] for o in range(0, 40, 4)]
+        walk, after = [], None
+        while page := transactions.list_page("a", limit=5, after=after):
+            walk += [t.id for t in page]
+            after = (page[-1].created_at, page[-1].id)
+        service = StatementService(InMemoryStatementRepo(), transactions, accounts)
+        statements = [service.monthly("a", 2025, month, now=now) for month in (1, 2, 3, 4)]
+        chunks = list(iter_history_chunks(session, chunk_size=10, archive=archive))
+        scored = backtest(chunks, [VelocityRule(max_transactions=2, time_window_minutes=7 * 24 * 60)])
+        history = {}
+        for chunk in chunks:
+            for account_id, transaction_id in zip(chunk.account_ids, chunk.transaction_ids):
+                history.setdefault(account_id, []).append(transaction_id)
+        return pages, walk, [t.id for t in transactions.iter_by_account("a")], statements, history, scored
+
+    before = snapshot()
+    assert len(before[4]["a"]) == 28 and before[5].rejected_count > 0
+    report = archive_transactions(session, archive, datetime(2025, 2, 15), now=now)
+    assert report.archived == 15 and report.deleted == 15 and report.segment_bytes > 0
+    assert session.query(TransactionModel).count() == 25
+    assert snapshot() == before
+    assert transactions.first_activity("a") == datetime(2025, 1, 1)
+
+    # Si el job murió antes del DELETE, las filas viejas siguen en la tabla y no se duplican
+    stale = next(archive.iter_account("a"))
+    session.execute(TransactionModel.__table__.insert().values(
+        id=stale.id, account_id="a", type=stale.type, amount=stale.amount, currency="USD",
+        status=stale.status, created_at=stale.created_at, metadata=stale.metadata))
+    assert snapshot() == before
+    report = archive_transactions(session, archive, datetime(2025, 3, 20), now=now)
+    assert (report.archived, report.deleted) == (11, 12)
+    assert snapshot() == before
+
+    with pytest.raises(ValidationError):
+        archive_transactions(session, archive, datetime(2025, 3, 1), now=now)
+    with pytest.raises(ValidationError):
+        archive_transactions(session, archive, now - timedelta(hours=1), now=now)
+
+    # Todo archivado: las cuentas sin filas en la tabla también llegan al backtest
+    archive_transactions(session, archive, datetime(2025, 5, 1), now=now)
+    assert session.query(TransactionModel).count() == 0
+    assert snapshot() == before
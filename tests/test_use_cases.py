@@ -84,31 +84,34 @@ def test_get_account_nonexistent_raises_not_found():
         svc.get_account("acc-inexistente")
 
 def test_list_transactions_returns_paginated_slice():
-    t1 = Transaction(type=TransactionType.DEPOSIT, amount=10.0, account_id="acc-1", currency="USD", created_at=datetime(2025, 1, 1))
     t2 = Transaction(type=TransactionType.WITHDRAWAL, amount=5.0, account_id="acc-1", currency="USD", created_at=datetime(2025, 1, 2))
     t3 = Transaction(type=TransactionType.DEPOSIT, amount=20.0, account_id="acc-1", currency="USD", created_at=datetime(2025, 1, 3))
     transactions = MagicMock()
-    transactions.list_by_account.return_value = [t1, t2, t3]
+    transactions.list_page.return_value = [t3, t2]
     svc = AccountService(MagicMock(), MagicMock(), transactions)
     page = svc.list_transactions("acc-1", limit=2, offset=0)
     assert len(page) == 2
     assert page[0].amount == 20.0
     assert page[1].amount == 5.0
-    transactions.list_by_account.assert_called_once_with("acc-1")
+    transactions.list_page.assert_called_once_with("acc-1", 2, 0)
+    transactions.list_by_account.assert_not_called()
 
 def test_list_transactions_respects_offset_and_limit():
-    t1 = Transaction(type=TransactionType.DEPOSIT, amount=1.0, account_id="acc-1", currency="USD", created_at=datetime(2025, 1, 1))
-    t2 = Transaction(type=TransactionType.DEPOSIT, amount=2.0, account_id="acc-1", currency="USD", created_at=datetime(2025, 1, 2))
-    t3 = Transaction(type=TransactionType.DEPOSIT, amount=3.0, account_id="acc-1", currency="USD", created_at=datetime(2025, 1, 3))
     transactions = MagicMock()
-    transactions.list_by_account.return_value = [t1, t2, t3]
+    transactions.list_page.return_value = []
     svc = AccountService(MagicMock(), MagicMock(), transactions)
-    page = svc.list_transactions("acc-1", limit=1, offset=1)
-    assert len(page) == 1
-    assert page[0].amount == 2.0
+    svc.list_transactions("acc-1", limit=1, offset=1)
+    transactions.list_page.assert_called_once_with("acc-1", 1, 1)
+
+def test_list_transactions_normalizes_invalid_pagination():
+    transactions = MagicMock()
+    transactions.list_page.return_value = []
+    svc = AccountService(MagicMock(), MagicMock(), transactions)
+    svc.list_transactions("acc-1", limit=0, offset=-5)
+    transactions.list_page.assert_called_once_with("acc-1", 10, 0)
 
 def test_list_transactions_empty():
     transactions = MagicMock()
-    transactions.list_by_account.return_value = []
+    transactions.list_page.return_value = []
     svc = AccountService(MagicMock(), MagicMock(), transactions)
     assert svc.list_transactions("acc-1", limit=10, offset=0) == []
\ No newline at end of file